@@ -46,146 +46,148 @@ class BBHeader(BaseHeader.BaseHeader) :
         self.kAddressData.add("T_RESERVED2",    "L_FILESIZE",           "L_FILESIZE",           VMSBackupHelper.sizeof.int8_t, 22)
         self.kAddressData.add("W_CHECKSUM",     "T_RESERVED2",          "T_RESERVED2",          VMSBackupHelper.sizeof.uint16_t)
 
+        self.kAddressData.compile("BBHeaderFields")
+
     #end
 
     def W_SIZE(self) -> int :
-        return self.kAddressData.get("W_SIZE", self.kBuffer, self.kCache)
+        return self.kFields.W_SIZE
     #end
 
     def W_OPSYS(self) -> int :
-        return self.kAddressData.get("W_OPSYS", self.kBuffer, self.kCache)
+        return self.kFields.W_OPSYS
     #end
 
     def W_SUBSYS(self) -> int :
-        return self.kAddressData.get("W_SUBSYS", self.kBuffer, self.kCache)
+        return self.kFields.W_SUBSYS
     #end
 
     def W_APPLIC(self) -> int :
-        return self.kAddressData.get("W_APPLIC", self.kBuffer, self.kCache)
+        return self.kFields.W_APPLIC
     #end
 
     def L_NUMBER(self) -> int :
-        return self.kAddressData.get("L_NUMBER", self.kBuffer, self.kCache)
+        return self.kFields.L_NUMBER
     #end
 
     def W_STRUCLEV(self) -> int :
-        return self.kAddressData.get("W_STRUCLEV", self.kBuffer, self.kCache)
+        return self.kFields.W_STRUCLEV
     #end
 
     def B_STRUCVER(self) -> int :
-        return self.kAddressData.get("B_STRUCVER", self.kBuffer, self.kCache)
+        return self.kAddressData.get("B_STRUCVER", self.kBuffer)
     #end
 
     def B_STRUCLEV(self) -> int :
-        return self.kAddressData.get("B_STRUCLEV", self.kBuffer, self.kCache)
+        return self.kAddressData.get("B_STRUCLEV", self.kBuffer)
     #end
 
     def W_VOLNUM(self) -> int :
-        return self.kAddressData.get("W_VOLNUM", self.kBuffer, self.kCache)
+        return self.kFields.W_VOLNUM
     #end
 
     def L_CRC(self) -> int :
-        return self.kAddressData.get("L_CRC", self.kBuffer, self.kCache)
+        return self.kFields.L_CRC
     #end
 
     def L_BLOCKSIZE(self) -> int :
-        return self.kAddressData.get("L_BLOCKSIZE", self.kBuffer, self.kCache)
+        return self.kFields.L_BLOCKSIZE
     #end
 
     def L_FLAGS(self) -> int :
-        return self.kAddressData.get("L_FLAGS", self.kBuffer, self.kCache)
+        return self.kFields.L_FLAGS
     #end
 
     def V_NOCRC(self) -> int :
-        return self.kAddressData.get("V_NOCRC", self.kBuffer, self.kCache)
+        return self.kAddressData.get("V_NOCRC", self.kBuffer)
     #end
 
     def T_SSNAME(self) -> str :
-        return "".join([chr(k) for k in self.kAddressData.get("T_SSNAME", self.kBuffer, self.kCache)[1:] if k > 0])
+        return "".join([chr(k) for k in self.kFields.T_SSNAME[1:] if k > 0])
     #end
 
     def W_FID(self) -> int :
-        return self.kAddressData.get("W_FID", self.kBuffer, self.kCache)
+        return self.kFields.W_FID
     #end
 
     def W_FID_NUM(self) -> int :
-        return self.kAddressData.get("W_FID_NUM", self.kBuffer, self.kCache)
+        return self.kAddressData.get("W_FID_NUM", self.kBuffer)
     #end
 
     def W_FID_SEQ(self) -> int :
-        return self.kAddressData.get("W_FID_SEQ", self.kBuffer, self.kCache)
+        return self.kAddressData.get("W_FID_SEQ", self.kBuffer)
     #end
 
     def W_FID_RVN(self) -> int :
-        return self.kAddressData.get("W_FID_RVN", self.kBuffer, self.kCache)
+        return self.kAddressData.get("W_FID_RVN", self.kBuffer)
     #end
 
     def B_FID_RVN(self) -> int :
-        return self.kAddressData.get("B_FID_RVN", self.kBuffer, self.kCache)
+        return self.kAddressData.get("B_FID_RVN", self.kBuffer)
     #end
 
     def B_FID_NMX(self) -> int :
-        return self.kAddressData.get("B_FID_NMX", self.kBuffer, self.kCache)
+        return self.kAddressData.get("B_FID_NMX", self.kBuffer)
     #end
 
     def W_DID(self) -> int :
-        return self.kAddressData.get("W_DID", self.kBuffer, self.kCache)
+        return self.kFields.W_DID
     #end
 
     def W_DID_NUM(self) -> int :
-        return self.kAddressData.get("W_DID_NUM", self.kBuffer, self.kCache)
+        return self.kAddressData.get("W_DID_NUM", self.kBuffer)
     #end
 
     def W_DID_SEQ(self) -> int :
-        return self.kAddressData.get("W_DID_SEQ", self.kBuffer, self.kCache)
+        return self.kAddressData.get("W_DID_SEQ", self.kBuffer)
     #end
 
     def W_DID_RVN(self) -> int :
-        return self.kAddressData.get("W_DID_RVN", self.kBuffer, self.kCache)
+        return self.kAddressData.get("W_DID_RVN", self.kBuffer)
     #end
 
     def B_DID_RVN(self) -> int :
-        return self.kAddressData.get("B_DID_RVN", self.kBuffer, self.kCache)
+        return self.kAddressData.get("B_DID_RVN", self.kBuffer)
     #end
 
     def B_DID_NMX(self) -> int :
-        return self.kAddressData.get("B_DID_NMX", self.kBuffer, self.kCache)
+        return self.kAddressData.get("B_DID_NMX", self.kBuffer)
     #end
 
     def T_FILENAME(self) -> int :
-        return self.kAddressData.get("T_FILENAME", self.kBuffer, self.kCache)
+        return self.kFields.T_FILENAME
     #end
 
     def B_RTYPE(self) -> int :
-        return self.kAddressData.get("B_RTYPE", self.kBuffer, self.kCache)
+        return self.kFields.B_RTYPE
     #end
 
     def B_RATTRIB(self) -> int :
-        return self.kAddressData.get("B_RATTRIB", self.kBuffer, self.kCache)
+        return self.kFields.B_RATTRIB
     #end
 
     def W_RSIZE(self) -> int :
-        return self.kAddressData.get("W_RSIZE", self.kBuffer, self.kCache)
+        return self.kFields.W_RSIZE
     #end
 
     def B_BKTSIZE(self) -> int :
-        return self.kAddressData.get("B_BKTSIZE", self.kBuffer, self.kCache)
+        return self.kFields.B_BKTSIZE
     #end
 
     def B_VFCSIZE(self) -> int :
-        return self.kAddressData.get("B_VFCSIZE", self.kBuffer, self.kCache)
+        return self.kFields.B_VFCSIZE
     #end
 
     def W_MAXREC(self) -> int :
-        return self.kAddressData.get("W_MAXREC", self.kBuffer, self.kCache)
+        return self.kFields.W_MAXREC
     #end
 
     def L_FILESIZE(self) -> int :
-        return self.kAddressData.get("L_FILESIZE", self.kBuffer, self.kCache)
+        return self.kFields.L_FILESIZE
     #end
 
     def W_CHECKSUM(self) -> int :
-        return self.kAddressData.get("W_CHECKSUM", self.kBuffer, self.kCache)
+        return self.kFields.W_CHECKSUM
     #end
 
     def GetLength(self) -> bool :
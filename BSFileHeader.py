@@ -1,7 +1,20 @@
-import BSAHeader
 import VMSBackupHelper
 import enum
 import struct
+import functools
+
+# Attribute Header, i.e. W_SIZE followed by W_TYPE, with the attribute text (T_TEXT) of W_SIZE bytes following
+_ATTRIBUTE_STRUCT = struct.Struct("<HH")
+
+@functools.lru_cache(maxsize=None)
+def GetAttributeStruct(kSizeOf : VMSBackupHelper.sizeof, nCount : int) -> struct.Struct :
+
+    # Attributes hold nCount elements of kSizeOf, of which there are only a handful of combinations in
+    # practice, so each is only ever compiled once
+    kFormat = VMSBackupHelper.kUnpackType[kSizeOf.name]
+    return struct.Struct(kFormat[0] + str(nCount) + kFormat[1])
+
+#end
 
 class BSFileHeader :
 
@@ -53,162 +66,118 @@ class BSFileHeader :
 
     def __init__(self) -> None :
 
-        self.kFILENAME  = None
-        self.kSTRUCLEV  = None
-        self.kFID       = None
-        self.kBACKLINK  = None
-        self.kFILESIZE  = None
-        self.kUIC       = None
-        self.kFPRO      = None
-        self.kRPRO      = None
-        self.kACLEVEL   = None
-        self.kUCHAR     = None
-        self.kRECATTR   = None
-        self.kREVISION  = None
-        self.kCREDATE   = None
-        self.kREVDATE   = None
-        self.kEXPDATE   = None
-        self.kBAKDATE   = None
-        self.kVERLIMIT  = None
-        self.kHIGHWATER = None
+        self.kBuffer     = b""
+        self.kAttributes = {}
+        self.kDecoded    = {}
 
     #end
 
-    def LoadHeaderFromBuffer(self, kBlock : bytes, nRSize : int) :
+    def LoadHeaderFromBuffer(self, kBlock : bytes | memoryview, nRSize : int, nOffset : int = 0) :
 
+        # A single scan of the File Record, noting where each attribute's text is by its type, without decoding
+        # anything.  Each attribute is then only decoded when it's first asked for, and the record itself is
+        # copied out of the block once, rather than once per attribute.
         nAddress = 2
 
         while nAddress < nRSize :
 
-            # Initially the Block is unidentified
-            kUnidentified = BSAHeader.BSAHeader()
-
-            if len(kBlock[nAddress:]) < kUnidentified.GetLength() : break
-
-            kUnidentified.LoadHeaderFromBuffer(kBlock=kBlock[nAddress:])
-
-            # Increment the Address
-            nAddress += kUnidentified.GetLength()
-
-            # Determine the Block Type
-            kBlockType = kUnidentified.W_TYPE()
-
-            if BSFileHeader.FileHeaderType.FILENAME == kBlockType :
-                self.kFILENAME = kUnidentified
-            elif BSFileHeader.FileHeaderType.STRUCLEV == kBlockType :
-                self.kSTRUCLEV = kUnidentified
-            elif BSFileHeader.FileHeaderType.FID == kBlockType :
-                self.kFID = kUnidentified
-            elif BSFileHeader.FileHeaderType.BACKLINK == kBlockType :
-                self.kBACKLINK = kUnidentified
-            elif BSFileHeader.FileHeaderType.FILESIZE == kBlockType :
-                self.kFILESIZE = kUnidentified
-            elif BSFileHeader.FileHeaderType.UIC == kBlockType :
-                self.kUIC = kUnidentified
-            elif BSFileHeader.FileHeaderType.FPRO == kBlockType :
-                self.kFPRO = kUnidentified
-            elif BSFileHeader.FileHeaderType.RPRO == kBlockType :
-                self.kRPRO = kUnidentified
-            elif BSFileHeader.FileHeaderType.ACLEVEL == kBlockType :
-                self.kACLEVEL = kUnidentified
-            elif BSFileHeader.FileHeaderType.UCHAR == kBlockType :
-                self.kUCHAR = kUnidentified
-            elif BSFileHeader.FileHeaderType.RECATTR == kBlockType :
-                self.kRECATTR = kUnidentified
-            elif BSFileHeader.FileHeaderType.REVISION == kBlockType :
-                self.kREVISION = kUnidentified
-            elif BSFileHeader.FileHeaderType.CREDATE == kBlockType :
-                self.kCREDATE = kUnidentified
-            elif BSFileHeader.FileHeaderType.REVDATE == kBlockType :
-                self.kREVDATE = kUnidentified
-            elif BSFileHeader.FileHeaderType.EXPDATE == kBlockType :
-                self.kEXPDATE = kUnidentified
-            elif BSFileHeader.FileHeaderType.BAKDATE == kBlockType :
-                self.kBAKDATE = kUnidentified
-            elif BSFileHeader.FileHeaderType.VERLIMIT == kBlockType :
-                self.kVERLIMIT = kUnidentified
-            elif BSFileHeader.FileHeaderType.HIGHWATER == kBlockType :
-                self.kHIGHWATER = kUnidentified
+            nStart = nOffset + nAddress
+
+            if (len(kBlock) - nStart) < _ATTRIBUTE_STRUCT.size : break
+
+            nSize, nType = _ATTRIBUTE_STRUCT.unpack_from(kBlock, nStart)
+            nAddress    += _ATTRIBUTE_STRUCT.size
+
+            self.kAttributes[nType] = (nAddress, nSize)
+
+            # Truncated attributes don't advance past their header, and fail once they're decoded
+            if (len(kBlock) - (nStart + _ATTRIBUTE_STRUCT.size)) >= nSize :
+                nAddress += nSize
             #end
 
         #end
 
+        self.kBuffer = bytes(kBlock[nOffset:nOffset + nAddress])
+
     #end
 
-    def FILENAME(self) -> str :
-        if None != self.kFILENAME :
-            return "".join(map(chr, self.kFILENAME.T_TEXT()))
+    def GetAttribute(self, eType : FileHeaderType, kSizeOf : VMSBackupHelper.sizeof, bArray : bool, kDefault) :
+
+        kKey = (eType, kSizeOf, bArray)
+
+        if kKey in self.kDecoded :
+            return self.kDecoded[kKey]
+        #end
+
+        if eType in self.kAttributes :
+
+            nAddress, nSize = self.kAttributes[eType]
+            kValue          = GetAttributeStruct(kSizeOf, (nSize // kSizeOf.getValue()) if bArray else 1).unpack_from(self.kBuffer, nAddress)
+
+            if not bArray :
+                kValue = kValue[0]
+            #end
+
         else :
-            return ""
+
+            kValue = kDefault
+
         #end
+
+        self.kDecoded[kKey] = kValue
+
+        return kValue
+
     #end
 
-    def STRUCLEV(self) -> list[int] :
-        if None != self.kSTRUCLEV :
-            return self.kSTRUCLEV.T_TEXT()
-        else :
-            return ""
+    def FILENAME(self) -> str :
+
+        kKey = BSFileHeader.FileHeaderType.FILENAME
+
+        if kKey not in self.kDecoded :
+
+            if kKey in self.kAttributes :
+                nAddress, nSize = self.kAttributes[kKey]
+                if (nAddress + nSize) > len(self.kBuffer) :
+                    raise struct.error("File Name truncated")
+                #end
+                self.kDecoded[kKey] = self.kBuffer[nAddress:nAddress + nSize].decode("latin-1")
+            else :
+                self.kDecoded[kKey] = ""
+            #end
+
         #end
+
+        return self.kDecoded[kKey]
+
+    #end
+
+    def STRUCLEV(self) -> list[int] :
+        return self.GetAttribute(BSFileHeader.FileHeaderType.STRUCLEV, VMSBackupHelper.sizeof.uint8_t, True, "")
     #end
 
     def FID(self) -> list[int] :
-        if None != self.kFID :
-            kText   = bytes(self.kFID.T_TEXT())
-            kFormat = VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint16_t.name]
-            return struct.unpack(kFormat[0] + str(len(kText) // 2) + kFormat[1], kText)
-        else :
-            return []
-        #end
+        return self.GetAttribute(BSFileHeader.FileHeaderType.FID, VMSBackupHelper.sizeof.uint16_t, True, [])
     #end
 
     def FILESIZE(self) -> int :
-        if None != self.kFILESIZE :
-            kText   = bytes(self.kFILESIZE.T_TEXT())
-            kFormat = VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint32_t.name]
-            return struct.unpack(kFormat, kText)[0]
-        else :
-            return 0
-        #end
+        return self.GetAttribute(BSFileHeader.FileHeaderType.FILESIZE, VMSBackupHelper.sizeof.uint32_t, False, 0)
     #end
 
     def UIC(self) -> list[int] :
-        if None != self.kUIC :
-            kText   = bytes(self.kUIC.T_TEXT())
-            kFormat = VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint16_t.name]
-            return struct.unpack(kFormat[0] + str(len(kText) // 2) + kFormat[1], kText)
-        else :
-            return []
-        #end
+        return self.GetAttribute(BSFileHeader.FileHeaderType.UIC, VMSBackupHelper.sizeof.uint16_t, True, [])
     #end
 
     def FPRO(self) -> list[int] :
-        if None != self.kFPRO :
-            kText   = bytes(self.kFPRO.T_TEXT())
-            kFormat = VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint8_t.name]
-            return struct.unpack(kFormat[0] + str(len(kText)) + kFormat[1], kText)
-        else :
-            return []
-        #end
+        return self.GetAttribute(BSFileHeader.FileHeaderType.FPRO, VMSBackupHelper.sizeof.uint8_t, True, [])
     #end
 
     def UCHAR(self) -> list[int] :
-        if None != self.kUCHAR :
-            kText   = bytes(self.kUCHAR.T_TEXT())
-            kFormat = VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint16_t.name]
-            return struct.unpack(kFormat[0] + str(len(kText) // 2) + kFormat[1], kText)
-        else :
-            return []
-        #end
+        return self.GetAttribute(BSFileHeader.FileHeaderType.UCHAR, VMSBackupHelper.sizeof.uint16_t, True, [])
     #end
 
     def RECATTR(self, kSizeOf : VMSBackupHelper.sizeof = VMSBackupHelper.sizeof.uint8_t) -> list[int] :
-        if None != self.kRECATTR :
-            kText   = bytes(self.kRECATTR.T_TEXT())
-            kFormat = VMSBackupHelper.kUnpackType[kSizeOf.name]
-            return struct.unpack(kFormat[0] + str(len(kText) // kSizeOf.getValue()) + kFormat[1], kText)
-        else :
-            return []
-        #end
+        return self.GetAttribute(BSFileHeader.FileHeaderType.RECATTR, kSizeOf, True, [])
     #end
 
     # TODO: Should this 512 be defined somewhere?
@@ -222,82 +191,64 @@ class BSFileHeader :
     #end
 
     def REVISION(self) -> int :
-        if None != self.kREVISION :
-            kText   = bytes(self.kREVISION.T_TEXT())
-            kFormat = VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint16_t.name]
-            return struct.unpack(kFormat, kText)[0]
-        else :
-            return 0
-        #end
+        return self.GetAttribute(BSFileHeader.FileHeaderType.REVISION, VMSBackupHelper.sizeof.uint16_t, False, 0)
     #end
 
     def CREDATE(self) -> int :
-        if None != self.kCREDATE :
-            kText   = bytes(self.kCREDATE.T_TEXT())
-            kFormat = VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.int64_t.name]
-            return struct.unpack(kFormat, kText)[0]
-        else :
-            return 0
-        #end
+        return self.GetAttribute(BSFileHeader.FileHeaderType.CREDATE, VMSBackupHelper.sizeof.int64_t, False, 0)
     #end
 
     def REVDATE(self) -> int :
-        if None != self.kREVDATE :
-            kText   = bytes(self.kREVDATE.T_TEXT())
-            kFormat = VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.int64_t.name]
-            return struct.unpack(kFormat, kText)[0]
-        else :
-            return 0
-        #end
+        return self.GetAttribute(BSFileHeader.FileHeaderType.REVDATE, VMSBackupHelper.sizeof.int64_t, False, 0)
     #end
 
     def EXPDATE(self) -> int :
-        if None != self.kEXPDATE :
-            kText   = bytes(self.kEXPDATE.T_TEXT())
-            kFormat = VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.int64_t.name]
-            return struct.unpack(kFormat, kText)[0]
-        else :
-            return 0
-        #end
+        return self.GetAttribute(BSFileHeader.FileHeaderType.EXPDATE, VMSBackupHelper.sizeof.int64_t, False, 0)
     #end
 
     def BAKDATE(self) -> int :
-        if None != self.kBAKDATE :
-            kText   = bytes(self.kBAKDATE.T_TEXT())
-            kFormat = VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.int64_t.name]
-            return struct.unpack(kFormat, kText)[0]
-        else :
-            return 0
-        #end
+        return self.GetAttribute(BSFileHeader.FileHeaderType.BAKDATE, VMSBackupHelper.sizeof.int64_t, False, 0)
     #end
 
     def VERLIMIT(self) -> int :
-        if None != self.kVERLIMIT :
-            kText   = bytes(self.kVERLIMIT.T_TEXT())
-            kFormat = VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint16_t.name]
-            return struct.unpack(kFormat, kText)[0]
-        else :
-            return 0
+        return self.GetAttribute(BSFileHeader.FileHeaderType.VERLIMIT, VMSBackupHelper.sizeof.uint16_t, False, 0)
+    #end
+
+    kBuffer     : bytes
+    kAttributes : dict      # Attribute Type -> (Offset, Size) within kBuffer
+    kDecoded    : dict
+
+#end
+
+def PeekFileName(kBlock : bytes | memoryview, nRSize : int, nOffset : int = 0) -> str | None :
+
+    # Find just the File Name of a File Record, without decoding any of its other attributes, such that records
+    # for files that aren't of interest can be skipped cheaply.  This walks the attributes exactly as
+    # BSFileHeader.LoadHeaderFromBuffer does, returning None if the File Name is truncated, in which case only
+    # a full decode will do.
+    nAddress = 2
+
+    while nAddress < nRSize :
+
+        nStart = nOffset + nAddress
+
+        if (len(kBlock) - nStart) < _ATTRIBUTE_STRUCT.size : break
+
+        nSize, nType = _ATTRIBUTE_STRUCT.unpack_from(kBlock, nStart)
+        nStart      += _ATTRIBUTE_STRUCT.size
+
+        if BSFileHeader.FileHeaderType.FILENAME == nType :
+            if (len(kBlock) - nStart) < nSize :
+                return None
+            #end
+            return bytes(kBlock[nStart:nStart + nSize]).decode("latin-1")
         #end
+
+        # Truncated attributes don't advance past their header
+        nAddress += _ATTRIBUTE_STRUCT.size + (nSize if (len(kBlock) - nStart) >= nSize else 0)
+
     #end
 
-    kFILENAME   : BSAHeader.BSAHeader
-    kSTRUCLEV   : BSAHeader.BSAHeader
-    kFID        : BSAHeader.BSAHeader
-    kBACKLINK   : BSAHeader.BSAHeader
-    kFILESIZE   : BSAHeader.BSAHeader
-    kUIC        : BSAHeader.BSAHeader
-    kFPRO       : BSAHeader.BSAHeader
-    kRPRO       : BSAHeader.BSAHeader
-    kACLEVEL    : BSAHeader.BSAHeader
-    kUCHAR      : BSAHeader.BSAHeader
-    kRECATTR    : BSAHeader.BSAHeader
-    kREVISION   : BSAHeader.BSAHeader
-    kCREDATE    : BSAHeader.BSAHeader
-    kREVDATE    : BSAHeader.BSAHeader
-    kEXPDATE    : BSAHeader.BSAHeader
-    kBAKDATE    : BSAHeader.BSAHeader
-    kVERLIMIT   : BSAHeader.BSAHeader
-    kHIGHWATER  : BSAHeader.BSAHeader
+    return ""
 
 #end
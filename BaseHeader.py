@@ -1,38 +1,76 @@
 import VMSBackupHelper
 import VMSBackupRAMCache
 
+class PartialHeaderFields :
+
+    # Stands in for the decoded fields of a header that's been cut short (i.e. a truncated save set), decoding
+    # each field as it's asked for, just as the aliased fields always are, so whatever fields are present can
+    # still be read
+
+    def __init__(self, kAddressData : VMSBackupHelper.addr, kBuffer : bytearray) -> None :
+
+        self.kAddressData = kAddressData
+        self.kBuffer      = kBuffer
+
+    #end
+
+    def __getattr__(self, kName : str) :
+        return self.kAddressData.get(kName, self.kBuffer)
+    #end
+
+    kAddressData : VMSBackupHelper.addr
+    kBuffer      : bytearray
+
+#end
+
 class BaseHeader :
 
     def __init__(self) -> None :
 
-        self.kCache  = {}
+        self.kFields = None
         self.kBuffer = bytearray()
 
     #end
 
+    def Decode(self) -> None :
+
+        # Decode every field in one go once the header is complete, after which the accessors are just
+        # attribute reads.  Until then, each field is decoded on demand.
+        if len(self.kBuffer) >= self.kAddressData.length() :
+            self.kFields = self.kAddressData.decode(self.kBuffer)
+        else :
+            self.kFields = PartialHeaderFields(kAddressData=self.kAddressData, kBuffer=self.kBuffer)
+        #end
+
+    #end
+
     def LoadHeaderFromFile(self, kFile : VMSBackupRAMCache.VMSBackupRAMCache) -> None :
         self.kBuffer += kFile.read(self.kAddressData.length())
+        self.Decode()
     #end
 
     def ExtendHeaderFromFile(self, kFile : VMSBackupRAMCache.VMSBackupRAMCache) -> None :
         if len(self.kBuffer) < self.kAddressData.length() :
             self.kBuffer += kFile.read(self.kAddressData.length() - len(self.kBuffer))
+            self.Decode()
         #end
     #end
 
-    def LoadHeaderFromBuffer(self, kBlock : bytes) -> None :
-        assert(len(kBlock) >= self.kAddressData.length())
-        self.kBuffer += kBlock[0:self.kAddressData.length()]
+    def LoadHeaderFromBuffer(self, kBlock : bytes | memoryview, nOffset : int = 0) -> None :
+        assert((len(kBlock) - nOffset) >= self.kAddressData.length())
+        self.kBuffer += kBlock[nOffset:nOffset + self.kAddressData.length()]
+        self.Decode()
     #end
 
     def ExtendHeaderFromBuffer(self, kBlock : bytes) -> None :
         if len(self.kBuffer) < self.kAddressData.length() :
             self.kBuffer += kBlock[len(self.kBuffer):self.kAddressData.length()]
+            self.Decode()
         #end
     #end
 
     kAddressData : VMSBackupHelper.addr = None
     kBuffer      : bytearray            = None
-    kCache       : dict                 = None
+    kFields      : tuple | PartialHeaderFields = None
 
 #end
\ No newline at end of file
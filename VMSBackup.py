@@ -1,7 +1,15 @@
 import sys
+import copy
+import contextlib
 import VMSBackupRAMCache
+import VMSBackupStream
+import VMSBackupTape
 import VMSBackupTypes
 import VMSBackupProcess
+import VMSBackupIndex
+import VMSBackupCatalog
+import VMSBackupSink
+import VMSBackupProfile
 
 __VMSVERSION__ = "1.8"
 
@@ -17,9 +25,9 @@ __VMSVERSION__ = "1.8"
 def DisplayHelp() :
     print(f"VMSBackup Version {__VMSVERSION__}")
     print(f"")
-    print(f"VMSBackup [FILE] [-L:listoption] [-N] [-X:extractmode] [-M:mask] [-F] [-V] [-D] [-?]")
+    print(f"VMSBackup [FILE] [-L:listoption] [-N] [-X:extractmode] [-M:mask] [-E:mask] [-F] [-V] [-T] [-R] [-P] [-I[:index]] [-J:workers] [-S] [-H:depth] [-K:saveset] [-C[:report]] [-NC] [-G:groupsize] [-Q:catalog] [-A:archive] [-W:sink] [-B:writers] [--profile[:file]] [--trace-alloc] [-D] [-?]")
     print(f"")
-    print(f"  FILE           Backup Data Set")
+    print(f"  FILE           Backup Data Set (optionally compressed), or - to read from stdin")
     print(f"  -L             Selects output list")
     print(f"  listoptions     S  Suppress Output             B  Brief Output (default)")
     print(f"                  F  Full Output                 C  CSV Output")
@@ -27,13 +35,46 @@ def DisplayHelp() :
     print(f"  -X             Selects Extraction Mode")
     print(f"  extractmode     S  Smart/Auto Mode (default)   A  ASCII Mode")
     print(f"                  B  Binary Mode                 R  Raw Mode")
+    print(f"                  T  Smart/Auto Mode (text heuristics)")
     print(f"  -M             File Extraction Mask")
     print(f"                  e.g. *.*, *.bin*, *a*.*-1 etc.")
     print(f"                  Default is *.*0.")
+    print(f"                  Separate several masks with commas, e.g. *.TXT,*.COM")
+    print(f"                  [DIR...] matches DIR and all of its subdirectories.")
+    print(f"  -E             File Exclusion Mask, in the same form as -M (default none)")
+    print(f"                  e.g. *.EXE,*.OBJ, [DIR.TMP...]*.*")
     print(f"  -F             Extract with full path (default off)")
     print(f"  -V             Extract with version numbers in the filename (default off)")
     print(f"  -T             Extract with file access/modification dates (default off)")
-    print(f"  -R             Use RAM Caching")
+    print(f"  -R             Use RAM Caching, optionally with a budget in MB (default off, 256MB)")
+    print(f"                  e.g. -R, -R:1024")
+    print(f"  -P             Use Memory Mapped File Access (default off)")
+    print(f"  -I             Build/Use a Save Set Index (default off)")
+    print(f"                  e.g. -I, -I:backup.idx.  Default is FILE.idx.")
+    print(f"  -J             Number of parallel extraction workers (default 1)")
+    print(f"                  e.g. -J:4")
+    print(f"  -S             Spool streamed input for an exact second pass (default off)")
+    print(f"  -H             Number of 1MB chunks to read ahead in the background, 0 for none (default 4)")
+    print(f"                  e.g. -H:16")
+    print(f"  -K             Select a Save Set from a tape image by number or name (default all)")
+    print(f"                  e.g. -K:2, -K:USERS.BCK")
+    print(f"  -C             Output a block integrity report (default off)")
+    print(f"                  e.g. -C, -C:report.csv.  Default is stdout.")
+    print(f"  -NC            Don't verify block CRC's")
+    print(f"  -G             XOR group size, if the save set's summary record doesn't give one (default 0)")
+    print(f"                  e.g. -G:10")
+    print(f"  -Q             Record every file in an SQLite catalog, whatever the mask (default off)")
+    print(f"                  e.g. -Q:archive.db")
+    print(f"  -A             Extract into a tar/zip archive, or - for a tar stream to stdout (default off)")
+    print(f"                  e.g. -A:files.tar.gz, -A:files.zip, -A:-")
+    print(f"  -W             Selects where extracted files are written (ignored with -A)")
+    print(f"  sink            F  File System (default)       N  Nowhere (benchmarking)")
+    print(f"                  H  SHA-256 manifest, e.g. -W:H, -W:H:manifest.txt.  Default is stdout.")
+    print(f"  -B             Number of background threads writing to the file system, 0 for none (default 4)")
+    print(f"                  e.g. -B:8")
+    print(f"  --profile      Profile each phase of processing, writing the statistics to a pstats file (default off)")
+    print(f"                  e.g. --profile, --profile:run.pstats.  Default is VMSBackup.pstats.")
+    print(f"  --trace-alloc  Report the peak memory and top allocation sites of each phase of processing (default off)")
     print(f"  -D             Debug Mode (default off)")
     print(f"  -DD            Enhanced Debug Mode (default off)")
     print(f"  -?             Display this help")
@@ -45,15 +86,71 @@ def VMSBackup(kFile : str, kOptions : VMSBackupTypes.VMSBackupParameters = None)
         kOptions = VMSBackupTypes.VMSBackupParameters()
     #end
 
+    # The Sink spans the whole run, since a tape image may hold any number of Save Sets
+    kSink = VMSBackupSink.CreateSink(kOptions=kOptions)
+
+    # Only host files can be written independently of one another, anything else is written one file at a time,
+    # so can't be shared out between parallel workers
+    if (kOptions.nWorkers > 1) and not kSink.bParallel :
+        print(f"WARNING : Parallel Extraction is only available when extracting to the file system")
+        kOptions          = copy.copy(kOptions)
+        kOptions.nWorkers = 1
+    #end
+
+    # Likewise for Profiling, with each phase being accumulated across Save Sets
+    kProfiler = VMSBackupProfile.VMSBackupProfiler(kProfileFile=kOptions.kProfileFile, bTraceAllocations=kOptions.bTraceAllocations, nTop=kOptions.nProfileTop)
+
+    try :
+
+        # Any listing would corrupt whatever's written to stdout, so it goes to stderr instead
+        if kSink.bStdout :
+            with contextlib.redirect_stdout(sys.stderr) :
+                bResult = VMSBackupExtract(kFile=kFile, kOptions=kOptions, kSink=kSink, kProfiler=kProfiler)
+            #end
+        else :
+            bResult = VMSBackupExtract(kFile=kFile, kOptions=kOptions, kSink=kSink, kProfiler=kProfiler)
+        #end
+
+    finally :
+
+        # Anything still being written in the background is finished off here, so counts towards closing
+        kProfiler.Begin(kPhase="Close")
+        kSink.finish()
+        kProfiler.End()
+
+    #end
+
+    kProfiler.Dump(kOutput=sys.stderr if kSink.bStdout else sys.stdout)
+
+    return bResult
+
+#end
+
+def VMSBackupExtract(kFile : str, kOptions : VMSBackupTypes.VMSBackupParameters, kSink : VMSBackupSink.VMSBackupSink, kProfiler : VMSBackupProfile.VMSBackupProfiler = None) -> bool :
+
+    # Streams (stdin, pipes, tape devices) can only be read forwards, as can compressed files, although those
+    # can at least be re-opened
+    bStream     = VMSBackupStream.IsStream(kFile)
+    bCompressed = (not bStream) and VMSBackupStream.IsCompressed(kFile)
+
+    # Tape Images may hold any number of Save Sets
+    bTapeImage  = (not bStream) and (not bCompressed) and VMSBackupTape.IsTapeImage(kFile)
+
     # Determine whether 2 passes are needed
     #
     # Scenario 1 : Smart Extract - Since we need to read the file first to determine if it's
-    #              ASCII or Binary.
-    # Scenario 2 : If the Extract Version is anything other than None, we need to read the
-    #              all the files to determine absolute/relative version numbers.
-    bTwoPassedRequired = (kOptions.bExtract and \
-                          (kOptions.eExtractMode == VMSBackupTypes.ExtractMode.SMART)) or \
-                         (kOptions.nExtractVersion != None)
+    #              ASCII or Binary.  This isn't needed if Smart Spooling is enabled, since each
+    #              file is then held back until it's been classified.
+    # Scenario 2 : If the Extract Version is relative (i.e. ;0 or ;-1), we need to read all
+    #              the files to determine the latest version numbers.  Absolute versions (and *)
+    #              can be decided as each file is encountered.  Streams instead rely upon the
+    #              newest version of a file being encountered first, unless rewinding is enabled.
+    bSmartPassRequired = kOptions.bExtract and \
+                         (kOptions.eExtractMode == VMSBackupTypes.ExtractMode.SMART) and \
+                         not kOptions.bSmartSpooling
+    bTwoPassedRequired = bSmartPassRequired or \
+                         ((kOptions.nExtractVersion != None) and (kOptions.nExtractVersion <= 0) and \
+                          ((not bStream) or kOptions.bStreamRewind))
 
     if VMSBackupTypes.ExtractDebug.NONE != kOptions.eExtractDebug :
 
@@ -69,11 +166,34 @@ def VMSBackup(kFile : str, kOptions : VMSBackupTypes.VMSBackupParameters = None)
         print(f"Extract                 = {["OFF", "ON"][kOptions.bExtract]}")
         print(f"Extract Mode            = {["SMART", "ASCII", "BINARY", "RAW"][kOptions.eExtractMode]}")
         print(f"Extract Mask            = {kOptions.kExtractMask}")
+        print(f"Exclude Mask            = {"NONE" if None == kOptions.kExcludeMask else kOptions.kExcludeMask}")
         print(f"Extract Version         = {"*" if None == kOptions.nExtractVersion else kOptions.nExtractVersion}")
         print(f"Extract Folders         = {["OFF", "ON"][kOptions.bExtractFolder]}")
         print(f"Extract with Version    = {["OFF", "ON"][kOptions.bExtractWithVersion]}")
         print(f"Extract with Dates      = {["OFF", "ON"][kOptions.bExtractWithDate]}")
         print(f"Use RAM Cache           = {["OFF", "ON"][kOptions.bRAMCaching]}")
+        print(f"RAM Cache Size          = {kOptions.nRAMCacheSize // (1024 * 1024)}MB")
+        print(f"Use Memory Mapping      = {["OFF", "ON"][kOptions.bMemoryMapping]}")
+        print(f"Use Save Set Index      = {["OFF", "ON"][kOptions.bIndex]}")
+        print(f"Extraction Workers      = {kOptions.nWorkers}")
+        print(f"Streamed Input          = {["OFF", "ON"][bStream]}")
+        print(f"Stream Rewinding        = {["OFF", "ON"][kOptions.bStreamRewind]}")
+        print(f"Compressed Input        = {["OFF", "ON"][bCompressed]}")
+        print(f"Read Ahead Depth        = {kOptions.nReadAheadDepth}")
+        print(f"Tape Image              = {["OFF", "ON"][bTapeImage]}")
+        print(f"Tape Save Set           = {"*" if None == kOptions.kTapeSaveSet else kOptions.kTapeSaveSet}")
+        print(f"Verify Block CRC        = {["OFF", "ON"][kOptions.bVerifyCRC]}")
+        print(f"Integrity Report        = {["OFF", "ON"][kOptions.bIntegrityReport]}")
+        print(f"Redundancy Group Size   = {kOptions.nGroupSize}")
+        print(f"Save Set Catalog        = {"OFF" if None == kOptions.kCatalogFile else kOptions.kCatalogFile}")
+        print(f"Archive Output          = {"OFF" if None == kOptions.kArchiveFile else kOptions.kArchiveFile}")
+        print(f"Output Sink             = {kOptions.eOutputSink.name if isinstance(kOptions.eOutputSink, VMSBackupTypes.OutputSink) else "CUSTOM"}")
+        print(f"Output Path             = {"." if None == kOptions.kOutputPath else kOptions.kOutputPath}")
+        print(f"Write Behind Threads    = {kOptions.nWriteBehindThreads}")
+        print(f"Profile                 = {"OFF" if None == kOptions.kProfileFile else kOptions.kProfileFile}")
+        print(f"Trace Allocations       = {["OFF", "ON"][kOptions.bTraceAllocations]}")
+        print(f"Smart Spooling          = {["OFF", "ON"][kOptions.bSmartSpooling]}")
+        print(f"Smart Classifier        = {kOptions.eClassifier.name if isinstance(kOptions.eClassifier, VMSBackupTypes.Classifier) else "CUSTOM"}")
         print(f"Extract Debug           = {["OFF", "ON (NORMAL)", "ON (ENHANCED)"][kOptions.eExtractDebug]}")
         print(f"Number of Passes        = {[1, 2][bTwoPassedRequired]}")
 
@@ -84,10 +204,270 @@ def VMSBackup(kFile : str, kOptions : VMSBackupTypes.VMSBackupParameters = None)
 
     #end
 
+    # Open the Tape Image, processing each selected Save Set in turn
+    if bTapeImage :
+
+        if kOptions.bIndex or (kOptions.nWorkers > 1) :
+            print(f"WARNING : Indexing and Parallel Extraction are unavailable for tape images")
+        #end
+
+        kTapeImage = VMSBackupTape.VMSBackupTapeImage(kFile=kFile)
+        bResult    = True
+
+        for nSaveSet, kSaveSetName in enumerate(kTapeImage.GetSaveSetNames()) :
+
+            if not kTapeImage.IsSelected(nSaveSet=nSaveSet, kSelection=kOptions.kTapeSaveSet) :
+                continue
+            #end
+
+            ##########################################################
+            # DEBUG
+
+            if VMSBackupTypes.ExtractDebug.NONE != kOptions.eExtractDebug :
+
+                print("*** DEBUG *** ", end="")
+                print(f"TAPE SAVE SET {nSaveSet + 1} {kSaveSetName}")
+
+            #end
+
+            # END DEBUG
+            ##########################################################
+
+            kCatalog = OpenCatalog(kFile=kFile, kOptions=kOptions, nPosition=nSaveSet + 1)
+            bResult  = VMSBackupProcess.VMSBackupProcess(kFile=kTapeImage.Open(nSaveSet=nSaveSet), kOptions=kOptions, bTwoPassesRequired=bTwoPassedRequired, kCatalog=kCatalog, kSink=kSink, kProfiler=kProfiler) and bResult
+            CloseCatalog(kCatalog=kCatalog)
+
+        #end
+
+        return bResult
+
+    #end
+
     # Open the File
-    kFileRAMCache = VMSBackupRAMCache.VMSBackupRAMCache(bRAMCaching=kOptions.bRAMCaching, kFile=kFile)
+    if bStream or bCompressed :
+        kFileRAMCache = VMSBackupStream.VMSBackupStream(kFile=kFile, bRewindable=bTwoPassedRequired, nReadAheadDepth=kOptions.nReadAheadDepth)
+    else :
+        kFileRAMCache = VMSBackupRAMCache.VMSBackupRAMCache(bRAMCaching=kOptions.bRAMCaching, kFile=kFile, bMemoryMapping=kOptions.bMemoryMapping, nReadAheadDepth=kOptions.nReadAheadDepth, nRAMCacheSize=kOptions.nRAMCacheSize)
+    #end
 
-    return VMSBackupProcess.VMSBackupProcess(kFile=kFileRAMCache, kOptions=kOptions, bTwoPassesRequired=bTwoPassedRequired)
+    # Open the Index
+    # Note: Streams can't be indexed, since there's no way to tell whether the index is still valid, nor to
+    #       seek to the files of interest, which also rules out Parallel Extraction.
+    kIndex = None
+    if bStream or bCompressed :
+        if kOptions.bIndex or (kOptions.nWorkers > 1) :
+            print(f"WARNING : Indexing and Parallel Extraction are unavailable for streamed or compressed input")
+        #end
+    elif kOptions.bIndex :
+        kIndex = VMSBackupIndex.VMSBackupIndex(kSaveSetFile=kFile, kIndexFile=kOptions.kIndexFile)
+    elif kOptions.bExtract and (kOptions.nWorkers > 1) :
+        # Parallel Extraction always needs an Index, but it needn't outlive this run
+        kIndex = VMSBackupIndex.VMSBackupIndex(kSaveSetFile=kFile, kIndexFile=kOptions.kIndexFile, bPersistent=False)
+    #end
+
+    kCatalog = OpenCatalog(kFile=kFile, kOptions=kOptions)
+    bResult  = VMSBackupProcess.VMSBackupProcess(kFile=kFileRAMCache, kOptions=kOptions, bTwoPassesRequired=bTwoPassedRequired, kIndex=kIndex, kCatalog=kCatalog, kSink=kSink, kProfiler=kProfiler)
+    CloseCatalog(kCatalog=kCatalog)
+
+    return bResult
+
+#end
+
+def OpenCatalog(kFile : str, kOptions : VMSBackupTypes.VMSBackupParameters, nPosition : int = None) -> VMSBackupCatalog.VMSBackupCatalog | None :
+
+    if None == kOptions.kCatalogFile :
+        return None
+    #end
+
+    return VMSBackupCatalog.VMSBackupCatalog(kCatalogFile=kOptions.kCatalogFile, kSource=kFile, nPosition=nPosition)
+
+#end
+
+def CloseCatalog(kCatalog : VMSBackupCatalog.VMSBackupCatalog | None) :
+
+    if None != kCatalog :
+        kCatalog.close()
+    #end
+
+#end
+
+def VMSBackupParseOption(kArg : str, kOptions : VMSBackupTypes.VMSBackupParameters) -> bool :
+
+    if kArg in ["-LS", "-L:S"] :
+        kOptions.eOutputType = VMSBackupTypes.OutputType.SUPPRESS
+    elif kArg in ["-LB", "-L:B"] :
+        kOptions.eOutputType = VMSBackupTypes.OutputType.BRIEF
+    elif kArg in ["-LF", "-L:F"] :
+        kOptions.eOutputType = VMSBackupTypes.OutputType.FULL
+    elif kArg in ["-LC", "-L:C"] :
+        kOptions.eOutputType = VMSBackupTypes.OutputType.CSV
+    elif "-N" == kArg :
+        kOptions.bExtract = False
+    elif "-NC" == kArg :
+        kOptions.bVerifyCRC = False
+    elif kArg.startswith("-C") :
+        kOptions.bIntegrityReport = True
+        if kArg.startswith("-C:") :
+            kOptions.kIntegrityReportFile = kArg[3:]
+        #end
+    elif kArg in ["-XS", "-X:S"] :
+        kOptions.eExtractMode = VMSBackupTypes.ExtractMode.SMART
+    elif kArg in ["-XT", "-X:T"] :
+        kOptions.eExtractMode = VMSBackupTypes.ExtractMode.SMART
+        kOptions.eClassifier  = VMSBackupTypes.Classifier.TEXT
+    elif kArg in ["-XA", "-X:A"] :
+        kOptions.eExtractMode = VMSBackupTypes.ExtractMode.ASCII
+    elif kArg in ["-XB", "-X:B"] :
+        kOptions.eExtractMode = VMSBackupTypes.ExtractMode.BINARY
+    elif kArg in ["-XR", "-X:R"] :
+        kOptions.eExtractMode = VMSBackupTypes.ExtractMode.RAW
+    elif kArg.startswith("-M") :
+        if kArg.startswith("-M:") :
+            kOptions.kExtractMask = kArg[3:]
+        else :
+            kOptions.kExtractMask = kArg[2:]
+        #end
+        if ";" in kOptions.kExtractMask :
+            kTokens = kOptions.kExtractMask.split(";")
+            if len(kTokens) != 2 :
+                print(f"WARNING : Invalid mask {kOptions.kExtractMask}")
+                kOptions.kExtractMask           = VMSBackupTypes.VMSBackupParameters.kExtractMask
+            else :
+                kOptions.kExtractMask           = kTokens[0]
+                if "*" == kTokens[1] :
+                    kOptions.nExtractVersion    = None
+                else :
+                    kOptions.nExtractVersion    = int(kTokens[1])
+                #end
+            #end
+        #end
+    elif kArg.startswith("-E") :
+        if kArg.startswith("-E:") :
+            kOptions.kExcludeMask = kArg[3:]
+        else :
+            kOptions.kExcludeMask = kArg[2:]
+        #end
+    elif "-F" == kArg :
+        kOptions.bExtractFolder = True
+    elif "-V" == kArg :
+        kOptions.bExtractWithVersion = True
+    elif "-T" == kArg :
+        kOptions.bExtractWithDate = True
+    elif kArg.startswith("-R") :
+        kOptions.bRAMCaching = True
+        if kArg.startswith("-R:") :
+            kSize = kArg[3:]
+        else :
+            kSize = kArg[2:]
+        #end
+        if kSize.isdigit() and (int(kSize) > 0) :
+            kOptions.nRAMCacheSize = int(kSize) * 1024 * 1024
+        elif len(kSize) > 0 :
+            print(f"WARNING : Invalid RAM cache size {kSize}")
+        #end
+    elif "-P" == kArg :
+        kOptions.bMemoryMapping = True
+    elif "-S" == kArg :
+        kOptions.bStreamRewind = True
+    elif kArg.startswith("-H") :
+        if kArg.startswith("-H:") :
+            kDepth = kArg[3:]
+        else :
+            kDepth = kArg[2:]
+        #end
+        if kDepth.isdigit() :
+            kOptions.nReadAheadDepth = int(kDepth)
+        else :
+            print(f"WARNING : Invalid read ahead depth {kDepth}")
+        #end
+    elif kArg.startswith("-K") :
+        if kArg.startswith("-K:") :
+            kSaveSet = kArg[3:]
+        else :
+            kSaveSet = kArg[2:]
+        #end
+        if kSaveSet.isdigit() :
+            kOptions.kTapeSaveSet = int(kSaveSet)
+        else :
+            kOptions.kTapeSaveSet = kSaveSet
+        #end
+    elif kArg.startswith("-G") :
+        if kArg.startswith("-G:") :
+            kGroupSize = kArg[3:]
+        else :
+            kGroupSize = kArg[2:]
+        #end
+        if kGroupSize.isdigit() :
+            kOptions.nGroupSize = int(kGroupSize)
+        else :
+            print(f"WARNING : Invalid group size {kGroupSize}")
+        #end
+    elif kArg.startswith("-A") :
+        if kArg.startswith("-A:") :
+            kOptions.kArchiveFile = kArg[3:]
+        else :
+            kOptions.kArchiveFile = kArg[2:]
+        #end
+    elif kArg in ["-WF", "-W:F"] :
+        kOptions.eOutputSink = VMSBackupTypes.OutputSink.FILESYSTEM
+    elif kArg in ["-WN", "-W:N"] :
+        kOptions.eOutputSink = VMSBackupTypes.OutputSink.NULL
+    elif kArg.startswith("-WH") or kArg.startswith("-W:H") :
+        kOptions.eOutputSink = VMSBackupTypes.OutputSink.HASH
+        if kArg.startswith("-W:H:") :
+            kOptions.kHashManifestFile = kArg[5:]
+        #end
+    elif kArg.startswith("-B") :
+        if kArg.startswith("-B:") :
+            kThreads = kArg[3:]
+        else :
+            kThreads = kArg[2:]
+        #end
+        if kThreads.isdigit() :
+            kOptions.nWriteBehindThreads = int(kThreads)
+        else :
+            print(f"WARNING : Invalid number of writer threads {kThreads}")
+        #end
+    elif kArg.startswith("-Q") :
+        if kArg.startswith("-Q:") :
+            kOptions.kCatalogFile = kArg[3:]
+        else :
+            kOptions.kCatalogFile = kArg[2:]
+        #end
+    elif kArg.startswith("-J") :
+        if kArg.startswith("-J:") :
+            kWorkers = kArg[3:]
+        else :
+            kWorkers = kArg[2:]
+        #end
+        if kWorkers.isdigit() and (int(kWorkers) > 0) :
+            kOptions.nWorkers = int(kWorkers)
+        else :
+            print(f"WARNING : Invalid number of workers {kWorkers}")
+        #end
+    elif kArg.startswith("-I") :
+        kOptions.bIndex = True
+        if kArg.startswith("-I:") :
+            kOptions.kIndexFile = kArg[3:]
+        #end
+    elif kArg.startswith("--profile") :
+        if kArg.startswith("--profile:") :
+            kOptions.kProfileFile = kArg[10:]
+        else :
+            kOptions.kProfileFile = "VMSBackup.pstats"
+        #end
+    elif "--trace-alloc" == kArg :
+        kOptions.bTraceAllocations = True
+    elif "-DD" == kArg :
+        kOptions.eExtractDebug = VMSBackupTypes.ExtractDebug.ENHANCED
+    elif "-D" == kArg :
+        kOptions.eExtractDebug = VMSBackupTypes.ExtractDebug.BASIC
+    else :
+        print(f"WARNING : Unknown parameter {kArg}")
+        return False
+    #end
+
+    return True
 
 #end
 
@@ -103,63 +483,13 @@ def VMSBackupFromCLI(argv : list[str]) -> bool :
 
     for kArg in argv[1:] :
 
-        if bFileArgumentFound or kArg.startswith("-") :
-            if kArg in ["-LS", "-L:S"] :
-                kOptions.eOutputType = VMSBackupTypes.OutputType.SUPPRESS
-            elif kArg in ["-LB", "-L:B"] :
-                kOptions.eOutputType = VMSBackupTypes.OutputType.BRIEF
-            elif kArg in ["-LF", "-L:F"] :
-                kOptions.eOutputType = VMSBackupTypes.OutputType.FULL
-            elif kArg in ["-LC", "-L:C"] :
-                kOptions.eOutputType = VMSBackupTypes.OutputType.CSV
-            elif "-N" == kArg :
-                kOptions.bExtract = False
-            elif kArg in ["-XS", "-X:S"] :
-                kOptions.eExtractMode = VMSBackupTypes.ExtractMode.SMART
-            elif kArg in ["-XA", "-X:A"] :
-                kOptions.eExtractMode = VMSBackupTypes.ExtractMode.ASCII
-            elif kArg in ["-XB", "-X:B"] :
-                kOptions.eExtractMode = VMSBackupTypes.ExtractMode.BINARY
-            elif kArg in ["-XR", "-X:R"] :
-                kOptions.eExtractMode = VMSBackupTypes.ExtractMode.RAW
-            elif kArg.startswith("-M") :
-                if kArg.startswith("-M:") :
-                    kOptions.kExtractMask = kArg[3:]
-                else :
-                    kOptions.kExtractMask = kArg[2:]
-                #end
-                if ";" in kOptions.kExtractMask :
-                    kTokens = kOptions.kExtractMask.split(";")
-                    if len(kTokens) != 2 :
-                        print(f"WARNING : Invalid mask {kOptions.kExtractMask}")
-                        kOptions.kExtractMask           = VMSBackupTypes.VMSBackupParameters.kExtractMask
-                    else :
-                        kOptions.kExtractMask           = kTokens[0]
-                        if "*" == kTokens[1] :
-                            kOptions.nExtractVersion    = None
-                        else :
-                            kOptions.nExtractVersion    = int(kTokens[1])
-                        #end
-                    #end
-                #end
-            elif "-F" == kArg :
-                kOptions.bExtractFolder = True
-            elif "-V" == kArg :
-                kOptions.bExtractWithVersion = True
-            elif "-T" == kArg :
-                kOptions.bExtractWithDate = True
-            elif "-R" == kArg :
-                kOptions.bRAMCaching = True
-            elif "-DD" == kArg :
-                kOptions.eExtractDebug = VMSBackupTypes.ExtractDebug.ENHANCED
-            elif "-D" == kArg :
-                kOptions.eExtractDebug = VMSBackupTypes.ExtractDebug.BASIC
-            elif "-?" == kArg :
+        # Note: A lone - is the file argument, i.e. stdin
+        if bFileArgumentFound or (kArg.startswith("-") and ("-" != kArg)) :
+            if "-?" == kArg :
                 DisplayHelp()
                 return True
-            else :
-                print(f"WARNING : Unknown parameter {kArg}")
             #end
+            VMSBackupParseOption(kArg=kArg, kOptions=kOptions)
         else :
             kFile               = kArg
             bFileArgumentFound  = True
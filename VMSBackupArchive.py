@@ -0,0 +1,155 @@
+import sys
+import io
+import time
+import tarfile
+import zipfile
+import tempfile
+
+# Archive Output
+#
+# Rather than creating a host file (and folders) per extracted file, everything extracted can instead be
+# written into a single tar or zip archive, or as a tar stream to stdout, meaning the whole extraction becomes
+# one sequential write.  This is far quicker on network file systems, where creating many small files is slow.
+#
+# The format is decided by the archive's extension:
+#
+# - .zip                        : Zip, deflated.
+# - .tar.gz/.tgz                : Tar, gzip compressed.
+# - .tar.bz2/.tbz2              : Tar, bzip2 compressed.
+# - .tar.xz/.txz                : Tar, xz compressed.
+# - Anything else (or - stdout) : Tar, uncompressed.
+#
+# Zip members are streamed straight into the archive, however a tar member's header holds its size, which
+# isn't known until the file has been converted, so each is spooled (in RAM up to a limit) first.  In both
+# cases, the VMS revision date becomes the member's modification time.
+#
+# This is an Output Sink, see VMSBackupSink.
+
+_TAR_COMPRESSION = {
+    ".tar.gz"   : "gz",
+    ".tgz"      : "gz",
+    ".tar.bz2"  : "bz2",
+    ".tbz2"     : "bz2",
+    ".tar.xz"   : "xz",
+    ".txz"      : "xz"
+}
+
+# Zip can't represent dates prior to 1980
+_ZIP_MIN_DATE = (1980, 1, 1, 0, 0, 0)
+
+def IsZipArchive(kArchiveFile : str) -> bool :
+    return kArchiveFile.lower().endswith(".zip")
+#end
+
+def GetTarCompression(kArchiveFile : str) -> str :
+
+    for kExtension, kCompression in _TAR_COMPRESSION.items() :
+        if kArchiveFile.lower().endswith(kExtension) :
+            return kCompression
+        #end
+    #end
+
+    return ""
+
+#end
+
+def GetArchiveExtension(kArchiveFile : str) -> str :
+
+    if IsZipArchive(kArchiveFile) :
+        return ".zip"
+    #end
+
+    for kExtension in _TAR_COMPRESSION.keys() :
+        if kArchiveFile.lower().endswith(kExtension) :
+            return kExtension
+        #end
+    #end
+
+    return ".tar"
+
+#end
+
+class VMSBackupArchive :
+
+    def __init__(self, kArchiveFile : str, nSpoolRAMLimit : int) -> None :
+
+        self.kArchiveFile   = kArchiveFile
+        self.nSpoolRAMLimit = nSpoolRAMLimit
+        self.bStdout        = "-" == kArchiveFile
+        self.bZip           = (not self.bStdout) and IsZipArchive(kArchiveFile)
+        self.kTar           = None
+        self.kZip           = None
+        self.kStdout        = None
+        self.nFiles         = 0
+
+        if self.bZip :
+            self.kZip = zipfile.ZipFile(kArchiveFile, "w", compression=zipfile.ZIP_DEFLATED)
+        elif self.bStdout :
+            # Stream mode, since stdout may well be a pipe
+            self.kStdout = sys.stdout.buffer
+            self.kTar    = tarfile.open(fileobj=self.kStdout, mode="w|")
+        else :
+            self.kTar = tarfile.open(kArchiveFile, mode="w|" + GetTarCompression(kArchiveFile))
+        #end
+
+    #end
+
+    def open(self, kPath : list[str], nCreationDate : int, nModificationDate : int) -> io.IOBase :
+
+        if self.bZip :
+            kInfo = zipfile.ZipInfo("/".join(kPath), date_time=max(_ZIP_MIN_DATE, time.localtime(max(nModificationDate, 0))[:6]))
+            kInfo.compress_type = zipfile.ZIP_DEFLATED
+            return self.kZip.open(kInfo, "w", force_zip64=True)
+        #end
+
+        return tempfile.SpooledTemporaryFile(max_size=self.nSpoolRAMLimit)
+
+    #end
+
+    def close(self, kFileHandle : io.IOBase, kPath : list[str], nCreationDate : int, nModificationDate : int) -> None :
+
+        self.nFiles += 1
+
+        if self.bZip :
+            kFileHandle.close()
+            return
+        #end
+
+        kInfo       = tarfile.TarInfo(name="/".join(kPath))
+        kInfo.size  = kFileHandle.tell()
+        kInfo.mtime = max(nModificationDate, 0)
+        kInfo.mode  = 0o644
+
+        kFileHandle.seek(0)
+        self.kTar.addfile(kInfo, kFileHandle)
+        kFileHandle.close()
+
+    #end
+
+    def finish(self) -> None :
+
+        if None != self.kZip :
+            self.kZip.close()
+        #end
+
+        if None != self.kTar :
+            self.kTar.close()
+        #end
+
+        if self.bStdout :
+            self.kStdout.flush()
+        #end
+
+    #end
+
+    kArchiveFile    : str
+    nSpoolRAMLimit  : int
+    bStdout         : bool
+    bParallel       = False
+    bZip            : bool
+    kTar            : tarfile.TarFile = None
+    kZip            : zipfile.ZipFile = None
+    kStdout         = None
+    nFiles          = 0
+
+#end
\ No newline at end of file
@@ -0,0 +1,272 @@
+import sys
+import os
+import copy
+import glob
+import time
+import contextlib
+import concurrent.futures
+import VMSBackup
+import VMSBackupTypes
+import VMSBackupArchive
+
+# VMS Backup Batch Processing
+#
+# Processes any number of save sets from a single invocation, rather than paying for interpreter start up
+# and imports per save set from a shell loop.  Save sets are shared out across a pool of worker processes,
+# each of which processes one save set at a time into its own output folder (named after the save set),
+# with any listing output being written alongside it.  A summary of the files, bytes, errors and elapsed
+# time of each save set is reported as they complete, followed by the totals.
+
+def ExpandBatchInputs(kInputs : list[str]) -> list[str] :
+
+    # Inputs may be save sets, globs (** being recursive), or @manifest files listing one save set per line
+    kFiles = []
+
+    for kInput in kInputs :
+
+        if kInput.startswith("@") :
+
+            with open(kInput[1:], "r") as kManifest :
+                for kLine in kManifest :
+                    kLine = kLine.strip()
+                    if (len(kLine) > 0) and not kLine.startswith("#") :
+                        kFiles.append(kLine)
+                    #end
+                #end
+            #end
+
+        elif glob.has_magic(kInput) :
+
+            kFiles += sorted(glob.glob(kInput, recursive=True))
+
+        else :
+
+            kFiles.append(kInput)
+
+        #end
+
+    #end
+
+    return kFiles
+
+#end
+
+def GetOutputRoots(kFiles : list[str], kOutputPath : str) -> list[str] :
+
+    # Each save set is extracted to a folder named after it, with clashes (i.e. the same name in different
+    # folders) being made unique by a numeric suffix
+    kOutputRoots = []
+    kUsedNames   = set()
+
+    for kFile in kFiles :
+
+        kName       = os.path.splitext(os.path.basename(kFile))[0] or "SAVESET"
+        kUniqueName = kName
+        nSuffix     = 1
+
+        while kUniqueName.upper() in kUsedNames :
+            nSuffix    += 1
+            kUniqueName = f"{kName}_{nSuffix}"
+        #end
+
+        kUsedNames.add(kUniqueName.upper())
+        kOutputRoots.append(os.path.join(kOutputPath, kUniqueName))
+
+    #end
+
+    return kOutputRoots
+
+#end
+
+def VMSBackupBatchProcess(kFile : str, kOutputRoot : str, kOptions : VMSBackupTypes.VMSBackupParameters) -> dict :
+
+    kResult = {
+        "File"      : kFile,
+        "Output"    : kOutputRoot,
+        "Files"     : 0,
+        "Bytes"     : 0,
+        "Error"     : None,
+        "Seconds"   : 0.0
+    }
+
+    kFile        = os.path.abspath(kFile)
+    kOutputRoot  = os.path.abspath(kOutputRoot)
+
+    # Each save set gets an archive of its own, named just as its output folder would be
+    if None != kOptions.kArchiveFile :
+        kOptions              = copy.copy(kOptions)
+        kOptions.kArchiveFile = kOutputRoot + VMSBackupArchive.GetArchiveExtension(kOptions.kArchiveFile)
+    else :
+        kOptions              = copy.copy(kOptions)
+        kOptions.kOutputPath  = kOutputRoot
+    #end
+
+    nStart       = time.perf_counter()
+
+    try :
+
+        # Note: Nothing is extracted to the output folder when writing an archive
+        if None == kOptions.kArchiveFile :
+            os.makedirs(kOutputRoot, exist_ok=True)
+        #end
+
+        # Listings can't be interleaved on stdout, so each goes to a file alongside the extracted files
+        if VMSBackupTypes.OutputType.SUPPRESS == kOptions.eOutputType :
+            VMSBackup.VMSBackup(kFile=kFile, kOptions=kOptions)
+        else :
+            with open(kOutputRoot + ".lis", "w") as kListing, contextlib.redirect_stdout(kListing) :
+                VMSBackup.VMSBackup(kFile=kFile, kOptions=kOptions)
+            #end
+        #end
+
+    except Exception as kException :
+
+        kResult["Error"] = f"{type(kException).__name__}: {kException}"
+
+    #end
+
+    kResult["Seconds"] = time.perf_counter() - nStart
+
+    if (None != kOptions.kArchiveFile) and os.path.isfile(kOptions.kArchiveFile) :
+        kResult["Bytes"] += os.path.getsize(kOptions.kArchiveFile)
+    #end
+
+    for kPath, _, kFileNames in os.walk(kOutputRoot) :
+        for kFileName in kFileNames :
+            kResult["Files"] += 1
+            kResult["Bytes"] += os.path.getsize(os.path.join(kPath, kFileName))
+        #end
+    #end
+
+    return kResult
+
+#end
+
+def VMSBackupBatch(kFiles : list[str], kOutputPath : str, kOptions : VMSBackupTypes.VMSBackupParameters = None, nWorkers : int = None, fnProgress = None) -> list[dict] :
+
+    if None == kOptions :
+        kOptions = VMSBackupTypes.VMSBackupParameters()
+    #end
+
+    if None == nWorkers :
+        nWorkers = os.cpu_count() or 1
+    #end
+
+    # Each save set is already being processed in a process of its own
+    kOptions          = copy.copy(kOptions)
+    kOptions.nWorkers = 1
+
+    # Every save set shares the one catalog, which is opened by each worker process in turn, so the path is
+    # pinned to the caller's working directory now, rather than being left to wherever a worker happens to be
+    # running from.  Only the output goes to each save set's own folder, via kOptions.kOutputPath.
+    if None != kOptions.kCatalogFile :
+        kOptions.kCatalogFile = os.path.abspath(kOptions.kCatalogFile)
+    #end
+
+    kOutputRoots = GetOutputRoots(kFiles=kFiles, kOutputPath=kOutputPath)
+    kResults     = [None] * len(kFiles)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=nWorkers) as kExecutor :
+
+        kFutures = {kExecutor.submit(VMSBackupBatchProcess, kFile, kOutputRoot, kOptions) : nFile for nFile, (kFile, kOutputRoot) in enumerate(zip(kFiles, kOutputRoots))}
+
+        for kFuture in concurrent.futures.as_completed(kFutures) :
+
+            nFile = kFutures[kFuture]
+
+            try :
+                kResults[nFile] = kFuture.result()
+            except Exception as kException :
+                # i.e. the worker process itself died
+                kResults[nFile] = {"File" : kFiles[nFile], "Output" : kOutputRoots[nFile], "Files" : 0, "Bytes" : 0, "Error" : f"{type(kException).__name__}: {kException}", "Seconds" : 0.0}
+            #end
+
+            if None != fnProgress :
+                fnProgress(kResults[nFile])
+            #end
+
+        #end
+
+    #end
+
+    return kResults
+
+#end
+
+def DisplayHelp() :
+    print(f"VMSBackupBatch [FILE|GLOB|@MANIFEST ...] [-O:outputpath] [-J:workers] [VMSBackup options] [-?]")
+    print(f"")
+    print(f"  FILE           Backup Data Set")
+    print(f"  GLOB           Backup Data Sets matching a wildcard, ** matching any number of folders")
+    print(f"                  e.g. \"archive/**/*.BCK\"")
+    print(f"  @MANIFEST      File listing one Backup Data Set per line")
+    print(f"  -O             Folder to create each Backup Data Set's output folder in (default .)")
+    print(f"  -J             Number of Backup Data Sets to process at once (default number of CPUs)")
+    print(f"  -?             Display this help")
+    print(f"")
+    print(f"All other options are passed on to VMSBackup (see VMSBackup -?)")
+#end
+
+def DisplayResult(kResult : dict) :
+    kStatus = "OK" if None == kResult["Error"] else kResult["Error"]
+    print(f"{kResult["Files"]:>8} {kResult["Bytes"]:>14} {kResult["Seconds"]:>10.3f}  {kResult["File"]}  {kStatus}")
+#end
+
+def VMSBackupBatchFromCLI(argv : list[str]) -> bool :
+
+    if len(argv) < 2 :
+        DisplayHelp()
+        return False
+    #end
+
+    kOptions    = VMSBackupTypes.VMSBackupParameters()
+    kInputs     = []
+    kOutputPath = "."
+    nWorkers    = None
+
+    for kArg in argv[1:] :
+
+        if kArg.startswith("-O") :
+            kOutputPath = kArg[3:] if kArg.startswith("-O:") else kArg[2:]
+        elif kArg.startswith("-J") :
+            kWorkers = kArg[3:] if kArg.startswith("-J:") else kArg[2:]
+            if kWorkers.isdigit() and (int(kWorkers) > 0) :
+                nWorkers = int(kWorkers)
+            else :
+                print(f"WARNING : Invalid number of workers {kWorkers}")
+            #end
+        elif "-?" == kArg :
+            DisplayHelp()
+            return True
+        elif kArg.startswith("-") :
+            VMSBackup.VMSBackupParseOption(kArg=kArg, kOptions=kOptions)
+        else :
+            kInputs.append(kArg)
+        #end
+
+    #end
+
+    kFiles = ExpandBatchInputs(kInputs=kInputs)
+
+    print(f"{"Files":>8} {"Bytes":>14} {"Seconds":>10}  Save Set")
+
+    nStart   = time.perf_counter()
+    kResults = VMSBackupBatch(kFiles=kFiles, kOutputPath=kOutputPath, kOptions=kOptions, nWorkers=nWorkers, fnProgress=DisplayResult)
+    nTime    = time.perf_counter() - nStart
+
+    nErrors  = sum(1 for kResult in kResults if None != kResult["Error"])
+
+    print(f"")
+    print(f"Save Sets   : {len(kResults)}")
+    print(f"Files       : {sum(kResult["Files"] for kResult in kResults)}")
+    print(f"Bytes       : {sum(kResult["Bytes"] for kResult in kResults)}")
+    print(f"Errors      : {nErrors}")
+    print(f"Elapsed     : {nTime:.3f}s")
+
+    return 0 == nErrors
+
+#end
+
+if __name__ == "__main__" :
+    VMSBackupBatchFromCLI(sys.argv)
+#end
\ No newline at end of file
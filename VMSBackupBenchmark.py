@@ -0,0 +1,266 @@
+import sys
+import os
+import copy
+import random
+import shutil
+import tempfile
+import time
+import VMSBackup
+import VMSBackupTypes
+import VMSBackupRAMCache
+import VMSBackupGenerate
+import BBHeader
+import BRHeader
+
+# VMS Backup Benchmark
+#
+# Measures the throughput of each of the main processing modes against a save set, which is either
+# supplied, or generated from a synthetic folder of text and binary files.  Each mode is run a number of
+# times, with the best time being reported, since that's the one least disturbed by the rest of the system.
+
+kBenchmarkModes = {
+    "LIST"      : (False, VMSBackupTypes.ExtractMode.SMART),
+    "BINARY"    : (True,  VMSBackupTypes.ExtractMode.BINARY),
+    "ASCII"     : (True,  VMSBackupTypes.ExtractMode.ASCII),
+    "RAW"       : (True,  VMSBackupTypes.ExtractMode.RAW),
+    "SMART"     : (True,  VMSBackupTypes.ExtractMode.SMART)
+}
+
+def CountRecords(kFile : str) -> int :
+
+    # Count the Records in the Save Set, much like VMSBackupProcessBlock, minus the processing
+    kSaveSet     = VMSBackupRAMCache.VMSBackupRAMCache(bRAMCaching=False, kFile=kFile)
+    kBlockHeader = BBHeader.BBHeader()
+    kBlockHeader.LoadHeaderFromFile(kFile=kSaveSet)
+    kSaveSet.seek(0, os.SEEK_SET)
+
+    nRecords = 0
+
+    while not kSaveSet.feof() :
+
+        kBlock = kSaveSet.read(kBlockHeader.L_BLOCKSIZE())
+        if len(kBlock) < kBlockHeader.L_BLOCKSIZE() :
+            break
+        #end
+
+        kCurrentHeader = BBHeader.BBHeader()
+        kCurrentHeader.LoadHeaderFromBuffer(kBlock=kBlock)
+        nAddress = kCurrentHeader.GetLength()
+
+        while (nAddress + BRHeader.BRHeader.kAddressData.length()) <= len(kBlock) :
+
+            kRecordHeader = BRHeader.BRHeader()
+            kRecordHeader.LoadHeaderFromBuffer(kBlock=kBlock, nOffset=nAddress)
+            if 0 == kRecordHeader.W_RSIZE() :
+                break
+            #end
+
+            nRecords += 1
+            nAddress += kRecordHeader.GetLength() + kRecordHeader.W_RSIZE()
+
+        #end
+
+    #end
+
+    kSaveSet.close()
+
+    return nRecords
+
+#end
+
+def GenerateSyntheticTree(kPath : str, nFiles : int, nFileSize : int, nSeed : int = 1) -> None :
+
+    kRandom = random.Random(nSeed)
+    kWords  = [b"SYS$SYSTEM", b"DCL", b"VAX", b"ALPHA", b"RECORD", b"BLOCK", b"BACKUP", b"$", b"=", b"1024"]
+
+    for nFile in range(nFiles) :
+
+        kFolder = os.path.join(kPath, f"DIR{nFile % 8}")
+        os.makedirs(kFolder, exist_ok=True)
+
+        # Mostly text, since that's where the bulk of the processing effort goes
+        if 0 == (nFile % 4) :
+            kData = kRandom.randbytes(nFileSize)
+            kName = f"FILE{nFile}.EXE"
+        else :
+            kLines = []
+            nSize  = 0
+            while nSize < nFileSize :
+                kLine  = b" ".join(kRandom.choices(kWords, k=kRandom.randint(1, 16)))
+                kLines.append(kLine)
+                nSize += len(kLine) + 1
+            #end
+            kData = b"\n".join(kLines) + b"\n"
+            kName = f"FILE{nFile}.TXT"
+        #end
+
+        with open(os.path.join(kFolder, kName), "wb") as kHandle :
+            kHandle.write(kData)
+        #end
+
+    #end
+
+#end
+
+def VMSBackupBenchmark(kFile : str, kModes : list[str], nRepeats : int = 3, kBaseOptions : VMSBackupTypes.VMSBackupParameters = None) -> dict :
+
+    if None == kBaseOptions :
+        kBaseOptions = VMSBackupTypes.VMSBackupParameters()
+    #end
+
+    kFile        = os.path.abspath(kFile)
+    nBytes       = os.path.getsize(kFile)
+    nRecords     = CountRecords(kFile=kFile)
+    kResults     = {}
+
+    for kMode in kModes :
+
+        bExtract, eExtractMode = kBenchmarkModes[kMode]
+        nBestTime              = None
+
+        for _ in range(nRepeats) :
+
+            kOptions                    = copy.copy(kBaseOptions)
+            kOptions.eOutputType        = VMSBackupTypes.OutputType.SUPPRESS
+            kOptions.bExtract           = bExtract
+            kOptions.eExtractMode       = eExtractMode
+            kOptions.kExtractMask       = "*"
+            kOptions.nExtractVersion    = None
+
+            # Extract into a scratch folder, which is discarded afterwards
+            kOutputPath             = tempfile.mkdtemp(prefix="VMSBackupBenchmark")
+            kOptions.kOutputPath    = kOutputPath
+
+            try :
+                nStart = time.perf_counter()
+                VMSBackup.VMSBackup(kFile=kFile, kOptions=kOptions)
+                nTime  = time.perf_counter() - nStart
+            finally :
+                shutil.rmtree(kOutputPath, ignore_errors=True)
+            #end
+
+            if (None == nBestTime) or (nTime < nBestTime) :
+                nBestTime = nTime
+            #end
+
+        #end
+
+        kResults[kMode] = {
+            "Seconds"   : nBestTime,
+            "MB/s"      : (nBytes / (1024 * 1024)) / nBestTime,
+            "Records/s" : nRecords / nBestTime
+        }
+
+    #end
+
+    return kResults
+
+#end
+
+def DisplayHelp() :
+    print(f"VMSBackupBenchmark [FILE] [-G:files] [-S:size] [-B:blocksize] [-K:repeats] [-X:modes] [-W:sink] [-?]")
+    print(f"")
+    print(f"  FILE           Backup Data Set (if omitted, a synthetic one is generated)")
+    print(f"  -G             Number of files to generate (default 200)")
+    print(f"  -S             Size of each generated file in bytes (default 65536)")
+    print(f"  -B             Block Size of the generated save set (default 32256)")
+    print(f"  -K             Number of runs per mode, the best being reported (default 3)")
+    print(f"  -X             Comma separated modes to benchmark")
+    print(f"                  e.g. LIST,SMART.  Default is LIST,BINARY,ASCII,RAW,SMART.")
+    print(f"  -W             Where extracted files are written")
+    print(f"                  F  File System (default)       N  Nowhere, i.e. decoding alone")
+    print(f"  -?             Display this help")
+#end
+
+def VMSBackupBenchmarkFromCLI(argv : list[str]) -> bool :
+
+    kFile       = None
+    nFiles      = 200
+    nFileSize   = 65536
+    nBlockSize  = 32256
+    nRepeats    = 3
+    kModes      = list(kBenchmarkModes.keys())
+    kOptions    = VMSBackupTypes.VMSBackupParameters()
+
+    for kArg in argv[1:] :
+
+        # All options take a value, either as -X:value or -Xvalue
+        kValue = kArg[3:] if kArg[2:3] == ":" else kArg[2:]
+
+        if kArg.startswith("-G") :
+            nFiles     = int(kValue)
+        elif kArg.startswith("-S") :
+            nFileSize  = int(kValue)
+        elif kArg.startswith("-B") :
+            nBlockSize = int(kValue)
+        elif kArg.startswith("-K") :
+            nRepeats   = int(kValue)
+        elif kArg.startswith("-X") :
+            kModes     = kValue.upper().split(",")
+            for kMode in kModes :
+                if kMode not in kBenchmarkModes :
+                    print(f"WARNING : Unknown mode {kMode}")
+                    return False
+                #end
+            #end
+        elif kArg.startswith("-W") :
+            if "F" == kValue.upper() :
+                kOptions.eOutputSink = VMSBackupTypes.OutputSink.FILESYSTEM
+            elif "N" == kValue.upper() :
+                kOptions.eOutputSink = VMSBackupTypes.OutputSink.NULL
+            else :
+                print(f"WARNING : Unknown sink {kValue}")
+                return False
+            #end
+        elif "-?" == kArg :
+            DisplayHelp()
+            return True
+        elif kArg.startswith("-") :
+            print(f"WARNING : Unknown parameter {kArg}")
+        else :
+            kFile = kArg
+        #end
+
+    #end
+
+    kTemporaryPath = None
+
+    try :
+
+        if None == kFile :
+
+            kTemporaryPath = tempfile.mkdtemp(prefix="VMSBackupBenchmark")
+            kFile          = os.path.join(kTemporaryPath, "BENCHMARK.BCK")
+
+            GenerateSyntheticTree(kPath=os.path.join(kTemporaryPath, "SOURCE"), nFiles=nFiles, nFileSize=nFileSize)
+            VMSBackupGenerate.VMSBackupGenerate(kSourcePath=os.path.join(kTemporaryPath, "SOURCE"), kOutputFile=kFile, nBlockSize=nBlockSize)
+
+        #end
+
+        print(f"Save Set    : {kFile}")
+        print(f"Size        : {os.path.getsize(kFile) / (1024 * 1024):.2f} MB")
+        print(f"Records     : {CountRecords(kFile=kFile)}")
+        print(f"")
+        print(f"{"Mode":<10} {"Seconds":>10} {"MB/s":>10} {"Records/s":>12}")
+
+        kResults = VMSBackupBenchmark(kFile=kFile, kModes=kModes, nRepeats=nRepeats, kBaseOptions=kOptions)
+
+        for kMode, kResult in kResults.items() :
+            print(f"{kMode:<10} {kResult["Seconds"]:>10.3f} {kResult["MB/s"]:>10.2f} {kResult["Records/s"]:>12.0f}")
+        #end
+
+    finally :
+
+        if None != kTemporaryPath :
+            shutil.rmtree(kTemporaryPath, ignore_errors=True)
+        #end
+
+    #end
+
+    return True
+
+#end
+
+if __name__ == "__main__" :
+    VMSBackupBenchmarkFromCLI(sys.argv)
+#end
\ No newline at end of file
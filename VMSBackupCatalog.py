@@ -0,0 +1,233 @@
+import sys
+import os
+import sqlite3
+import datetime
+import BBHeader
+import BRHeader
+import BSFileHeader
+import VMSBackupMask
+
+# Save Set Catalog
+#
+# An SQLite database of the file records within any number of save sets, such that questions such as "which
+# tape has file X" can be answered without re-scanning the save sets.  Each save set processed gets a row in
+# the savesets table, identified by the file it came from (and its position on the tape for tape images), with
+# each of its file records getting a row in the files table.  Re-cataloguing a save set replaces its previous
+# rows rather than duplicating them.
+#
+# Rows are buffered and inserted in batches within a single transaction, since committing per file would
+# spend far more time syncing the database than processing the save set.
+
+_CATALOG_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS savesets (
+        id                  INTEGER PRIMARY KEY,
+        source              TEXT NOT NULL,
+        position            INTEGER,
+        name                TEXT,
+        block_size          INTEGER,
+        catalogued          TEXT
+    );
+    CREATE TABLE IF NOT EXISTS files (
+        saveset             INTEGER NOT NULL REFERENCES savesets(id),
+        block               INTEGER,
+        filename            TEXT,
+        name                TEXT,
+        version             INTEGER,
+        fid_num             INTEGER,
+        fid_seq             INTEGER,
+        fid_rvn             INTEGER,
+        uic_group           INTEGER,
+        uic_member          INTEGER,
+        fpro                INTEGER,
+        record_format       INTEGER,
+        record_attributes   INTEGER,
+        record_size         INTEGER,
+        size_bytes          INTEGER,
+        allocated_blocks    INTEGER,
+        created             TEXT,
+        revised             TEXT,
+        expires             TEXT,
+        backed_up           TEXT,
+        revision            INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS files_name ON files(name);
+    CREATE INDEX IF NOT EXISTS files_saveset ON files(saveset);
+"""
+
+_CATALOG_INSERT = "INSERT INTO files VALUES (" + ", ".join(["?"] * 21) + ")"
+
+# VMS Epoch of 17th Nov 1858 (see TimeVMSToUnix), with times held as 100ns ticks
+_VMS_EPOCH = datetime.datetime(1858, 11, 17)
+
+def DecodeVMSTime(nVMSTime : int) -> str | None :
+
+    # Zero means no date (i.e. no expiry date), and negative times are delta times rather than dates
+    if nVMSTime <= 0 :
+        return None
+    #end
+
+    try :
+        return (_VMS_EPOCH + datetime.timedelta(microseconds=nVMSTime // 10)).isoformat(sep=" ")
+    except OverflowError :
+        return None
+    #end
+
+#end
+
+def GetFileHeaderField(kValues : list[int], nIndex : int) -> int | None :
+    return kValues[nIndex] if nIndex < len(kValues) else None
+#end
+
+class VMSBackupCatalog :
+
+    def __init__(self, kCatalogFile : str, kSource : str, nPosition : int = None, nBatchSize : int = 1000) -> None :
+
+        self.kCatalogFile   = kCatalogFile
+        self.kSource        = os.path.abspath(kSource) if "-" != kSource else kSource
+        self.nPosition      = nPosition
+        self.nBatchSize     = nBatchSize
+        self.nSaveSet       = None
+        self.kRows          = []
+        self.nFiles         = 0
+
+        # Several processes (i.e. batch mode) may be writing to the same catalog, so wait for the lock rather
+        # than failing outright
+        self.kConnection    = sqlite3.connect(kCatalogFile, timeout=60)
+        self.kConnection.executescript(_CATALOG_SCHEMA)
+
+    #end
+
+    def BeginSaveSet(self, kBlockHeader : BBHeader.BBHeader) -> None :
+
+        with self.kConnection :
+
+            # Replace anything previously catalogued for this save set
+            kSaveSets = [kRow[0] for kRow in self.kConnection.execute("SELECT id FROM savesets WHERE source = ? AND position IS ?", (self.kSource, self.nPosition))]
+            self.kConnection.executemany("DELETE FROM files WHERE saveset = ?", [(nSaveSet,) for nSaveSet in kSaveSets])
+            self.kConnection.executemany("DELETE FROM savesets WHERE id = ?", [(nSaveSet,) for nSaveSet in kSaveSets])
+
+            kCursor = self.kConnection.execute("INSERT INTO savesets (source, position, name, block_size, catalogued) VALUES (?, ?, ?, ?, ?)",
+                                               (self.kSource, self.nPosition, kBlockHeader.T_SSNAME(), kBlockHeader.L_BLOCKSIZE(), datetime.datetime.now().isoformat(sep=" ", timespec="seconds")))
+            self.nSaveSet = kCursor.lastrowid
+
+        #end
+
+    #end
+
+    def AddFile(self, nBlock : int, kFileHeader : BSFileHeader.BSFileHeader, kHeader : BRHeader.BRHeader) -> None :
+
+        # Split the Version from the File Name
+        kFileName    = kFileHeader.FILENAME()
+        kName        = kFileName
+        nFileVersion = 0
+        if ";" in kFileName :
+            kName        = kFileName[:kFileName.find(";")]
+            nFileVersion = int(kFileName[kFileName.find(";") + 1:])
+        #end
+
+        kFID     = kFileHeader.FID()
+        kUIC     = kFileHeader.UIC()
+        kFPRO    = kFileHeader.FPRO()
+        kRECATTR = kFileHeader.RECATTR()
+
+        self.kRows.append((
+            self.nSaveSet,
+            nBlock,
+            kFileName,
+            kName,
+            nFileVersion,
+            GetFileHeaderField(kFID, 0),
+            GetFileHeaderField(kFID, 1),
+            GetFileHeaderField(kFID, 2),
+            GetFileHeaderField(kUIC, 1),
+            GetFileHeaderField(kUIC, 0),
+            (kFPRO[0] | (kFPRO[1] << 8)) if len(kFPRO) >= 2 else None,
+            GetFileHeaderField(kRECATTR, 0),
+            GetFileHeaderField(kRECATTR, 1),
+            kFileHeader.RECSIZE() if len(kRECATTR) >= 4 else None,
+            kFileHeader.FILESIZEBYTES() if len(kRECATTR) >= 14 else None,
+            kFileHeader.FILESIZE(),
+            DecodeVMSTime(kFileHeader.CREDATE()),
+            DecodeVMSTime(kFileHeader.REVDATE()),
+            DecodeVMSTime(kFileHeader.EXPDATE()),
+            DecodeVMSTime(kFileHeader.BAKDATE()),
+            kFileHeader.REVISION()
+        ))
+
+        if len(self.kRows) >= self.nBatchSize :
+            self.Flush()
+        #end
+
+    #end
+
+    def Flush(self) -> None :
+
+        if len(self.kRows) > 0 :
+            with self.kConnection :
+                self.kConnection.executemany(_CATALOG_INSERT, self.kRows)
+            #end
+            self.nFiles += len(self.kRows)
+            self.kRows   = []
+        #end
+
+    #end
+
+    def close(self) -> None :
+
+        self.Flush()
+        self.kConnection.close()
+
+    #end
+
+    kCatalogFile    : str
+    kSource         : str
+    nPosition       = None
+    nBatchSize      : int
+    nSaveSet        = None
+    kRows           : list[tuple]
+    nFiles          = 0
+    kConnection     : sqlite3.Connection = None
+
+#end
+
+def FindFiles(kCatalogFile : str, kMask : str) -> list[tuple] :
+
+    # The mask is matched exactly as -M would match it (see VMSBackupMask), rather than through SQLite's own GLOB,
+    # which would take the brackets of a directory spec to be a character class.  SQLite calls REGEXP with the
+    # pattern first, which is the mask itself here, compiled (and cached) on first use.
+    with sqlite3.connect(kCatalogFile) as kConnection :
+        kConnection.create_function("REGEXP", 2, lambda kPattern, kString : (None != kString) and VMSBackupMask.CompileMask(kIncludeMasks=kPattern).Match(kFileName=kString), deterministic=True)
+        return kConnection.execute("SELECT savesets.source, savesets.position, savesets.name, files.filename, files.size_bytes, files.revised "
+                                   "FROM files JOIN savesets ON files.saveset = savesets.id "
+                                   "WHERE files.name REGEXP ? OR files.filename REGEXP ? "
+                                   "ORDER BY savesets.source, savesets.position, files.block", (kMask, kMask)).fetchall()
+    #end
+
+#end
+
+def DisplayHelp() :
+    print(f"VMSBackupCatalog [CATALOG] [MASK]")
+    print(f"")
+    print(f"  CATALOG        Catalog database written by VMSBackup -Q:catalog")
+    print(f"  MASK           File Name to search for, e.g. [DIR]*.TXT, [DIR...]*.*, *LOGIN.COM;*")
+#end
+
+def VMSBackupCatalogFromCLI(argv : list[str]) -> bool :
+
+    if len(argv) != 3 :
+        DisplayHelp()
+        return False
+    #end
+
+    for kSource, nPosition, kSaveSetName, kFileName, nSize, kRevised in FindFiles(kCatalogFile=argv[1], kMask=argv[2]) :
+        kLocation = kSource if None == nPosition else f"{kSource} ({nPosition})"
+        print(f"{kLocation}  {kSaveSetName}  {kFileName}  {nSize}  {kRevised}")
+    #end
+
+    return True
+
+#end
+
+if __name__ == "__main__" :
+    VMSBackupCatalogFromCLI(sys.argv)
+#end
\ No newline at end of file
@@ -0,0 +1,57 @@
+import VMSBackupTypes
+
+# Smart Mode File Classifiers
+#
+# Each classifier is handed a slice of file data, and returns True if that data means the file must be
+# treated as Binary.  Smart Mode keeps calling the classifier for each record until either the file has
+# been deemed Binary, or the file ends, at which point it's deemed ASCII.
+#
+# All of the classifiers operate on the whole slice at once via bytes methods, rather than looping over
+# each byte in Python, since this is by far the hottest path of the classification pass.
+
+# Bytes which are considered "normal" for a text file, i.e. everything printable plus the usual whitespace,
+# form feed, backspace and escape (used for terminal control sequences).  Anything else is a control byte.
+__TEXT_BYTES = bytes(range(0x20, 0x7F)) + b"\t\n\v\f\r\b\x1b"
+
+def IsBinaryHighBit(kData : bytes | memoryview) -> bool :
+
+    # The original rule, any byte with the top bit set makes the file Binary
+    return not bytes(kData).isascii()
+
+#end
+
+def IsBinaryText(kData : bytes | memoryview, nControlPercentage : int = 10) -> bool :
+
+    kData = bytes(kData)
+
+    if not kData.isascii() :
+        return True
+    #end
+
+    # Text files don't contain NUL's
+    if -1 != kData.find(b"\x00") :
+        return True
+    #end
+
+    # Nor do they contain a significant proportion of control characters
+    nControlBytes = len(kData.translate(None, __TEXT_BYTES))
+
+    return (nControlBytes * 100) > (len(kData) * nControlPercentage)
+
+#end
+
+kClassifiers = {
+    VMSBackupTypes.Classifier.HIGHBIT   : IsBinaryHighBit,
+    VMSBackupTypes.Classifier.TEXT      : IsBinaryText
+}
+
+def GetClassifier(kOptions : VMSBackupTypes.VMSBackupParameters) :
+
+    # A callable may be supplied in place of one of the built in classifiers
+    if callable(kOptions.eClassifier) :
+        return kOptions.eClassifier
+    #end
+
+    return kClassifiers[kOptions.eClassifier]
+
+#end
\ No newline at end of file
@@ -0,0 +1,473 @@
+import sys
+import os
+import struct
+import VMSBackupHelper
+import BBHeader
+import BRHeader
+import BSFileHeader
+import VMSBackupIntegrity
+
+# VMS Backup Save Set Generator
+#
+# Writes a synthetic save set from a host directory tree, such that the extraction code can be exercised
+# (and benchmarked) without needing real tapes.  Every host file becomes a single file record followed by
+# its VBN records, with the file contents re-encoded according to the selected record format:
+#
+# - FIX/STMLF/UDF : The data is written as-is.
+# - STM           : LF's become CR/LF's (text only).
+# - STMCR         : LF's become CR's (text only).
+# - VAR/VFC       : Each line (or each 80 bytes for binary data) becomes a length prefixed record, with VFC
+#                   records additionally carrying a 2 byte fixed control area.
+#
+# The save set is written by default without XOR redundancy groups or block CRC's.  When a group size is given,
+# an XOR block of the data following the block header of each block in the group is written after every group,
+# as well as after the final (possibly short) group, with the group size being recorded in the summary record
+# just as BACKUP does.
+
+# This matches the VMS Epoch of 17th Nov 1858 as 100ns ticks from the Unix Epoch (see TimeVMSToUnix)
+_VMS_EPOCH_OFFSET   = 0x07c95674beb4000
+_VMS_BLOCK_SIZE     = 512
+_RECORD_LENGTH      = 80
+_MAX_RECORD_LENGTH  = 32767
+
+_BSA_HEADER         = struct.Struct(VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint16_t.name][0] + "2" + VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint16_t.name][1])
+_UINT16             = struct.Struct(VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint16_t.name])
+_UINT32             = struct.Struct(VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint32_t.name])
+_INT64              = struct.Struct(VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.int64_t.name])
+
+# Structure Level 2, Version 1
+_STRUCLEV           = 0x0101
+
+# Summary Record Attributes
+_BSA_SSNAME         = 1
+_BSA_XORSIZE        = 14
+
+kRecordFormats = {
+    "UDF"   : BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_UDF,
+    "FIX"   : BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_FIX,
+    "VAR"   : BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_VAR,
+    "VFC"   : BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_VFC,
+    "STM"   : BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_STM,
+    "STMLF" : BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_STMLF,
+    "STMCR" : BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_STMCR
+}
+
+def TimeUnixToVMS(nUnixTime : float) -> int :
+    return int(nUnixTime * 10000000) + _VMS_EPOCH_OFFSET
+#end
+
+def EncodeBSA(eType : BSFileHeader.BSFileHeader.FileHeaderType, kData : bytes) -> bytes :
+    return _BSA_HEADER.pack(len(kData), eType) + kData
+#end
+
+def EncodeFileData(kData : bytes, eFormat : BSFileHeader.BSFileHeader.RecordFormatType) -> bytes :
+
+    bText = kData.isascii()
+
+    if eFormat in [BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_VAR,
+                   BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_VFC] :
+
+        # Text is split by line, anything else into fixed size chunks
+        if bText :
+            kRecords = kData.split(b"\n")
+            if (len(kRecords) > 0) and (0 == len(kRecords[-1])) :
+                kRecords.pop()
+            #end
+        else :
+            kRecords = [kData[i:i + _RECORD_LENGTH] for i in range(0, len(kData), _RECORD_LENGTH)]
+        #end
+
+        kEncoded = bytearray()
+
+        for kRecord in kRecords :
+
+            # Records can't exceed the maximum length, so split them if needed
+            for nStart in range(0, max(len(kRecord), 1), _MAX_RECORD_LENGTH) :
+
+                kChunk = kRecord[nStart:nStart + _MAX_RECORD_LENGTH]
+
+                if BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_VFC == eFormat :
+                    # The fixed control area counts towards the record length (LF before, CR after)
+                    kEncoded += _UINT16.pack(len(kChunk) + 2) + b"\x01\x8d" + kChunk
+                else :
+                    kEncoded += _UINT16.pack(len(kChunk)) + kChunk
+                #end
+
+                # Record Pointers aren't allowed to finish on an odd byte
+                if 0 != (len(kEncoded) % 2) :
+                    kEncoded.append(0)
+                #end
+
+            #end
+
+        #end
+
+        return bytes(kEncoded)
+
+    elif bText and (BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_STM == eFormat) :
+
+        return kData.replace(b"\n", b"\r\n")
+
+    elif bText and (BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_STMCR == eFormat) :
+
+        return kData.replace(b"\n", b"\r")
+
+    #end
+
+    return kData
+
+#end
+
+class VMSBackupGenerator :
+
+    def __init__(self, kOutputFile : str, nBlockSize : int = 8192, kSaveSetName : str = "GENERATED.BCK", bCRC : bool = False, nGroupSize : int = 0) -> None :
+
+        assert(nBlockSize >= (BBHeader.BBHeader.kAddressData.length() + BRHeader.BRHeader.kAddressData.length() + _VMS_BLOCK_SIZE))
+
+        self.kFileHandle    = open(kOutputFile, "wb")
+        self.nBlockSize     = nBlockSize
+        self.bCRC           = bCRC
+        self.nGroupSize     = nGroupSize
+        self.nGroupBlocks   = 0
+        self.nParity        = 0
+        self.kSaveSetName   = kSaveSetName.encode("ascii")
+        self.nBlockNumber   = 0
+        self.nFileID        = 0
+        self.nRecords       = 0
+        self.kBlock         = None
+
+        # Every save set starts with a summary record
+        kSummary = b"\x01\x01" + EncodeBSA(_BSA_SSNAME, self.kSaveSetName)
+        if self.nGroupSize > 0 :
+            kSummary += EncodeBSA(_BSA_XORSIZE, _UINT16.pack(self.nGroupSize))
+        #end
+        self.NewBlock()
+        self.AddRecord(eType=BRHeader.BRHeader.RecordType.RECORD_SUMMARY, kData=kSummary)
+
+    #end
+
+    def NewBlock(self) -> None :
+
+        self.FlushBlock()
+
+        self.nBlockNumber += 1
+        self.kBlock        = self.NewBlockHeader()
+
+    #end
+
+    def NewBlockHeader(self) -> bytearray :
+
+        kBlock       = bytearray(BBHeader.BBHeader.kAddressData.length())
+
+        kAddressData = BBHeader.BBHeader.kAddressData
+        kAddressData.put("W_SIZE",        kBlock, kAddressData.length())
+        kAddressData.put("W_OPSYS",       kBlock, 1024)
+        kAddressData.put("W_SUBSYS",      kBlock, 1)
+        kAddressData.put("W_APPLIC",      kBlock, 1)
+        kAddressData.put("L_NUMBER",      kBlock, self.nBlockNumber)
+        kAddressData.put("W_STRUCLEV",    kBlock, _STRUCLEV)
+        kAddressData.put("W_VOLNUM",      kBlock, 1)
+        kAddressData.put("L_CRC",         kBlock, 0)
+        kAddressData.put("L_BLOCKSIZE",   kBlock, self.nBlockSize)
+        kAddressData.put("L_FLAGS",       kBlock, 0 if self.bCRC else 1) # V_NOCRC
+
+        # The Save Set Name is a counted string
+        kName = bytes([len(self.kSaveSetName)]) + self.kSaveSetName
+        kAddressData.put("T_SSNAME",      kBlock, tuple(kName.ljust(32, b"\x00")[:32]))
+
+        return kBlock
+
+    #end
+
+    def FlushBlock(self) -> None :
+
+        if None != self.kBlock :
+            self.kBlock += bytes(self.nBlockSize - len(self.kBlock))
+            self.WriteBlock(kBlock=self.kBlock)
+
+            if self.nGroupSize > 0 :
+                self.nParity      ^= int.from_bytes(self.kBlock[BBHeader.BBHeader.kAddressData.length():], "little")
+                self.nGroupBlocks += 1
+                if self.nGroupBlocks == self.nGroupSize :
+                    self.WriteXORBlock()
+                #end
+            #end
+
+            self.kBlock  = None
+        #end
+
+    #end
+
+    def WriteBlock(self, kBlock : bytearray) -> None :
+
+        if self.bCRC :
+            BBHeader.BBHeader.kAddressData.put("L_CRC", kBlock, VMSBackupIntegrity.ComputeBlockCRC(kBlock=kBlock))
+        #end
+        self.kFileHandle.write(kBlock)
+
+    #end
+
+    def WriteXORBlock(self) -> None :
+
+        # The XOR block takes the next block number, with the XOR of the group as its data
+        self.nBlockNumber += 1
+
+        kBlock  = self.NewBlockHeader()
+        kBlock += self.nParity.to_bytes(self.nBlockSize - len(kBlock), "little")
+        self.WriteBlock(kBlock=kBlock)
+
+        self.nParity       = 0
+        self.nGroupBlocks  = 0
+
+    #end
+
+    def GetBlockSpace(self) -> int :
+        return self.nBlockSize - len(self.kBlock) - BRHeader.BRHeader.kAddressData.length()
+    #end
+
+    def IsRecordFitting(self, nLength : int) -> bool :
+
+        # Whatever's left over has to be able to hold the empty record header that ends the block, otherwise the
+        # reader would run off the end of the block looking for it
+        nRemaining = self.GetBlockSpace() - nLength
+        return (0 == nRemaining) or (nRemaining >= BRHeader.BRHeader.kAddressData.length())
+
+    #end
+
+    def AddRecord(self, eType : BRHeader.BRHeader.RecordType, kData : bytes, nAddress : int = 0) -> None :
+
+        if not self.IsRecordFitting(nLength=len(kData)) :
+            self.NewBlock()
+        #end
+
+        kRecordHeader = bytearray(BRHeader.BRHeader.kAddressData.length())
+        BRHeader.BRHeader.kAddressData.put("W_RSIZE",   kRecordHeader, len(kData))
+        BRHeader.BRHeader.kAddressData.put("W_RTYPE",   kRecordHeader, eType)
+        BRHeader.BRHeader.kAddressData.put("L_ADDRESS", kRecordHeader, nAddress)
+
+        self.kBlock   += kRecordHeader
+        self.kBlock   += kData
+        self.nRecords += 1
+
+    #end
+
+    def AddFile(self, kFileName : str, kData : bytes, eFormat : BSFileHeader.BSFileHeader.RecordFormatType, nVersion : int = 1, nModificationTime : float = 0) -> None :
+
+        kEncoded  = EncodeFileData(kData=kData, eFormat=eFormat)
+        nSize     = len(kEncoded)
+        nBlocks   = (nSize + _VMS_BLOCK_SIZE - 1) // _VMS_BLOCK_SIZE
+        bText     = kData.isascii()
+
+        self.nFileID += 1
+
+        # Record Attributes (FAT)
+        kRECATTR = bytearray(32)
+        kRECATTR[0] = eFormat
+        kRECATTR[1] = BSFileHeader.BSFileHeader.RecordAttributeType.RECORD_ATTRIBUTE_CRN if bText else 0
+        struct.pack_into("<6H", kRECATTR, 2, _RECORD_LENGTH, 0, nBlocks, 0, (nSize // _VMS_BLOCK_SIZE) + 1, nSize % _VMS_BLOCK_SIZE)
+        if BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_VFC == eFormat :
+            kRECATTR[15] = 2
+        #end
+
+        nVMSTime  = TimeUnixToVMS(nModificationTime)
+        kFileName = f"{kFileName};{nVersion}".encode("ascii")
+
+        kRecord   = b"\x01\x01"                                                                                      + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.FILENAME,  kFileName)                         + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.STRUCLEV,  b"\x02\x01")                       + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.FID,       struct.pack("<3H", self.nFileID, 1, 0)) + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.BACKLINK,  struct.pack("<3H", 4, 4, 0))       + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.FILESIZE,  _UINT32.pack(nBlocks))             + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.UIC,       struct.pack("<2H", 0o10, 0o200))   + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.FPRO,      b"\x00\xee")                       + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.UCHAR,     b"\x00\x00\x00\x00")               + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.RECATTR,   bytes(kRECATTR))                   + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.REVISION,  _UINT16.pack(nVersion))            + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.CREDATE,   _INT64.pack(nVMSTime))             + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.REVDATE,   _INT64.pack(nVMSTime))             + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.EXPDATE,   _INT64.pack(0))                    + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.BAKDATE,   _INT64.pack(nVMSTime))             + \
+                    EncodeBSA(BSFileHeader.BSFileHeader.FileHeaderType.VERLIMIT,  _UINT16.pack(0))
+
+        self.AddRecord(eType=BRHeader.BRHeader.RecordType.RECORD_FILE, kData=kRecord)
+
+        # VBN Records are always whole disk blocks, and fill as much of each save set block as possible
+        kEncoded += bytes((nBlocks * _VMS_BLOCK_SIZE) - nSize)
+        nVBN      = 1
+        nPosition = 0
+
+        while nPosition < len(kEncoded) :
+
+            nSpace = (self.GetBlockSpace() // _VMS_BLOCK_SIZE) * _VMS_BLOCK_SIZE
+            kChunk = kEncoded[nPosition:nPosition + nSpace]
+            while (len(kChunk) > 0) and not self.IsRecordFitting(nLength=len(kChunk)) :
+                kChunk = kChunk[:-_VMS_BLOCK_SIZE]
+            #end
+
+            if 0 == len(kChunk) :
+                self.NewBlock()
+                continue
+            #end
+
+            self.AddRecord(eType=BRHeader.BRHeader.RecordType.RECORD_VBN, kData=kChunk, nAddress=nVBN)
+            nVBN      += len(kChunk) // _VMS_BLOCK_SIZE
+            nPosition += len(kChunk)
+
+        #end
+
+    #end
+
+    def close(self) -> None :
+
+        self.FlushBlock()
+
+        # Finish off the final (short) group
+        if self.nGroupBlocks > 0 :
+            self.WriteXORBlock()
+        #end
+
+        self.kFileHandle.close()
+
+    #end
+
+    kFileHandle     = None
+    nBlockSize      : int
+    bCRC            : bool
+    nGroupSize      : int
+    nGroupBlocks    : int
+    nParity         : int
+    kSaveSetName    : bytes
+    nBlockNumber    : int
+    nFileID         : int
+    nRecords        : int
+    kBlock          : bytearray
+
+#end
+
+def ConvertHostPath(kRelativePath : str) -> str :
+
+    # Convert a host relative path into the VMS [DIR.SUBDIR]NAME.EXT convention
+    kParts    = kRelativePath.replace("\\", "/").split("/")
+    kFolders  = [k.upper().replace(".", "_") for k in kParts[:-1]]
+    kFileName = kParts[-1].upper()
+
+    if "." not in kFileName :
+        kFileName += "."
+    #end
+
+    if 0 == len(kFolders) :
+        kFolders = ["000000"]
+    #end
+
+    return f"[{".".join(kFolders)}]{kFileName}"
+
+#end
+
+def VMSBackupGenerate(kSourcePath : str, kOutputFile : str, nBlockSize : int = 8192, kFormats : list[str] = None, nVersions : int = 1, bCRC : bool = False, nGroupSize : int = 0) -> int :
+
+    # By default, cycle through every format
+    if None == kFormats :
+        kFormats = list(kRecordFormats.keys())
+    #end
+
+    kGenerator = VMSBackupGenerator(kOutputFile=kOutputFile, nBlockSize=nBlockSize, kSaveSetName=os.path.basename(kOutputFile).upper(), bCRC=bCRC, nGroupSize=nGroupSize)
+    nFiles     = 0
+
+    for kRoot, kFolders, kFiles in os.walk(kSourcePath) :
+
+        kFolders.sort()
+
+        for kFile in sorted(kFiles) :
+
+            kHostFile = os.path.join(kRoot, kFile)
+            kFileName = ConvertHostPath(os.path.relpath(kHostFile, kSourcePath))
+            eFormat   = kRecordFormats[kFormats[nFiles % len(kFormats)]]
+
+            with open(kHostFile, "rb") as kHandle :
+                kData = kHandle.read()
+            #end
+
+            # Newer versions come first in a save set
+            for nVersion in range(nVersions, 0, -1) :
+                kGenerator.AddFile(kFileName=kFileName, kData=kData, eFormat=eFormat, nVersion=nVersion, nModificationTime=os.path.getmtime(kHostFile))
+            #end
+
+            nFiles += 1
+
+        #end
+
+    #end
+
+    kGenerator.close()
+
+    return kGenerator.nRecords
+
+#end
+
+def DisplayHelp() :
+    print(f"VMSBackupGenerate [SOURCE] [FILE] [-B:blocksize] [-R:formats] [-V:versions] [-C] [-G:groupsize] [-?]")
+    print(f"")
+    print(f"  SOURCE         Host folder to generate the Backup Data Set from")
+    print(f"  FILE           Backup Data Set to write")
+    print(f"  -B             Block Size (default 8192)")
+    print(f"  -R             Comma separated Record Formats, cycled through per file")
+    print(f"                  e.g. VAR,STMLF.  Default is UDF,FIX,VAR,VFC,STM,STMLF,STMCR.")
+    print(f"  -V             Number of versions of each file (default 1)")
+    print(f"  -C             Write block CRC's (default off)")
+    print(f"  -G             Write an XOR block after every group of this many blocks (default 0)")
+    print(f"  -?             Display this help")
+#end
+
+def VMSBackupGenerateFromCLI(argv : list[str]) -> bool :
+
+    kPaths      = []
+    nBlockSize  = 8192
+    kFormats    = None
+    nVersions   = 1
+    bCRC        = False
+    nGroupSize  = 0
+
+    for kArg in argv[1:] :
+
+        if kArg.startswith("-B") :
+            nBlockSize = int(kArg[3:] if kArg.startswith("-B:") else kArg[2:])
+        elif kArg.startswith("-R") :
+            kFormats   = (kArg[3:] if kArg.startswith("-R:") else kArg[2:]).upper().split(",")
+            for kFormat in kFormats :
+                if kFormat not in kRecordFormats :
+                    print(f"WARNING : Unknown record format {kFormat}")
+                    return False
+                #end
+            #end
+        elif kArg.startswith("-V") :
+            nVersions  = int(kArg[3:] if kArg.startswith("-V:") else kArg[2:])
+        elif "-C" == kArg :
+            bCRC       = True
+        elif kArg.startswith("-G") :
+            nGroupSize = int(kArg[3:] if kArg.startswith("-G:") else kArg[2:])
+        elif "-?" == kArg :
+            DisplayHelp()
+            return True
+        elif kArg.startswith("-") :
+            print(f"WARNING : Unknown parameter {kArg}")
+        else :
+            kPaths.append(kArg)
+        #end
+
+    #end
+
+    if len(kPaths) != 2 :
+        DisplayHelp()
+        return False
+    #end
+
+    nRecords = VMSBackupGenerate(kSourcePath=kPaths[0], kOutputFile=kPaths[1], nBlockSize=nBlockSize, kFormats=kFormats, nVersions=nVersions, bCRC=bCRC, nGroupSize=nGroupSize)
+    print(f"Wrote {nRecords} records to {kPaths[1]}")
+
+    return True
+
+#end
+
+if __name__ == "__main__" :
+    VMSBackupGenerateFromCLI(sys.argv)
+#end
\ No newline at end of file
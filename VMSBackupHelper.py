@@ -1,6 +1,7 @@
 import enum
 import typing
 import struct
+import collections
 
 # Add Static Initialisation Functionality
 def static_init(cls):
@@ -52,6 +53,9 @@ class addr :
         self.kElements      = []
         self.kLookup        = {}
         self.nMaxAddress    = 0
+        self.kStruct        = None
+        self.kRecordType    = None
+        self.kArrays        = None
 
     #end
 
@@ -72,8 +76,12 @@ class addr :
             nAddress += self.kElements[self.kLookup[kBaseAddr]][1]
         #end
 
+        # Each element carries its own pre-compiled decoder, which is used for any element that can't be part
+        # of the combined decoder built by compile().
+        kElementStruct = struct.Struct(kUnpackType[kSize.name][0] + str(nArraySize) + kUnpackType[kSize.name][1])
+
         self.kLookup[kName] = len(self.kElements)
-        self.kElements.append(tuple([nAddress, nSize, kUnpackType[kSize.name], kSize]))
+        self.kElements.append(tuple([nAddress, nSize, kUnpackType[kSize.name], kSize, kElementStruct, kName]))
     
         if (nAddress + nSize) > self.nMaxAddress :
             self.nMaxAddress = nAddress + nSize
@@ -81,36 +89,101 @@ class addr :
 
     #end
 
-    def get(self, kName : str, kDataBuffer : bytes, kCache : dict) -> int :
+    def compile(self, kTypeName : str) -> None :
 
-        if kName in kCache :
+        # Build a single decoder for the whole layout, such that every field can be decoded in one call.
+        #
+        # Note: Many of the elements are aliases of each other (i.e. V_NOCRC is the first byte of L_FLAGS),
+        #       which a struct can't express, so only the elements that don't overlap an earlier element
+        #       are included, with the remainder decoded on demand via get().
+        kFormat      = kUnpackType[sizeof.uint8_t.name][0]
+        kNames       = []
+        self.kArrays = []
+        nAddress     = 0
+        nIndex       = 0
 
-            return kCache[kName]
+        for kElement in sorted(self.kElements, key=lambda k : k[0]) :
 
-        else :
+            if kElement[0] < nAddress :
+                continue
+            #end
 
-            assert(kName in self.kLookup)
+            nArraySize = kElement[1] // kElement[3].getValue()
 
-            kElementMetaData = self.kElements[self.kLookup[kName]]
-            nArraySize = kElementMetaData[1]//kElementMetaData[3].getValue()
-            kElementData = struct.unpack_from(kElementMetaData[2][0] + str(nArraySize) + kElementMetaData[2][1], kDataBuffer, kElementMetaData[0])
+            if kElement[0] > nAddress :
+                kFormat += str(kElement[0] - nAddress) + "x"
+            #end
+            kFormat += str(nArraySize) + kElement[2][1]
 
-            if nArraySize == 1 :
+            kNames.append(kElement[5])
+            if nArraySize > 1 :
+                self.kArrays.append(tuple([nIndex, nIndex + nArraySize]))
+            #end
 
-                assert(len(kElementData) == 1)
-                kCache[kName] = kElementData[0]
-                return kElementData[0]
+            nAddress = kElement[0] + kElement[1]
+            nIndex  += nArraySize
 
-            else :
+        #end
 
-                assert(len(kElementData) == nArraySize)
-                kCache[kName] = kElementData
-                return kElementData
+        self.kStruct     = struct.Struct(kFormat)
+        self.kRecordType = collections.namedtuple(kTypeName, kNames)
 
-            #end
+    #end
 
+    def decode(self, kDataBuffer : bytes | memoryview, nOffset : int = 0) -> tuple :
+
+        kElementData = self.kStruct.unpack_from(kDataBuffer, nOffset)
+
+        if 0 == len(self.kArrays) :
+            return self.kRecordType._make(kElementData)
+        #end
+
+        # Re-group any arrays into tuples of their own, so they look the same as they would via get()
+        kGroupedData = []
+        nIndex       = 0
+        for nStart, nEnd in self.kArrays :
+            kGroupedData += kElementData[nIndex:nStart]
+            kGroupedData.append(kElementData[nStart:nEnd])
+            nIndex = nEnd
         #end
+        kGroupedData += kElementData[nIndex:]
+
+        return self.kRecordType._make(kGroupedData)
+
+    #end
+
+    def get(self, kName : str, kDataBuffer : bytes | memoryview, nOffset : int = 0) -> int :
+
+        assert(kName in self.kLookup)
+
+        kElementMetaData = self.kElements[self.kLookup[kName]]
+        kElementData     = kElementMetaData[4].unpack_from(kDataBuffer, nOffset + kElementMetaData[0])
+
+        if len(kElementData) == 1 :
+            return kElementData[0]
+        else :
+            return kElementData
+        #end
+
+    #end
+
+    def put(self, kName : str, kDataBuffer : bytearray, kValue : int | tuple, nOffset : int = 0) -> None :
+
+        assert(kName in self.kLookup)
+
+        kElementMetaData = self.kElements[self.kLookup[kName]]
+
+        if isinstance(kValue, int) :
+            kElementMetaData[4].pack_into(kDataBuffer, nOffset + kElementMetaData[0], kValue)
+        else :
+            kElementMetaData[4].pack_into(kDataBuffer, nOffset + kElementMetaData[0], *kValue)
+        #end
+
+    #end
 
+    def offset(self, kName : str) -> int :
+        assert(kName in self.kLookup)
+        return self.kElements[self.kLookup[kName]][0]
     #end
 
     def length(self) :
@@ -120,5 +193,8 @@ class addr :
     kElements   : list = None
     kLookup     : dict = None
     nMaxAddress : int
+    kStruct     : struct.Struct = None
+    kRecordType : type = None
+    kArrays     : list = None
 
 #end
\ No newline at end of file
@@ -0,0 +1,207 @@
+import BBHeader
+import BRHeader
+import BSFileHeader
+
+import base64
+import hashlib
+import json
+import os
+
+# Save Set Index
+#
+# This is a sidecar file which records where every file lives within a save set, allowing later runs to skip
+# straight to the blocks of interest rather than re-scanning the whole save set.  For each file record this
+# holds:
+#
+# - The block containing the file record, and the block containing its last VBN record.
+# - The absolute byte range spanned by its VBN records (if any).
+# - The file record itself, meaning listings can be produced without touching the save set.
+# - The decoded File Name, Version, FID and RECATTR for the convenience of other tools.
+#
+# A non-persistent index is never loaded or saved, and is instead built purely for the benefit of the current
+# run (i.e. to share files out between parallel workers).
+#
+# The index is only trusted if the save set size, modification time and first block header all match those
+# recorded when the index was built.
+
+_INDEX_VERSION = 1
+
+class VMSBackupIndex :
+
+    def __init__(self, kSaveSetFile : str, kIndexFile : str = None, bPersistent : bool = True) -> None :
+
+        if None == kIndexFile :
+            kIndexFile = kSaveSetFile + ".idx"
+        #end
+
+        self.kSaveSetFile   = kSaveSetFile
+        self.kIndexFile     = kIndexFile
+        self.bPersistent    = bPersistent
+        self.kEntries       = []
+        self.kCurrent       = None
+        self.nBlockSize     = 0
+        self.kHeaderHash    = ""
+
+        # Note: Sources such as pipes don't have a meaningful size/time, in which case the index is never used
+        try :
+            kStat           = os.stat(kSaveSetFile)
+            self.nFileSize  = kStat.st_size
+            self.nFileTime  = kStat.st_mtime_ns
+        except OSError :
+            self.nFileSize  = None
+            self.nFileTime  = None
+        #end
+
+    #end
+
+    def Reset(self, kBlockHeader : BBHeader.BBHeader) -> None :
+
+        self.kEntries       = []
+        self.kCurrent       = None
+        self.nBlockSize     = kBlockHeader.L_BLOCKSIZE()
+        self.kHeaderHash    = hashlib.sha256(kBlockHeader.kBuffer).hexdigest()
+
+    #end
+
+    def Load(self, kBlockHeader : BBHeader.BBHeader) -> bool :
+
+        if (not self.bPersistent) or (None == self.nFileSize) or not os.path.isfile(self.kIndexFile) :
+            return False
+        #end
+
+        try :
+            with open(self.kIndexFile, "r") as kIndexHandle :
+                kIndex = json.load(kIndexHandle)
+            #end
+        except (OSError, ValueError) :
+            return False
+        #end
+
+        # Make sure the Index still reflects the Save Set
+        if (kIndex.get("Version")   != _INDEX_VERSION)                                          or \
+           (kIndex.get("Size")      != self.nFileSize)                                           or \
+           (kIndex.get("Time")      != self.nFileTime)                                           or \
+           (kIndex.get("Header")    != hashlib.sha256(kBlockHeader.kBuffer).hexdigest())         or \
+           (kIndex.get("BlockSize") != kBlockHeader.L_BLOCKSIZE()) :
+            return False
+        #end
+
+        self.kEntries       = kIndex["Files"]
+        self.kCurrent       = None
+        self.nBlockSize     = kIndex["BlockSize"]
+        self.kHeaderHash    = kIndex["Header"]
+
+        return True
+
+    #end
+
+    def Save(self) -> None :
+
+        if (not self.bPersistent) or (None == self.nFileSize) :
+            return
+        #end
+
+        kIndex = {
+            "Version"   : _INDEX_VERSION,
+            "Size"      : self.nFileSize,
+            "Time"      : self.nFileTime,
+            "Header"    : self.kHeaderHash,
+            "BlockSize" : self.nBlockSize,
+            "Files"     : self.kEntries
+        }
+
+        # Write to a temporary file first so that an interrupted run never leaves a truncated index behind
+        kTemporaryFile = self.kIndexFile + ".tmp"
+        with open(kTemporaryFile, "w") as kIndexHandle :
+            json.dump(kIndex, kIndexHandle, separators=(",", ":"))
+        #end
+        os.replace(kTemporaryFile, self.kIndexFile)
+
+    #end
+
+    def AddFile(self, nBlock : int, kRecordHeader : BRHeader.BRHeader, kRecord : bytes | memoryview) -> None :
+
+        kFileHeader = BSFileHeader.BSFileHeader()
+        kFileHeader.LoadHeaderFromBuffer(kBlock=kRecord, nRSize=kRecordHeader.W_RSIZE())
+
+        # Split the Version from the File Name
+        kFileName    = kFileHeader.FILENAME()
+        nFileVersion = 0
+        if ";" in kFileName :
+            nFileVersion = int(kFileName[kFileName.find(";") + 1:])
+        #end
+
+        self.kCurrent = {
+            "Name"      : kFileName,
+            "Version"   : nFileVersion,
+            "FID"       : list(kFileHeader.FID()),
+            "RECATTR"   : list(kFileHeader.RECATTR()),
+            "Block"     : nBlock,
+            "LastBlock" : nBlock,
+            "VBN"       : None,
+            "Header"    : base64.b64encode(kRecordHeader.kBuffer).decode("ascii"),
+            "Record"    : base64.b64encode(kRecord).decode("ascii")
+        }
+        self.kEntries.append(self.kCurrent)
+
+    #end
+
+    def AddVBN(self, nBlock : int, nAddress : int, nLength : int) -> None :
+
+        # VBN Records always belong to the most recent File Record
+        if None != self.kCurrent :
+
+            if None == self.kCurrent["VBN"] :
+                self.kCurrent["VBN"]    = [nAddress, nAddress + nLength]
+            else :
+                self.kCurrent["VBN"][1] = nAddress + nLength
+            #end
+            self.kCurrent["LastBlock"]  = nBlock
+
+        #end
+
+    #end
+
+    def GetRecord(self, kEntry : dict) -> tuple[BRHeader.BRHeader, bytes] :
+
+        kRecordHeader = BRHeader.BRHeader()
+        kRecordHeader.LoadHeaderFromBuffer(kBlock=base64.b64decode(kEntry["Header"]))
+
+        return kRecordHeader, base64.b64decode(kEntry["Record"])
+
+    #end
+
+    def GetBlockRanges(self, kEntries : list[dict], bMergeAdjacent : bool = True) -> list[tuple[int,int]] :
+
+        # Merge the block ranges of the requested files, such that no block is ever visited twice, which is
+        # also what stops a file being extracted twice should it share a block with another requested file.
+        # Ranges which merely follow on from each other are also merged by default, since that's one long
+        # read rather than several short ones, but keeping them apart allows them to be shared out.
+        kRanges = []
+        nGap    = self.nBlockSize if bMergeAdjacent else 0
+
+        for kEntry in sorted(kEntries, key=lambda k : k["Block"]) :
+
+            if (len(kRanges) > 0) and (kEntry["Block"] <= (kRanges[-1][1] + nGap)) :
+                kRanges[-1] = (kRanges[-1][0], max(kRanges[-1][1], kEntry["LastBlock"]))
+            else :
+                kRanges.append((kEntry["Block"], kEntry["LastBlock"]))
+            #end
+
+        #end
+
+        return kRanges
+
+    #end
+
+    kSaveSetFile    : str
+    kIndexFile      : str
+    bPersistent     : bool
+    kEntries        : list
+    kCurrent        : dict
+    nBlockSize      : int
+    kHeaderHash     : str
+    nFileSize       : int
+    nFileTime       : int
+
+#end
\ No newline at end of file
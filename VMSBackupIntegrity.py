@@ -0,0 +1,119 @@
+import zlib
+import BBHeader
+
+# Save Set Block Integrity
+#
+# Each save set block carries a CRC of the entire block, calculated with the CRC field itself zeroed, unless
+# the block header's V_NOCRC flag is set.  This is the AUTODIN-II CRC-32, as calculated by the VAX CRC
+# instruction with an initial value of -1, which is the same as the standard CRC-32 bar the final inversion,
+# so zlib does all the heavy lifting here rather than a table lookup per byte in Python.
+#
+# Note: Both the inverted and non-inverted forms are accepted, as tools other than BACKUP that write save sets
+#       aren't consistent about applying the final inversion.
+
+CRC_OK          = "OK"
+CRC_BAD         = "BAD"
+CRC_NONE        = "NOCRC"
+CRC_RECOVERED   = "RECOVERED"
+
+_CRC_OFFSET     = BBHeader.BBHeader.kAddressData.offset("L_CRC")
+_CRC_ZERO       = bytes(4)
+
+def ComputeBlockCRC(kBlock : bytes | memoryview) -> int :
+
+    # Skip over the CRC field, treating it as zero, without having to copy the block
+    kBlock = memoryview(kBlock)
+    nCRC   = zlib.crc32(kBlock[:_CRC_OFFSET])
+    nCRC   = zlib.crc32(_CRC_ZERO, nCRC)
+    nCRC   = zlib.crc32(kBlock[_CRC_OFFSET + len(_CRC_ZERO):], nCRC)
+
+    return nCRC ^ 0xFFFFFFFF
+
+#end
+
+def VerifyBlockCRC(kBlock : bytes | memoryview, kBlockHeader : BBHeader.BBHeader) -> tuple[str, int] :
+
+    if kBlockHeader.V_NOCRC() & 1 :
+        return CRC_NONE, None
+    #end
+
+    nCRC = ComputeBlockCRC(kBlock=kBlock)
+
+    if kBlockHeader.L_CRC() in [nCRC, nCRC ^ 0xFFFFFFFF] :
+        return CRC_OK, nCRC
+    #end
+
+    return CRC_BAD, nCRC
+
+#end
+
+class VMSBackupIntegrityReport :
+
+    # Records the outcome of verifying each block, keyed by its address so that blocks visited by more than
+    # one pass are only reported once
+
+    def __init__(self) -> None :
+
+        self.kBlocks    = {}
+        self.kCounts    = {CRC_OK : 0, CRC_BAD : 0, CRC_NONE : 0, CRC_RECOVERED : 0}
+
+    #end
+
+    def IsVerified(self, nBlock : int) -> bool :
+        return nBlock in self.kBlocks
+    #end
+
+    def Add(self, nBlock : int, nBlockNumber : int, kStatus : str, nExpectedCRC : int, nComputedCRC : int | None) -> None :
+
+        self.kBlocks[nBlock]     = (nBlockNumber, kStatus, nExpectedCRC, nComputedCRC)
+        self.kCounts[kStatus]   += 1
+
+    #end
+
+    def Merge(self, kBlocks : dict) -> None :
+
+        # Fold in the blocks verified elsewhere (i.e. by a parallel worker), keeping the first outcome recorded
+        # for any block visited by both
+        for nBlock, kEntry in kBlocks.items() :
+            if not self.IsVerified(nBlock=nBlock) :
+                nBlockNumber, kStatus, nExpectedCRC, nComputedCRC = kEntry
+                self.Add(nBlock=nBlock, nBlockNumber=nBlockNumber, kStatus=kStatus, nExpectedCRC=nExpectedCRC, nComputedCRC=nComputedCRC)
+            #end
+        #end
+
+    #end
+
+    def GetFailures(self) -> list[int] :
+        return [nBlock for nBlock, kEntry in self.kBlocks.items() if CRC_BAD == kEntry[1]]
+    #end
+
+    def Dump(self, kReportFile : str = None) -> None :
+
+        # CSV, one line per block, followed by a summary
+        kLines = ["Address,Block,Status,Expected CRC,Computed CRC"]
+
+        for nBlock in sorted(self.kBlocks.keys()) :
+            nBlockNumber, kStatus, nExpectedCRC, nComputedCRC = self.kBlocks[nBlock]
+            kComputedCRC = "" if None == nComputedCRC else f"0x{nComputedCRC:08X}"
+            kLines.append(f"0x{nBlock:08X},{nBlockNumber},{kStatus},0x{nExpectedCRC:08X},{kComputedCRC}")
+        #end
+
+        kSummary = f"Blocks Verified: {self.kCounts[CRC_OK]}, CRC Failures: {self.kCounts[CRC_BAD]}, No CRC: {self.kCounts[CRC_NONE]}, Recovered: {self.kCounts[CRC_RECOVERED]}"
+
+        if None == kReportFile :
+            print("")
+            print("\n".join(kLines))
+            print(kSummary)
+        else :
+            with open(kReportFile, "w") as kReportHandle :
+                kReportHandle.write("\n".join(kLines) + "\n")
+            #end
+            print(kSummary)
+        #end
+
+    #end
+
+    kBlocks     : dict
+    kCounts     : dict
+
+#end
\ No newline at end of file
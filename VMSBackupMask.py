@@ -0,0 +1,118 @@
+import re
+import functools
+
+# File Masks
+#
+# Masks are matched against the full VMS file name, directory included, minus the version, e.g.
+# [DIR.SUBDIR]FILE.TXT, with OpenVMS wildcard semantics:
+#
+# - *   : Any number of characters (including none), which may span directories, so *.* matches everything.
+# - %   : Any single character (? is also accepted).
+# - ... : Within a directory spec, any number of subdirectories, e.g. [DIR...]*.* matches [DIR]A.TXT,
+#         [DIR.SUB]A.TXT, [DIR.SUB.SUB]A.TXT etc.
+#
+# Everything else (including [ and ]) is literal, and much like OpenVMS, matching is case insensitive.
+#
+# Several masks may be given separated by commas, with a file being selected if it matches any of them, and
+# any exclusion masks (in the same form) then being used to deselect files.
+#
+# Each set of masks is compiled into a single regular expression once, rather than being re-interpreted for
+# every file record on every pass.
+
+def TranslateEllipsis(bDirectoryStart : bool, bDirectoryEnd : bool) -> str :
+
+    if bDirectoryStart and bDirectoryEnd :
+        # [...] - Any directory at all
+        return r"[^\]]*"
+    elif bDirectoryStart :
+        # [...NAME] - Any number of directories before NAME
+        return r"(?:[^.\]]+\.)*"
+    elif bDirectoryEnd :
+        # [NAME...] - Any number of directories after NAME
+        return r"(?:\.[^.\]]+)*"
+    #end
+
+    # [NAME...NAME] - Any number of directories in between
+    return r"(?:\.[^.\]]+)*\."
+
+#end
+
+def TranslateMask(kMask : str) -> str :
+
+    kPattern    = []
+    nPosition   = 0
+
+    while nPosition < len(kMask) :
+
+        if kMask.startswith("...", nPosition) :
+            kPattern.append(TranslateEllipsis(bDirectoryStart=kMask[nPosition - 1:nPosition] == "[", bDirectoryEnd=kMask[nPosition + 3:nPosition + 4] == "]"))
+            nPosition += 3
+            continue
+        #end
+
+        kCharacter = kMask[nPosition]
+
+        if "*" == kCharacter :
+            kPattern.append(".*")
+        elif kCharacter in "%?" :
+            kPattern.append(".")
+        else :
+            kPattern.append(re.escape(kCharacter))
+        #end
+
+        nPosition += 1
+
+    #end
+
+    return "".join(kPattern)
+
+#end
+
+def SplitMasks(kMasks : str | None) -> list[str] :
+
+    if None == kMasks :
+        return []
+    #end
+
+    return [kMask.strip() for kMask in kMasks.split(",") if len(kMask.strip()) > 0]
+
+#end
+
+def CompilePattern(kMasks : list[str]) -> re.Pattern | None :
+
+    if 0 == len(kMasks) :
+        return None
+    #end
+
+    return re.compile("|".join(f"(?:{TranslateMask(kMask)})" for kMask in kMasks), re.IGNORECASE | re.DOTALL)
+
+#end
+
+class VMSBackupMask :
+
+    def __init__(self, kIncludeMasks : str, kExcludeMasks : str = None) -> None :
+
+        self.kInclude = CompilePattern(kMasks=SplitMasks(kMasks=kIncludeMasks))
+        self.kExclude = CompilePattern(kMasks=SplitMasks(kMasks=kExcludeMasks))
+
+    #end
+
+    def Match(self, kFileName : str) -> bool :
+
+        if (None == self.kInclude) or (None == self.kInclude.fullmatch(kFileName)) :
+            return False
+        #end
+
+        return (None == self.kExclude) or (None == self.kExclude.fullmatch(kFileName))
+
+    #end
+
+    kInclude : re.Pattern | None
+    kExclude : re.Pattern | None
+
+#end
+
+@functools.lru_cache(maxsize=64)
+def CompileMask(kIncludeMasks : str, kExcludeMasks : str = None) -> VMSBackupMask :
+    return VMSBackupMask(kIncludeMasks=kIncludeMasks, kExcludeMasks=kExcludeMasks)
+#end
\ No newline at end of file
@@ -1,6 +1,14 @@
 import VMSBackupRAMCache
 import VMSBackupTypes
 import VMSBackupHelper
+import VMSBackupIndex
+import VMSBackupClassifier
+import VMSBackupIntegrity
+import VMSBackupRecovery
+import VMSBackupCatalog
+import VMSBackupSink
+import VMSBackupMask
+import VMSBackupProfile
 
 import BBHeader
 import BRHeader
@@ -8,26 +16,37 @@ import BSFileHeader
 
 import os
 import sys
-import fnmatch
 import datetime
 import math
 import struct
+import re
+import copy
+import concurrent.futures
+import multiprocessing
+import bisect
 
 # Calculate these once globally rather than recomputing each time when needed.
 __LINESEP         = bytes([ord(k) for k in os.linesep])
-__LINESEP_WINDOWS = bytes([ord(k) for k in "\r\n"])
-__CR              = ord('\r')
 __LF              = ord('\n')
+__CR_BYTE         = b"\r"
+__LF_BYTE         = b"\n"
+__EOL_PATTERN     = re.compile(rb"\r(\r)|\r\n|\r|\n")
+__EOL_REPLACEMENT = __LINESEP + rb"\1"
 
 def FileNameWildCardCompare(kString : str, kWildCard : str) :
 
-    # [] are frequently used in OpenVMS filenames, but to fnmatch, indicate ranges.
-    # Since we're only dealing with filenames, and the rest basically works, we can
-    # mitigate the issue somewhat.
-    kString   = kString.replace  ("[", "<").replace("]", ">")
-    kWildCard = kWildCard.replace("[", "<").replace("]", ">")
+    # See VMSBackupMask, the compiled mask is cached, so this is only really a convenience
+    return VMSBackupMask.CompileMask(kIncludeMasks=kWildCard).Match(kFileName=kString)
 
-    return fnmatch.fnmatch(name=kString, pat=kWildCard)
+#end
+
+def StripFileVersion(kFileName : str) -> str :
+
+    if ";" in kFileName :
+        return kFileName[:kFileName.find(";")]
+    #end
+
+    return kFileName
 
 #end
 
@@ -50,7 +69,7 @@ def VMSWriteEOL(kFileMetaData : VMSBackupTypes.VMSFileParameters, bForceEOL : bo
 
 #end
 
-def VMSWriteFile(kBlock : bytes, kFileMetaData : VMSBackupTypes.VMSFileParameters, nDataLength : int) :
+def VMSWriteFile(kBlock : bytes | memoryview, kFileMetaData : VMSBackupTypes.VMSFileParameters, nDataLength : int, nOffset : int = 0) :
 
     bLastElementWasLFCR = False
     bContainsLFCR       = False
@@ -60,17 +79,28 @@ def VMSWriteFile(kBlock : bytes, kFileMetaData : VMSBackupTypes.VMSFileParameter
         return
     #end
 
+    # Narrow the Block down to just the data being written.  Callers pass the whole block as a memoryview
+    # along with an offset, meaning this is a view rather than a copy.
+    kBlock = kBlock[nOffset:nOffset + nDataLength]
+
     if VMSBackupTypes.ExtractMode.ASCII == kFileMetaData.kMode :
 
         # Note: To improve throughput, ASCII Mode doesn't iterate one character at a time, and
-        #       instead finds all indices which contain the line seperators.  This allows burst
-        #       writing of everything in between.  This does improve average write time at the
-        #       expense of some additional complexity.
-        kIndicesOfInterest = [i for i,k in enumerate(kBlock[:nDataLength]) if k in __LINESEP_WINDOWS]
-        if 0 == len(kIndicesOfInterest) :
-
-            # This would fall into functionality associated with:
-            # (__LF != kBlock[nCRLFIndex]) and kFileMetaData.bLFDetected :
+        #       instead lets the regular expression engine normalise every line separator in a
+        #       single call.  The rules being:
+        #
+        #       CR LF    -> EOL
+        #       LF       -> EOL
+        #       CR CR    -> EOL CR
+        #       CR x     -> EOL x
+        #
+        #       A CR at the very end of the data can't be assessed until the next write, so it's
+        #       held back via bLFDetected, and re-joined to the front of the next lot of data.
+        kData = bytes(kBlock)
+
+        if (-1 == kData.find(__CR_BYTE)) and (-1 == kData.find(__LF_BYTE)) :
+
+            # A pending CR followed by anything other than CR/LF
             if kFileMetaData.bLFDetected :
 
                 # This is not seen as a valid EOL, so normalise it
@@ -81,118 +111,39 @@ def VMSWriteFile(kBlock : bytes, kFileMetaData : VMSBackupTypes.VMSFileParameter
             kFileMetaData.bLFDetected         = False
             kFileMetaData.bLastElementWasLFCR = False
 
-            kFileMetaData.kFileHandle.write(kBlock[:nDataLength])
+            kFileMetaData.kFileHandle.write(kData)
             return
 
         #end
 
-        # File I/O Typically likes being performed in large bursts, therefore we buffer the data
-        # into RAM first.
-        kBytes = bytearray()
-        nLastIndex = 0
-
-        for nCRLFIndex in kIndicesOfInterest :
-
-            if nCRLFIndex > nLastIndex :
-
-                # This would fall into functionality associated with:
-                # (__LF != kBlock[nCRLFIndex]) and kFileMetaData.bLFDetected :
-                if kFileMetaData.bLFDetected :
-
-                    # This is not seen as a valid EOL, so normalise it
-                    kBytes.extend(__LINESEP)
-
-                #end
-
-                kFileMetaData.bLFDetected         = False
-                kFileMetaData.bLastElementWasLFCR = False
-
-                kBytes.extend(kBlock[nLastIndex:nCRLFIndex])
-
-            #end
-
-            if __CR == kBlock[nCRLFIndex] and not kFileMetaData.bLFDetected :
-
-                # Do nothing whilst the EOL is assessed
-                kFileMetaData.bLFDetected   = True
-
-                # Indicate this data package contains an LF/CR entry
-                bContainsLFCR               = True
-                bLastElementWasLFCR         = (nCRLFIndex+1) == nDataLength
-
-            elif (__LF == kBlock[nCRLFIndex]) and kFileMetaData.bLFDetected :
-            
-                # This file already contains standard EOL conventions
-                kBytes += __LINESEP
-                kFileMetaData.bLFDetected = False
-
-                # Indicate this data package contains an LF/CR entry
-                bContainsLFCR               = True
-                bLastElementWasLFCR         = (nCRLFIndex+1) == nDataLength
-
-            elif (__LF == kBlock[nCRLFIndex]) and not kFileMetaData.bLFDetected :
-            
-                # This is not seen as a valid EOL, so normalise it
-                kBytes += __LINESEP
-                kFileMetaData.bLFDetected = False
-
-                # Indicate this data package contains an LF/CR entry
-                bContainsLFCR               = True
-                bLastElementWasLFCR         = (nCRLFIndex+1) == nDataLength
-
-            elif (__LF != kBlock[nCRLFIndex]) and kFileMetaData.bLFDetected :
-            
-                # This is not seen as a valid EOL, so normalise it
-                kBytes += __LINESEP
-                kFileMetaData.bLFDetected = False
-
-                # Indicate this data package contains an LF/CR entry
-                bContainsLFCR               = True
-                
-                # Note: This indicates the *previous* byte was an LF/CR therefore the current
-                #       element isn't, hence no check to see if the Last Element is an LF/CR
-
-                # Output the current byte since it contained non-EOL data
-                kBytes.append(kBlock[nCRLFIndex])
-
-            else :
-
-                # Shouldn't Occur
-                assert(False)
-
-            #end
-                
-            nLastIndex = nCRLFIndex + 1
+        # Indicate this data package contains an LF/CR entry
+        bContainsLFCR = True
 
+        if kFileMetaData.bLFDetected :
+            kData = __CR_BYTE + kData
         #end
 
-        # Handle the Last Few Elements        
-        if nLastIndex < nDataLength :
-
-            # This would fall into functionality associated with:
-            # (__LF != kBlock[nCRLFIndex]) and kFileMetaData.bLFDetected :
-            if kFileMetaData.bLFDetected :
-
-                # This is not seen as a valid EOL, so normalise it
-                kBytes.extend(__LINESEP)
-
+        # CR's pair up from the left, so a trailing run of CR's of odd length leaves the last one unresolved
+        kFileMetaData.bLFDetected = False
+        if kData.endswith(__CR_BYTE) :
+            if 1 == ((len(kData) - len(kData.rstrip(__CR_BYTE))) % 2) :
+                kData                     = kData[:-1]
+                kFileMetaData.bLFDetected = True
             #end
-
-            kFileMetaData.bLFDetected         = False
-            kFileMetaData.bLastElementWasLFCR = False
-
-            kBytes.extend(kBlock[nLastIndex:nDataLength])
-
         #end
 
-        # Output the Buffered Data for Writing
+        # Only an EOL that's been used (or is still pending) counts, not a CR output verbatim
+        bLastElementWasLFCR = (__LF == kBlock[nDataLength - 1]) or kFileMetaData.bLFDetected
+
+        # Output the Normalised Data for Writing
+        kBytes = __EOL_PATTERN.sub(__EOL_REPLACEMENT, kData)
         if len(kBytes) > 0 :
             kFileMetaData.kFileHandle.write(kBytes)
         #end
 
     else :
 
-        kFileMetaData.kFileHandle.write(kBlock[:nDataLength])
+        kFileMetaData.kFileHandle.write(kBlock)
 
     #end
         
@@ -205,6 +156,10 @@ def CloseOpenFiles(kExtractStatus : dict) :
 
     kFileMetaData = kExtractStatus["Current"]
     if None != kFileMetaData :
+        if None != kFileMetaData.kSpool :
+            # The file has reached its end without being deemed Binary, so write it out
+            VMSBackupCommitSpool(kFileMetaData=kFileMetaData)
+        #end
         if None != kFileMetaData.kFileHandle :
             if kFileMetaData.nFilePointer != kFileMetaData.nFileSize :
                 print(f"Warning: {kFileMetaData.kFileName} extracted {kFileMetaData.nFilePointer}/{kFileMetaData.nFileSize} bytes.")
@@ -644,13 +599,31 @@ def IsTargetFile(kFileName : str, nFileVersion : int, nTargetExtractVersion : in
 
 #end
 
-def VMSBackupProcessFile(kBlock : bytes, kHeader : BRHeader.BRHeader, kOptions : VMSBackupTypes.VMSBackupParameters, kFileList : dict, kExtractStatus : dict, bFirstPass : bool) :
+def VMSBackupProcessFile(kBlock : memoryview, nOffset : int, kHeader : BRHeader.BRHeader, kOptions : VMSBackupTypes.VMSBackupParameters, kFileList : dict, kExtractStatus : dict, bFirstPass : bool) :
 
     ##########################################################
     # Convert the File Record into a series of streams
 
+    # The Catalog holds every File Record whatever the mask or version, recorded on the final pass only, since
+    # that's the one pass that visits every File Record exactly once
+    bCatalog = (not bFirstPass) and (None != kExtractStatus["Catalog"])
+
+    # Only the File Name is needed to decide whether the file is of interest, so look at that first, which saves
+    # decoding the rest of the File Record for anything outside of the mask
+    kFileName = BSFileHeader.PeekFileName(kBlock=kBlock, nRSize=kHeader.W_RSIZE(), nOffset=nOffset)
+    if None != kFileName :
+        if not kExtractStatus["Mask"].Match(kFileName=StripFileVersion(kFileName=kFileName)) :
+            if bCatalog :
+                kFileHeader = BSFileHeader.BSFileHeader()
+                kFileHeader.LoadHeaderFromBuffer(kBlock=kBlock, nRSize=kHeader.W_RSIZE(), nOffset=nOffset)
+                kExtractStatus["Catalog"].AddFile(nBlock=kExtractStatus["Block"], kFileHeader=kFileHeader, kHeader=kHeader)
+            #end
+            return
+        #end
+    #end
+
     kFileHeader = BSFileHeader.BSFileHeader()
-    kFileHeader.LoadHeaderFromBuffer(kBlock=kBlock, nRSize=kHeader.W_RSIZE())
+    kFileHeader.LoadHeaderFromBuffer(kBlock=kBlock, nRSize=kHeader.W_RSIZE(), nOffset=nOffset)
 
     # Copy the File Name
     kFileNameNoMask = kFileHeader.FILENAME()
@@ -664,7 +637,7 @@ def VMSBackupProcessFile(kBlock : bytes, kHeader : BRHeader.BRHeader, kOptions :
     #end
 
     # See if this is a file that needs processing
-    bWildCardMatch = FileNameWildCardCompare(kString=kFileNameNoMask, kWildCard=kOptions.kExtractMask)
+    bWildCardMatch = kExtractStatus["Mask"].Match(kFileName=kFileNameNoMask)
 
     ##########################################################
     # Handle Older Versions
@@ -686,7 +659,7 @@ def VMSBackupProcessFile(kBlock : bytes, kHeader : BRHeader.BRHeader, kOptions :
         # Add the Raw File Parameters to the List
         # TODO: RECATTR[0] occasionally has a value outside the range defined by RecordFormatType.  I've mitigated it for now by masking
         #       the lower nibble, but I've no way of knowing if this is accurate for the time being.
-        kFileList[kFileHeader.FILENAME()] = VMSBackupTypes.VMSFileParameters(bIsTargetFile=bTargetFile, kMode=kOptions.eExtractMode)
+        kFileList[kFileHeader.FILENAME()] = VMSBackupTypes.VMSFileParameters(bIsTargetFile=bTargetFile, kMode=kOptions.eExtractMode, kSink=kExtractStatus["Sink"])
         kFileList[kFileHeader.FILENAME()].setFileMetaData(nFileSize=kFileHeader.FILESIZEBYTES(), kFormat=kFileHeader.RECATTR()[0] & 0x0F)
 
     #end
@@ -744,16 +717,25 @@ def VMSBackupProcessFile(kBlock : bytes, kHeader : BRHeader.BRHeader, kOptions :
                 # DEBUG (ENHANCED)
                 ##########################################################
 
-                # Open the File for Writing
-                kExtractStatus["Current"].openFile(kFileName=kFileHeader.FILENAME(), kOptions=kOptions, nCreationDate=TimeVMSToUnix(nVMSTime=kFileHeader.CREDATE()), nModificationDate=TimeVMSToUnix(nVMSTime=kFileHeader.REVDATE()))
+                if (VMSBackupTypes.ExtractMode.SMART == kExtractStatus["Current"].kMode) and kOptions.bSmartSpooling :
 
-                ##########################################################
-                # DEBUG (ENHANCED)
+                    # The File Type is yet to be determined, so spool the file until it is
+                    kExtractStatus["Current"].openSpool(kFileName=kFileHeader.FILENAME(), kOptions=kOptions, nCreationDate=TimeVMSToUnix(nVMSTime=kFileHeader.CREDATE()), nModificationDate=TimeVMSToUnix(nVMSTime=kFileHeader.REVDATE()))
 
-                if VMSBackupTypes.ExtractDebug.ENHANCED == kOptions.eExtractDebug :
+                else :
 
-                    print("*** DEBUG *** ", end="")
-                    print(f"Using {[None, "ASCII", "BINARY", "RAW"][kExtractStatus["Current"].kMode]} for {kFileHeader.FILENAME()}")
+                    # Open the File for Writing
+                    kExtractStatus["Current"].openFile(kFileName=kFileHeader.FILENAME(), kOptions=kOptions, nCreationDate=TimeVMSToUnix(nVMSTime=kFileHeader.CREDATE()), nModificationDate=TimeVMSToUnix(nVMSTime=kFileHeader.REVDATE()))
+
+                    ##########################################################
+                    # DEBUG (ENHANCED)
+
+                    if VMSBackupTypes.ExtractDebug.ENHANCED == kOptions.eExtractDebug :
+
+                        print("*** DEBUG *** ", end="")
+                        print(f"Using {[None, "ASCII", "BINARY", "RAW"][kExtractStatus["Current"].kMode]} for {kFileHeader.FILENAME()}")
+
+                    #end
 
                 #end
 
@@ -778,25 +760,29 @@ def VMSBackupProcessFile(kBlock : bytes, kHeader : BRHeader.BRHeader, kOptions :
 
     #end
 
+    if bCatalog :
+        kExtractStatus["Catalog"].AddFile(nBlock=kExtractStatus["Block"], kFileHeader=kFileHeader, kHeader=kHeader)
+    #end
+
 #end
 
-def ProcessVBNRaw(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : VMSBackupTypes.VMSFileParameters, kOptions : VMSBackupTypes.VMSBackupParameters, bFirstPass : bool) :
+def ProcessVBNRaw(kBlock : memoryview, nOffset : int, kHeader : BRHeader.BRHeader, kFileMetaData : VMSBackupTypes.VMSFileParameters, kOptions : VMSBackupTypes.VMSBackupParameters, bFirstPass : bool) :
 
     if (kFileMetaData.nFilePointer + kHeader.W_RSIZE()) < kFileMetaData.nFileSize :
 
-        VMSWriteFile(kBlock=kBlock, kFileMetaData=kFileMetaData, nDataLength=kHeader.W_RSIZE())
+        VMSWriteFile(kBlock=kBlock, nOffset=nOffset, kFileMetaData=kFileMetaData, nDataLength=kHeader.W_RSIZE())
         kFileMetaData.nFilePointer += kHeader.W_RSIZE()
 
     else :
 
-        VMSWriteFile(kBlock=kBlock, kFileMetaData=kFileMetaData, nDataLength=kFileMetaData.nFileSize - kFileMetaData.nFilePointer)
+        VMSWriteFile(kBlock=kBlock, nOffset=nOffset, kFileMetaData=kFileMetaData, nDataLength=kFileMetaData.nFileSize - kFileMetaData.nFilePointer)
         kFileMetaData.nFilePointer += kFileMetaData.nFileSize - kFileMetaData.nFilePointer
 
     #end
 
 #end
 
-def ProcessVBNNonVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : VMSBackupTypes.VMSFileParameters, kOptions : VMSBackupTypes.VMSBackupParameters, bFirstPass : bool) :
+def ProcessVBNNonVar(kBlock : memoryview, nOffset : int, kHeader : BRHeader.BRHeader, kFileMetaData : VMSBackupTypes.VMSFileParameters, kOptions : VMSBackupTypes.VMSBackupParameters, bFirstPass : bool) :
 
     if (kFileMetaData.nFilePointer + kHeader.W_RSIZE()) < kFileMetaData.nFileSize :
 
@@ -804,15 +790,10 @@ def ProcessVBNNonVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData
 
             if VMSBackupTypes.ExtractMode.SMART == kFileMetaData.kMode :
 
-                for nRecordPointer in range(kHeader.W_RSIZE()) :
-
-                    if kBlock[nRecordPointer] > 0x7F :
+                if VMSBackupClassifier.GetClassifier(kOptions)(kBlock[nOffset:nOffset + kHeader.W_RSIZE()]) :
 
-                        kFileMetaData.kMode       = VMSBackupTypes.ExtractMode.BINARY
-                        kFileMetaData.bIgnoreVBN = True
-                        break
-
-                    #end
+                    kFileMetaData.kMode       = VMSBackupTypes.ExtractMode.BINARY
+                    kFileMetaData.bIgnoreVBN = True
 
                 #end
 
@@ -820,7 +801,7 @@ def ProcessVBNNonVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData
 
         else :
 
-            VMSWriteFile(kBlock=kBlock, kFileMetaData=kFileMetaData, nDataLength=kHeader.W_RSIZE())
+            VMSWriteFile(kBlock=kBlock, nOffset=nOffset, kFileMetaData=kFileMetaData, nDataLength=kHeader.W_RSIZE())
 
         #end
 
@@ -832,15 +813,10 @@ def ProcessVBNNonVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData
 
             if VMSBackupTypes.ExtractMode.SMART == kFileMetaData.kMode :
 
-                for nRecordPointer in range(kFileMetaData.nFileSize - kFileMetaData.nFilePointer) :
-
-                    if kBlock[nRecordPointer] > 0x7F :
+                if VMSBackupClassifier.GetClassifier(kOptions)(kBlock[nOffset:nOffset + kFileMetaData.nFileSize - kFileMetaData.nFilePointer]) :
 
-                        kFileMetaData.kMode       = VMSBackupTypes.ExtractMode.BINARY
-                        kFileMetaData.bIgnoreVBN = True
-                        break
-
-                    #end
+                    kFileMetaData.kMode       = VMSBackupTypes.ExtractMode.BINARY
+                    kFileMetaData.bIgnoreVBN = True
 
                 #end
 
@@ -848,7 +824,7 @@ def ProcessVBNNonVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData
 
         else :
 
-            VMSWriteFile(kBlock=kBlock, kFileMetaData=kFileMetaData, nDataLength=kFileMetaData.nFileSize - kFileMetaData.nFilePointer)
+            VMSWriteFile(kBlock=kBlock, nOffset=nOffset, kFileMetaData=kFileMetaData, nDataLength=kFileMetaData.nFileSize - kFileMetaData.nFilePointer)
             kFileMetaData.nFilePointer += (kFileMetaData.nFileSize - kFileMetaData.nFilePointer)
 
             VMSWriteEOL(kFileMetaData=kFileMetaData)
@@ -859,7 +835,7 @@ def ProcessVBNNonVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData
 
 #end
 
-def ProcessVBNVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : VMSBackupTypes.VMSFileParameters, kOptions : VMSBackupTypes.VMSBackupParameters, bFirstPass : bool) :
+def ProcessVBNVar(kBlock : memoryview, nOffset : int, kHeader : BRHeader.BRHeader, kFileMetaData : VMSBackupTypes.VMSFileParameters, kOptions : VMSBackupTypes.VMSBackupParameters, bFirstPass : bool) :
 
     kFileMetaData.bLastElementWasLFCR = False
     kFileMetaData.bContainsLFCR       = False
@@ -883,21 +859,25 @@ def ProcessVBNVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : V
 
         if bFirstPass :
 
-            for nLocalRecordPointer in range(kFileMetaData.nRemainingStartPos, kFileMetaData.nRemainingRecordLength) :
+            # Only the part of the record within this block can be scanned
+            nScanEnd = min(kFileMetaData.nRemainingRecordLength, kHeader.W_RSIZE())
 
-                if nLocalRecordPointer >= kHeader.W_RSIZE() :
+            if (VMSBackupTypes.ExtractMode.SMART == kFileMetaData.kMode) and \
+               (nScanEnd > kFileMetaData.nRemainingStartPos)                 and \
+               VMSBackupClassifier.GetClassifier(kOptions)(kBlock[nOffset + kFileMetaData.nRemainingStartPos:nOffset + nScanEnd]) :
+
+                kFileMetaData.kMode = VMSBackupTypes.ExtractMode.BINARY
+
+            else :
+
+                # The remainder of the record continues into the next block
+                nRecordEnd = max(kFileMetaData.nRemainingStartPos, kHeader.W_RSIZE())
+                if nRecordEnd < kFileMetaData.nRemainingRecordLength :
                     kFileMetaData.nRemainingStartPos      = 0
-                    kFileMetaData.nRemainingRecordLength -= nLocalRecordPointer
+                    kFileMetaData.nRemainingRecordLength -= nRecordEnd
                     return
                 #end
 
-                if VMSBackupTypes.ExtractMode.SMART == kFileMetaData.kMode :
-                    if kBlock[nLocalRecordPointer] > 0x7F :
-                        kFileMetaData.kMode = VMSBackupTypes.ExtractMode.BINARY
-                        break
-                    #end
-                #end
-
             #end
                     
             nRecordPointer += kFileMetaData.nRemainingRecordLength
@@ -907,7 +887,7 @@ def ProcessVBNVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : V
             # TODO: Probably a bug elsewhere, but sanity check an overflow of the record
             if (nRecordPointer + kFileMetaData.nRemainingRecordLength) >= kHeader.W_RSIZE() :
 
-                VMSWriteFile(kBlock=kBlock[nRecordPointer:], kFileMetaData=kFileMetaData, nDataLength=kHeader.W_RSIZE() - nRecordPointer)
+                VMSWriteFile(kBlock=kBlock, nOffset=nOffset + nRecordPointer, kFileMetaData=kFileMetaData, nDataLength=kHeader.W_RSIZE() - nRecordPointer)
                 kFileMetaData.nRemainingStartPos      = 0
                 kFileMetaData.nRemainingRecordLength -= kHeader.W_RSIZE() - nRecordPointer
                 kFileMetaData.nFilePointer           += kHeader.W_RSIZE() - nRecordPointer
@@ -926,7 +906,7 @@ def ProcessVBNVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : V
             #end
 
             # Write File
-            VMSWriteFile(kBlock=kBlock[nRecordPointer:], kFileMetaData=kFileMetaData, nDataLength=kFileMetaData.nRemainingRecordLength)
+            VMSWriteFile(kBlock=kBlock, nOffset=nOffset + nRecordPointer, kFileMetaData=kFileMetaData, nDataLength=kFileMetaData.nRemainingRecordLength)
 
             nRecordPointer += kFileMetaData.nRemainingRecordLength
 
@@ -955,7 +935,7 @@ def ProcessVBNVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : V
 
     while (nRecordPointer < kHeader.W_RSIZE()) and (kFileMetaData.nFilePointer < kFileMetaData.nFileSize) :
 
-        nRecordLength   = struct.unpack_from(VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint16_t.name], kBlock, nRecordPointer)[0] - nRecordLengthModifier
+        nRecordLength   = struct.unpack_from(VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint16_t.name], kBlock, nOffset + nRecordPointer)[0] - nRecordLengthModifier
         nRecordPointer += 2 + nRecordLengthModifier
 
         # TODO: .DIR 'files' always seem to have 0xFFFF followed by a whole lot of nothing.  I've mitigated this for now by writing this as
@@ -979,13 +959,10 @@ def ProcessVBNVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : V
             if None == kFileMetaData.kFileHandle :
 
                 # First Pass requires the file to be scanned as long as it's deemed an ASCII file
-                for nLocalRecordPointer in range(nRecordPointer, nRecordPointer + nRecordLength) :
-                    if VMSBackupTypes.ExtractMode.SMART == kFileMetaData.kMode :
-                        if kBlock[nLocalRecordPointer] > 0x7F :
-                            kFileMetaData.kMode      = VMSBackupTypes.ExtractMode.BINARY
-                            kFileMetaData.bIgnoreVBN = True
-                            break
-                        #end
+                if (VMSBackupTypes.ExtractMode.SMART == kFileMetaData.kMode) and (nRecordLength > 0) :
+                    if VMSBackupClassifier.GetClassifier(kOptions)(kBlock[nOffset + nRecordPointer:nOffset + nRecordPointer + nRecordLength]) :
+                        kFileMetaData.kMode      = VMSBackupTypes.ExtractMode.BINARY
+                        kFileMetaData.bIgnoreVBN = True
                     #end
                 #end
 
@@ -994,7 +971,7 @@ def ProcessVBNVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : V
             else :
 
                 # Write File
-                VMSWriteFile(kBlock=kBlock[nRecordPointer:], kFileMetaData=kFileMetaData, nDataLength=nRecordLength)
+                VMSWriteFile(kBlock=kBlock, nOffset=nOffset + nRecordPointer, kFileMetaData=kFileMetaData, nDataLength=nRecordLength)
             
                 nRecordPointer += nRecordLength
 
@@ -1042,7 +1019,7 @@ def ProcessVBNVar(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : V
 
 #end
 
-def ProcessVBN(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : VMSBackupTypes.VMSFileParameters, kOptions : VMSBackupTypes.VMSBackupParameters, bFirstPass : bool) :
+def ProcessVBN(kBlock : memoryview, nOffset : int, kHeader : BRHeader.BRHeader, kFileMetaData : VMSBackupTypes.VMSFileParameters, kOptions : VMSBackupTypes.VMSBackupParameters, bFirstPass : bool) :
 
     ##########################################################
     # DEBUG (ENHANCED)
@@ -1067,12 +1044,12 @@ def ProcessVBN(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : VMSB
         if VMSBackupTypes.ExtractMode.RAW != kOptions.eExtractMode :
 
             # Process the record in Binary/ASCII Mode
-            ProcessVBNVar(kBlock=kBlock, kHeader=kHeader, kFileMetaData=kFileMetaData, kOptions=kOptions, bFirstPass=bFirstPass)
+            ProcessVBNVar(kBlock=kBlock, nOffset=nOffset, kHeader=kHeader, kFileMetaData=kFileMetaData, kOptions=kOptions, bFirstPass=bFirstPass)
 
         elif None != kFileMetaData.kFileHandle :
 
             # Process the record in Raw Mode
-            ProcessVBNRaw(kBlock=kBlock, kHeader=kHeader, kFileMetaData=kFileMetaData, kOptions=kOptions, bFirstPass=bFirstPass)
+            ProcessVBNRaw(kBlock=kBlock, nOffset=nOffset, kHeader=kHeader, kFileMetaData=kFileMetaData, kOptions=kOptions, bFirstPass=bFirstPass)
 
         #end
 
@@ -1084,12 +1061,12 @@ def ProcessVBN(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : VMSB
         if VMSBackupTypes.ExtractMode.RAW != kOptions.eExtractMode :
 
             # Process the record in Binary/ASCII Mode
-            ProcessVBNNonVar(kBlock=kBlock, kHeader=kHeader, kFileMetaData=kFileMetaData, kOptions=kOptions, bFirstPass=bFirstPass)
+            ProcessVBNNonVar(kBlock=kBlock, nOffset=nOffset, kHeader=kHeader, kFileMetaData=kFileMetaData, kOptions=kOptions, bFirstPass=bFirstPass)
 
         elif None != kFileMetaData.kFileHandle :
 
             # Process the record in Raw Mode
-            ProcessVBNRaw(kBlock=kBlock, kHeader=kHeader, kFileMetaData=kFileMetaData, kOptions=kOptions, bFirstPass=bFirstPass)
+            ProcessVBNRaw(kBlock=kBlock, nOffset=nOffset, kHeader=kHeader, kFileMetaData=kFileMetaData, kOptions=kOptions, bFirstPass=bFirstPass)
 
         #end
 
@@ -1098,7 +1075,7 @@ def ProcessVBN(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : VMSB
         if None != kFileMetaData.kFileHandle :
 
             # Process the record in Raw Mode
-            ProcessVBNRaw(kBlock=kBlock, kHeader=kHeader, kFileMetaData=kFileMetaData, kOptions=kOptions, bFirstPass=bFirstPass)
+            ProcessVBNRaw(kBlock=kBlock, nOffset=nOffset, kHeader=kHeader, kFileMetaData=kFileMetaData, kOptions=kOptions, bFirstPass=bFirstPass)
 
         #end
 
@@ -1123,11 +1100,74 @@ def ProcessVBN(kBlock : bytes, kHeader : BRHeader.BRHeader, kFileMetaData : VMSB
 
 #end
 
-def VMSBackupProcessBackupSaveSetRecord(kBlock : bytes, nAddress : int, kHeader : BBHeader.BBHeader, kOptions : VMSBackupTypes.VMSBackupParameters, bFirstPass : bool, bLastBlock : bool, kFileList : dict, kExtractStatus : dict) -> tuple[bool,int] :
+def VMSBackupSpoolVBN(kBlock : memoryview, nOffset : int, kHeader : BRHeader.BRHeader, kFileMetaData : VMSBackupTypes.VMSFileParameters, kOptions : VMSBackupTypes.VMSBackupParameters) :
+
+    # Spool the Record Header/Data so that it can be replayed once the File Type is known
+    # Note: The data is length prefixed since a record isn't guaranteed to fit within the block.
+    kData = kBlock[nOffset:nOffset + kHeader.W_RSIZE()]
+    kFileMetaData.kSpool.write(kHeader.kBuffer)
+    kFileMetaData.kSpool.write(struct.pack(VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint32_t.name], len(kData)))
+    kFileMetaData.kSpool.write(kData)
+
+    # Classify the Data, exactly as the first pass would otherwise have done
+    ProcessVBN(kBlock=kBlock, nOffset=nOffset, kHeader=kHeader, kFileMetaData=kFileMetaData, kOptions=kOptions, bFirstPass=True)
+
+    # Once a file is deemed Binary there's nothing more to be gained from spooling, so write out what we
+    # have so far, and let the rest of the file be written directly.
+    if VMSBackupTypes.ExtractMode.SMART != kFileMetaData.kMode :
+        VMSBackupCommitSpool(kFileMetaData=kFileMetaData)
+    #end
+
+#end
+
+def VMSBackupCommitSpool(kFileMetaData : VMSBackupTypes.VMSFileParameters) :
+
+    kSpool   = kFileMetaData.kSpool
+    kOptions = kFileMetaData.kSpoolOptions
+    kFileMetaData.kSpool = None
+
+    # Open the File for Writing
+    kFileMetaData.openFile(kFileName=kFileMetaData.kSpoolFileName, kOptions=kOptions, nCreationDate=kFileMetaData.nCreationDate, nModificationDate=kFileMetaData.nModificationDate)
+
+    ##########################################################
+    # DEBUG (ENHANCED)
+
+    if VMSBackupTypes.ExtractDebug.ENHANCED == kOptions.eExtractDebug :
+
+        print("*** DEBUG *** ", end="")
+        print(f"Using {[None, "ASCII", "BINARY", "RAW"][kFileMetaData.kMode]} for {kFileMetaData.kSpoolFileName}")
+
+    #end
+
+    # DEBUG (ENHANCED)
+    ##########################################################
+
+    # Replay the Spooled Records
+    kSpool.seek(0, os.SEEK_SET)
+    kLengthFormat = VMSBackupHelper.kUnpackType[VMSBackupHelper.sizeof.uint32_t.name]
+
+    while True :
+
+        kRecordHeader = BRHeader.BRHeader()
+        kRecordHeader.LoadHeaderFromFile(kFile=kSpool)
+        if len(kRecordHeader.kBuffer) < kRecordHeader.GetLength() :
+            break
+        #end
+
+        nLength = struct.unpack(kLengthFormat, kSpool.read(struct.calcsize(kLengthFormat)))[0]
+        ProcessVBN(kBlock=memoryview(kSpool.read(nLength)), nOffset=0, kHeader=kRecordHeader, kFileMetaData=kFileMetaData, kOptions=kOptions, bFirstPass=False)
+
+    #end
+
+    kSpool.close()
+
+#end
+
+def VMSBackupProcessBackupSaveSetRecord(kBlock : memoryview, nAddress : int, kHeader : BBHeader.BBHeader, kOptions : VMSBackupTypes.VMSBackupParameters, bFirstPass : bool, bLastBlock : bool, kFileList : dict, kExtractStatus : dict) -> tuple[bool,int] :
 
     # Read the Header
     kRecordHeader = BRHeader.BRHeader()
-    kRecordHeader.LoadHeaderFromBuffer(kBlock=kBlock)
+    kRecordHeader.LoadHeaderFromBuffer(kBlock=kBlock, nOffset=nAddress)
 
     # Skip past the Record Header
     nAddress += kRecordHeader.GetLength()
@@ -1208,7 +1248,11 @@ def VMSBackupProcessBackupSaveSetRecord(kBlock : bytes, nAddress : int, kHeader
         # DEBUG (ENHANCED)
         ##########################################################
 
-        VMSBackupProcessFile(kBlock=kBlock[kRecordHeader.GetLength():], kHeader=kRecordHeader, kOptions=kOptions, kFileList=kFileList, kExtractStatus=kExtractStatus, bFirstPass=bFirstPass)
+        if None != kExtractStatus["Index"] :
+            kExtractStatus["Index"].AddFile(nBlock=kExtractStatus["Block"], kRecordHeader=kRecordHeader, kRecord=kBlock[nAddress:nAddress + kRecordHeader.W_RSIZE()])
+        #end
+
+        VMSBackupProcessFile(kBlock=kBlock, nOffset=nAddress, kHeader=kRecordHeader, kOptions=kOptions, kFileList=kFileList, kExtractStatus=kExtractStatus, bFirstPass=bFirstPass)
 
     elif BRHeader.BRHeader.RecordType.RECORD_VBN == kRecordType :
 
@@ -1225,11 +1269,25 @@ def VMSBackupProcessBackupSaveSetRecord(kBlock : bytes, nAddress : int, kHeader
         # DEBUG (ENHANCED)
         ##########################################################
 
+        if None != kExtractStatus["Index"] :
+            kExtractStatus["Index"].AddVBN(nBlock=kExtractStatus["Block"], nAddress=kExtractStatus["Block"] + nAddress, nLength=kRecordHeader.W_RSIZE())
+        #end
+
         if None != kExtractStatus["Current"] :
 
-            if not kExtractStatus["Current"].bIgnoreVBN :
+            if None != kExtractStatus["Current"].kSpool :
 
-                ProcessVBN(kBlock=kBlock[kRecordHeader.GetLength():], kHeader=kRecordHeader, kFileMetaData=kExtractStatus["Current"], kOptions=kOptions, bFirstPass=bFirstPass)
+                VMSBackupSpoolVBN(kBlock=kBlock, nOffset=nAddress, kHeader=kRecordHeader, kFileMetaData=kExtractStatus["Current"], kOptions=kOptions)
+
+            elif not kExtractStatus["Current"].bIgnoreVBN :
+
+                # The first pass only needs the VBN data when it's being used to classify files, otherwise
+                # it's purely gathering file versions
+                if (not bFirstPass) or ((VMSBackupTypes.ExtractMode.SMART == kOptions.eExtractMode) and not kOptions.bSmartSpooling) :
+
+                    ProcessVBN(kBlock=kBlock, nOffset=nAddress, kHeader=kRecordHeader, kFileMetaData=kExtractStatus["Current"], kOptions=kOptions, bFirstPass=bFirstPass)
+
+                #end
 
             #end
 
@@ -1257,7 +1315,7 @@ def VMSBackupProcessBackupSaveSetRecord(kBlock : bytes, nAddress : int, kHeader
 
 #end
 
-def VMSBackupProcessBlock(kBlock : bytes, kBlockHeader : BBHeader.BBHeader, kOptions : VMSBackupTypes.VMSBackupParameters, nBaseAddress : int, nMaxAddress : int, bFirstPass : bool, kFileList : dict, kExtractStatus : dict) -> bool :
+def VMSBackupProcessBlock(kBlock : bytes | memoryview, kBlockHeader : BBHeader.BBHeader, kOptions : VMSBackupTypes.VMSBackupParameters, nBaseAddress : int, nMaxAddress : int, bFirstPass : bool, kFileList : dict, kExtractStatus : dict) -> bool :
 
     # Cumulative validity of this block
     bValid = True
@@ -1265,10 +1323,30 @@ def VMSBackupProcessBlock(kBlock : bytes, kBlockHeader : BBHeader.BBHeader, kOpt
     # Last Block?
     bLastBlock = False
 
+    # Every record within the block is walked using offsets into a single view of the block, rather than
+    # slicing, since slicing bytes copies the remainder of the block for each and every record.
+    kBlock = memoryview(kBlock)
+
+    # Track the Block Address for the benefit of the Index
+    kExtractStatus["Block"] = nBaseAddress
+
     # Current Block Header
     kCurrentHeader = BBHeader.BBHeader()
     kCurrentHeader.LoadHeaderFromBuffer(kBlock=kBlock)
 
+    # Verify the Block CRC, which only needs doing on the first visit to each block
+    kIntegrity = kExtractStatus["Integrity"]
+    if kOptions.bVerifyCRC and (None != kIntegrity) and (len(kBlock) == kBlockHeader.L_BLOCKSIZE()) and not kIntegrity.IsVerified(nBlock=nBaseAddress) :
+
+        kStatus, nCRC = VMSBackupIntegrity.VerifyBlockCRC(kBlock=kBlock, kBlockHeader=kCurrentHeader)
+        kIntegrity.Add(nBlock=nBaseAddress, nBlockNumber=kCurrentHeader.L_NUMBER(), kStatus=kStatus, nExpectedCRC=kCurrentHeader.L_CRC(), nComputedCRC=nCRC)
+
+        if VMSBackupIntegrity.CRC_BAD == kStatus :
+            print(f"WARNING : CRC failure in block {kCurrentHeader.L_NUMBER()} at address 0x{nBaseAddress:08X}")
+        #end
+
+    #end
+
     # Validate the Size
     if kCurrentHeader.Validate(kBaseHeader=kBlockHeader) :
 
@@ -1308,7 +1386,7 @@ def VMSBackupProcessBlock(kBlock : bytes, kBlockHeader : BBHeader.BBHeader, kOpt
             ##########################################################
 
             # Process the Record
-            bValid, nBlockAddress = VMSBackupProcessBackupSaveSetRecord(kBlock=kBlock[nBlockAddress:], nAddress=nBlockAddress, kHeader=kBlockHeader, kOptions=kOptions, bFirstPass=bFirstPass, bLastBlock=bLastBlock, kFileList=kFileList, kExtractStatus=kExtractStatus)
+            bValid, nBlockAddress = VMSBackupProcessBackupSaveSetRecord(kBlock=kBlock, nAddress=nBlockAddress, kHeader=kBlockHeader, kOptions=kOptions, bFirstPass=bFirstPass, bLastBlock=bLastBlock, kFileList=kFileList, kExtractStatus=kExtractStatus)
 
             # Output Errors if the Record is invalid
             if not bValid :
@@ -1352,11 +1430,414 @@ def VMSBackupProcessBlock(kBlock : bytes, kBlockHeader : BBHeader.BBHeader, kOpt
 
 #end
 
-def VMSBackupProcess(kFile : VMSBackupRAMCache.VMSBackupRAMCache, kOptions : VMSBackupTypes.VMSBackupParameters, bTwoPassesRequired : bool) -> bool :
+def VMSBackupProcessReadyBlocks(kFile : VMSBackupRAMCache.VMSBackupRAMCache, kBlocks : list[tuple[int, bytes | memoryview]], kBlockHeader : BBHeader.BBHeader, kOptions : VMSBackupTypes.VMSBackupParameters, nAbsStart : int, nAbsEnd : int, bFirstPass : bool, kFileList : dict, kExtractStatus : dict) -> bool :
+
+    bValid = True
+
+    for nBlock, kBlock in kBlocks :
+
+        # The end of a stream isn't known up front, so instead decide whether this is the last block based
+        # on whether anything follows it
+        if None == nAbsEnd :
+            nMaxAddress = max(kFile.tell(), nBlock + len(kBlock)) + (0 if kFile.feof() else 1)
+        else :
+            nMaxAddress = nAbsEnd
+        #end
+
+        bValid = VMSBackupProcessBlock(kBlock=kBlock, kBlockHeader=kBlockHeader, kOptions=kOptions, nBaseAddress=nBlock, nMaxAddress=nMaxAddress, bFirstPass=bFirstPass, kFileList=kFileList, kExtractStatus=kExtractStatus)
+
+        if (False == bValid) and bFirstPass :
+
+            ##########################################################
+            # DEBUG (ENHANCED)
+
+            if VMSBackupTypes.ExtractDebug.NONE != kOptions.eExtractDebug :
+
+                print("*** DEBUG *** ", end="")
+                print(f"Block Address             : 0x{nBlock - nAbsStart:08x}")
+
+            #end
+
+            # END DEBUG (ENHANCED)
+            ##########################################################
+
+        #end
+
+        if False == bValid :
+            break
+        #end
+
+    #end
+
+    return bValid
+
+#end
+
+def VMSBackupProcessBlocks(kFile : VMSBackupRAMCache.VMSBackupRAMCache, kBlockHeader : BBHeader.BBHeader, kOptions : VMSBackupTypes.VMSBackupParameters, nAbsStart : int, nAbsEnd : int, nLastBlock : int | None, bFirstPass : bool, kFileList : dict, kExtractStatus : dict) -> bool :
+
+    # Force the Algorithm to valid (needed if this is a 2nd pass)
+    bValid  = True
+
+    # Blocks pass through the recovery first when the save set has redundancy groups, which may hold some back
+    # until their group's XOR block has been read
+    nGroupSize, bFromSummary = kExtractStatus["GroupSize"]
+    kRecovery = None
+    if nGroupSize > 0 :
+        kRecovery = VMSBackupRecovery.VMSBackupRecovery(kBlockHeader=kBlockHeader, nAbsStart=nAbsStart, nGroupSize=nGroupSize, bFromSummary=bFromSummary, kIntegrity=kExtractStatus["Integrity"])
+    #end
+
+    # Process the entire file (or up to and including the last block requested)
+    while (False == kFile.feof()) and bValid and ((None == nLastBlock) or (kFile.tell() <= nLastBlock)) :
+
+        # Read the Current Block
+        nBlock = kFile.tell()
+        kBlock = kFile.read(kBlockHeader.L_BLOCKSIZE())
+
+        ##########################################################
+        # DEBUG (ENHANCED)
+
+        if VMSBackupTypes.ExtractDebug.ENHANCED == kOptions.eExtractDebug :
+
+            print("*** DEBUG *** ", end="")
+            print(f"Processing Block Address  : 0x{nBlock:08x}")
+
+        #end
+
+        # END DEBUG (ENHANCED)
+        ##########################################################
+
+        # There's actually a curious difference in behaviour between Python and C here from what I can tell.
+        # Python seems to flag the file as having reached the EOF even if the final read successfully completed.
+        # Whereas C does not in the same scenario.  This ensures the behaviour matches C.
+        if (False == kFile.feof()) or (len(kBlock) == kBlockHeader.L_BLOCKSIZE()) :
+
+            if None == kRecovery :
+                kBlocks = [(nBlock, kBlock)]
+            else :
+                kBlocks = kRecovery.Add(nBlock=nBlock, kBlock=kBlock, bLastBlock=kFile.feof())
+            #end
+
+            bValid = VMSBackupProcessReadyBlocks(kFile=kFile, kBlocks=kBlocks, kBlockHeader=kBlockHeader, kOptions=kOptions, nAbsStart=nAbsStart, nAbsEnd=nAbsEnd, bFirstPass=bFirstPass, kFileList=kFileList, kExtractStatus=kExtractStatus)
+
+        #end
+
+    #end
+
+    # Anything still held back belongs to a group whose XOR block was never reached
+    if (None != kRecovery) and bValid :
+        bValid = VMSBackupProcessReadyBlocks(kFile=kFile, kBlocks=kRecovery.Flush(), kBlockHeader=kBlockHeader, kOptions=kOptions, nAbsStart=nAbsStart, nAbsEnd=nAbsEnd, bFirstPass=bFirstPass, kFileList=kFileList, kExtractStatus=kExtractStatus)
+    #end
+
+    # A group size found to be wrong isn't used again (i.e. by the second pass)
+    if (None != kRecovery) and kRecovery.bMismatched :
+        kExtractStatus["GroupSize"] = (0, False)
+    #end
+
+    return bValid
+
+#end
+
+def ReadGroupSize(kFile : VMSBackupRAMCache.VMSBackupRAMCache, kBlockHeader : BBHeader.BBHeader, kOptions : VMSBackupTypes.VMSBackupParameters, nAbsStart : int) -> tuple[int, bool] :
+
+    # The summary record in the first block says whether the save set has redundancy groups (see
+    # VMSBackupRecovery), after which the file is left pointing back at the start
+    kFile.seek(nAbsStart, os.SEEK_SET)
+    kBlock = kFile.read(kBlockHeader.L_BLOCKSIZE())
+    kFile.seek(nAbsStart, os.SEEK_SET)
+
+    return VMSBackupRecovery.GetGroupSize(kBlock=kBlock, kBlockHeader=kBlockHeader, nGroupSize=kOptions.nGroupSize)
+
+#end
+
+def VMSBackupProcessBlockRange(kFile : VMSBackupRAMCache.VMSBackupRAMCache, kBlockHeader : BBHeader.BBHeader, kOptions : VMSBackupTypes.VMSBackupParameters, nAbsStart : int, nAbsEnd : int, nFirstBlock : int, nLastBlock : int, bFirstPass : bool, kFileList : dict, kExtractStatus : dict) :
+
+    # Close any open files, since whatever came before this range is by definition complete
+    CloseOpenFiles(kExtractStatus=kExtractStatus)
+
+    kFile.seek(nFirstBlock, os.SEEK_SET)
+    VMSBackupProcessBlocks(kFile=kFile, kBlockHeader=kBlockHeader, kOptions=kOptions, nAbsStart=nAbsStart, nAbsEnd=nAbsEnd, nLastBlock=nLastBlock, bFirstPass=bFirstPass, kFileList=kFileList, kExtractStatus=kExtractStatus)
+
+    # Likewise the last file in the range is complete
+    CloseOpenFiles(kExtractStatus=kExtractStatus)
+
+#end
+
+def VMSBackupProcessIndexFiles(kIndex : VMSBackupIndex.VMSBackupIndex, kOptions : VMSBackupTypes.VMSBackupParameters, bFirstPass : bool, kFileList : dict, kExtractStatus : dict) :
+
+    # Replay the File Records held within the Index, exactly as if they'd been read from the Save Set
+    for kEntry in kIndex.kEntries :
+
+        kRecordHeader, kRecord = kIndex.GetRecord(kEntry=kEntry)
+        kExtractStatus["Block"] = kEntry["Block"]
+        VMSBackupProcessFile(kBlock=memoryview(kRecord), nOffset=0, kHeader=kRecordHeader, kOptions=kOptions, kFileList=kFileList, kExtractStatus=kExtractStatus, bFirstPass=bFirstPass)
+
+    #end
+
+    # Close any open files
+    CloseOpenFiles(kExtractStatus=kExtractStatus)
+
+#end
+
+def GetBlockRangePasses(kOptions : VMSBackupTypes.VMSBackupParameters) -> list[bool] :
+
+    # Smart Extraction without Spooling still needs a classification pass, albeit only over the blocks of interest
+    if (VMSBackupTypes.ExtractMode.SMART == kOptions.eExtractMode) and not kOptions.bSmartSpooling :
+        return [True, False]
+    else :
+        return [False]
+    #end
+
+#end
+
+def VMSBackupProcessWorker(kSaveSetFile : str, kOptions : VMSBackupTypes.VMSBackupParameters, kBlockRanges : list[tuple[int,int]], kFileVersions : dict) -> dict :
+
+    # Extract Status
+    kExtractStatus = {}
+    kExtractStatus["Current"] = None
+    kExtractStatus["Index"]   = None
+    kExtractStatus["Block"]   = 0
+    kExtractStatus["Integrity"] = VMSBackupIntegrity.VMSBackupIntegrityReport() if (kOptions.bVerifyCRC or (kOptions.nGroupSize > 0)) else None
+    kExtractStatus["Catalog"] = None
+    kExtractStatus["Sink"]    = None
+    kExtractStatus["Mask"]    = VMSBackupMask.CompileMask(kIncludeMasks=kOptions.kExtractMask, kExcludeMasks=kOptions.kExcludeMask)
+    kExtractStatus["GroupSize"] = (kOptions.nGroupSize, False)
+
+    # The latest versions were resolved by the parent, which is all that's needed to decide which files to
+    # extract
+    kFileList = dict(kFileVersions)
+
+    # Workers are only ever used with the file system sink (see VMSBackup)
+    kExtractStatus["Sink"] = VMSBackupSink.CreateSink(kOptions=kOptions)
+
+    # Each worker has its own view of the Save Set
+    kFile = VMSBackupRAMCache.VMSBackupRAMCache(bRAMCaching=kOptions.bRAMCaching, kFile=kSaveSetFile, bMemoryMapping=kOptions.bMemoryMapping, nReadAheadDepth=kOptions.nReadAheadDepth, nRAMCacheSize=kOptions.nRAMCacheSize)
+
+    kBlockHeader = BBHeader.BBHeader()
+    nAbsStart    = kFile.tell()
+    kBlockHeader.LoadHeaderFromFile(kFile=kFile)
+
+    # The parent has already settled on the group size, so this only confirms it
+    kExtractStatus["GroupSize"] = ReadGroupSize(kFile=kFile, kBlockHeader=kBlockHeader, kOptions=kOptions, nAbsStart=nAbsStart)
+
+    kFile.seek(0, os.SEEK_END)
+    nAbsEnd = kFile.tell()
+
+    for bFirstPass in GetBlockRangePasses(kOptions=kOptions) :
+        for nFirstBlock, nLastBlock in kBlockRanges :
+            VMSBackupProcessBlockRange(kFile=kFile, kBlockHeader=kBlockHeader, kOptions=kOptions, nAbsStart=nAbsStart, nAbsEnd=nAbsEnd, nFirstBlock=nFirstBlock, nLastBlock=nLastBlock, bFirstPass=bFirstPass, kFileList=kFileList, kExtractStatus=kExtractStatus)
+        #end
+    #end
+
+    kExtractStatus["Sink"].finish()
+
+    kFile.close()
+
+    # Hand back the blocks verified, so the parent can report on them
+    if None == kExtractStatus["Integrity"] :
+        return {}
+    #end
+
+    return kExtractStatus["Integrity"].kBlocks
+
+#end
+
+def GetRangeGroup(kGroups : list[int], nRange : int) -> int :
+
+    # Follow the chain of merged groups to the one it ended up in, shortening it along the way
+    while kGroups[nRange] != nRange :
+        kGroups[nRange] = kGroups[kGroups[nRange]]
+        nRange          = kGroups[nRange]
+    #end
+
+    return nRange
+
+#end
+
+def GroupBlockRanges(kEntries : list[dict], kOptions : VMSBackupTypes.VMSBackupParameters, kBlockRanges : list[tuple[int,int]]) -> list[list[tuple[int,int]]] :
+
+    # Files landing on the same host path (i.e. versions extracted without their version numbers, or the same
+    # name in different directories extracted without folders) must be written in Save Set order for the right
+    # one to be left behind, so any block ranges holding such files are grouped together, with each group
+    # then only ever being handed to a single worker.
+    kGroups = list(range(len(kBlockRanges)))
+    kPaths  = {}
+
+    for kEntry in kEntries :
+
+        # Ranges never overlap, and every entry lies within one of them
+        nRange = bisect.bisect_right(kBlockRanges, kEntry["Block"], key=lambda k : k[0]) - 1
+        kPath  = tuple(kPart.casefold() for kPart in VMSBackupTypes.GetOutputPath(kFileName=kEntry["Name"], kOptions=kOptions))
+
+        if kPath in kPaths :
+            kGroups[GetRangeGroup(kGroups=kGroups, nRange=nRange)] = GetRangeGroup(kGroups=kGroups, nRange=kPaths[kPath])
+        else :
+            kPaths[kPath] = nRange
+        #end
+
+    #end
+
+    kGrouped = {}
+    for nRange, kBlockRange in enumerate(kBlockRanges) :
+        kGrouped.setdefault(GetRangeGroup(kGroups=kGroups, nRange=nRange), []).append(kBlockRange)
+    #end
+
+    return list(kGrouped.values())
+
+#end
+
+def VMSBackupProcessParallel(kIndex : VMSBackupIndex.VMSBackupIndex, kOptions : VMSBackupTypes.VMSBackupParameters, kEntries : list[dict], kBlockRanges : list[tuple[int,int]], kFileList : dict, kExtractStatus : dict) :
+
+    # The listing comes straight from the Index, leaving the workers to do nothing but extract
+    kListOptions          = copy.copy(kOptions)
+    kListOptions.bExtract = False
+    VMSBackupProcessIndexFiles(kIndex=kIndex, kOptions=kListOptions, bFirstPass=False, kFileList=kFileList, kExtractStatus=kExtractStatus)
+
+    # Share the groups of block ranges out between the workers, largest first, always to the least loaded
+    # worker.  Since the ranges never overlap, no block (and therefore no file) is ever visited by more than one
+    # worker, and since files sharing a host path are always grouped, no host file is written by more than one
+    # worker either.  Each worker visits its ranges in Save Set order.
+    kRangeGroups   = GroupBlockRanges(kEntries=kEntries, kOptions=kOptions, kBlockRanges=kBlockRanges)
+    nWorkers       = min(kOptions.nWorkers, len(kRangeGroups))
+    kWorkerRanges  = [[] for _ in range(nWorkers)]
+    kWorkerLoad    = [0] * nWorkers
+
+    for kRanges in sorted(kRangeGroups, key=lambda kGroup : sum(k[1] - k[0] + kIndex.nBlockSize for k in kGroup), reverse=True) :
+        nWorker = kWorkerLoad.index(min(kWorkerLoad))
+        kWorkerRanges[nWorker] += kRanges
+        kWorkerLoad[nWorker]   += sum(k[1] - k[0] + kIndex.nBlockSize for k in kRanges)
+    #end
+
+    kWorkerOptions             = copy.copy(kOptions)
+    kWorkerOptions.eOutputType = VMSBackupTypes.OutputType.SUPPRESS
+    kWorkerOptions.nWorkers    = 1
+    kWorkerOptions.nGroupSize  = kExtractStatus["GroupSize"][0]
+
+    # Only the version information is needed by the workers
+    kFileVersions = {k : v for k, v in kFileList.items() if isinstance(v, dict)}
+
+    ##########################################################
+    # DEBUG
+
+    if VMSBackupTypes.ExtractDebug.NONE != kOptions.eExtractDebug :
+
+        print("*** DEBUG *** ", end="")
+        print(f"STARTING PARALLEL EXTRACT ({nWorkers} WORKERS, {len(kBlockRanges)} BLOCK RANGES)")
+
+    #end
+
+    # END DEBUG
+    ##########################################################
+
+    # The workers are spawned rather than forked, since by now this process has read ahead and write behind
+    # threads running, and forking a multi-threaded process risks the workers deadlocking on a lock that was
+    # held by one of those threads at the time
+    with concurrent.futures.ProcessPoolExecutor(max_workers=nWorkers, mp_context=multiprocessing.get_context("spawn")) as kPool :
+
+        kFutures = [kPool.submit(VMSBackupProcessWorker, kIndex.kSaveSetFile, kWorkerOptions, sorted(kRanges), kFileVersions) for kRanges in kWorkerRanges]
+
+        # Surface any worker failure, and gather up the blocks each worker verified
+        for kFuture in kFutures :
+            kBlocks = kFuture.result()
+            if None != kExtractStatus["Integrity"] :
+                kExtractStatus["Integrity"].Merge(kBlocks=kBlocks)
+            #end
+        #end
+
+    #end
+
+#end
+
+def VMSBackupProcessIndex(kFile : VMSBackupRAMCache.VMSBackupRAMCache, kIndex : VMSBackupIndex.VMSBackupIndex, kBlockHeader : BBHeader.BBHeader, kOptions : VMSBackupTypes.VMSBackupParameters, nAbsStart : int, nAbsEnd : int, kFileList : dict, kExtractStatus : dict) :
+
+    # The Index already holds every File Record, so file versions can be resolved without a pass over the
+    # Save Set.
+    VMSBackupProcessIndexFiles(kIndex=kIndex, kOptions=kOptions, bFirstPass=True, kFileList=kFileList, kExtractStatus=kExtractStatus)
+
+    # If nothing is being extracted, then the Index is all that's needed to produce the listing
+    if not kOptions.bExtract :
+        VMSBackupProcessIndexFiles(kIndex=kIndex, kOptions=kOptions, bFirstPass=False, kFileList=kFileList, kExtractStatus=kExtractStatus)
+        return
+    #end
+
+    # Determine which files are of interest, and therefore which blocks need visiting
+    kTargetEntries = []
+    for kEntry in kIndex.kEntries :
+
+        kFileNameNoMask = kEntry["Name"]
+        if ";" in kFileNameNoMask :
+            kFileNameNoMask = kFileNameNoMask[:kFileNameNoMask.find(";")]
+        #end
+
+        if kExtractStatus["Mask"].Match(kFileName=kFileNameNoMask) :
+            if IsTargetFile(kFileName=kFileNameNoMask, nFileVersion=kEntry["Version"], nTargetExtractVersion=kOptions.nExtractVersion, kFileList=kFileList) :
+                kTargetEntries.append(kEntry)
+            #end
+        #end
+
+    #end
+
+    kBlockRanges = kIndex.GetBlockRanges(kEntries=kTargetEntries, bMergeAdjacent=kOptions.nWorkers <= 1)
+
+    if (kOptions.nWorkers > 1) and (len(kBlockRanges) > 1) :
+        VMSBackupProcessParallel(kIndex=kIndex, kOptions=kOptions, kEntries=kTargetEntries, kBlockRanges=kBlockRanges, kFileList=kFileList, kExtractStatus=kExtractStatus)
+        return
+    #end
+
+    for bFirstPass in GetBlockRangePasses(kOptions=kOptions) :
+
+        kPendingRanges = list(kBlockRanges)
+        nVisitedBlock  = -1
+
+        # Files outside of the blocks being visited still need listing, which the Index can do on its own, so
+        # interleave the two such that the listing remains in Save Set order.
+        if not bFirstPass :
+
+            for kEntry in kIndex.kEntries :
+
+                while (len(kPendingRanges) > 0) and (kPendingRanges[0][0] <= kEntry["Block"]) :
+                    nFirstBlock, nVisitedBlock = kPendingRanges.pop(0)
+                    VMSBackupProcessBlockRange(kFile=kFile, kBlockHeader=kBlockHeader, kOptions=kOptions, nAbsStart=nAbsStart, nAbsEnd=nAbsEnd, nFirstBlock=nFirstBlock, nLastBlock=nVisitedBlock, bFirstPass=bFirstPass, kFileList=kFileList, kExtractStatus=kExtractStatus)
+                #end
+
+                if kEntry["Block"] > nVisitedBlock :
+                    kRecordHeader, kRecord = kIndex.GetRecord(kEntry=kEntry)
+                    kExtractStatus["Block"] = kEntry["Block"]
+                    VMSBackupProcessFile(kBlock=memoryview(kRecord), nOffset=0, kHeader=kRecordHeader, kOptions=kOptions, kFileList=kFileList, kExtractStatus=kExtractStatus, bFirstPass=bFirstPass)
+                #end
+
+            #end
+
+        #end
+
+        for nFirstBlock, nLastBlock in kPendingRanges :
+            VMSBackupProcessBlockRange(kFile=kFile, kBlockHeader=kBlockHeader, kOptions=kOptions, nAbsStart=nAbsStart, nAbsEnd=nAbsEnd, nFirstBlock=nFirstBlock, nLastBlock=nLastBlock, bFirstPass=bFirstPass, kFileList=kFileList, kExtractStatus=kExtractStatus)
+        #end
+
+        # Close any open files
+        CloseOpenFiles(kExtractStatus=kExtractStatus)
+
+    #end
+
+#end
+
+def VMSBackupProcess(kFile : VMSBackupRAMCache.VMSBackupRAMCache, kOptions : VMSBackupTypes.VMSBackupParameters, bTwoPassesRequired : bool, kIndex : VMSBackupIndex.VMSBackupIndex = None, kCatalog : VMSBackupCatalog.VMSBackupCatalog = None, kSink : VMSBackupSink.VMSBackupSink = None, kProfiler : VMSBackupProfile.VMSBackupProfiler = None) -> bool :
+
+    # Each phase of processing is profiled separately (if at all)
+    if None == kProfiler :
+        kProfiler = VMSBackupProfile.VMSBackupProfiler()
+    #end
+    kProfiler.Begin(kPhase="Header Load")
 
     # Extract Status
     kExtractStatus = {}
     kExtractStatus["Current"] = None
+    kExtractStatus["Index"]   = None
+    kExtractStatus["Block"]   = 0
+    kExtractStatus["Integrity"] = VMSBackupIntegrity.VMSBackupIntegrityReport() if (kOptions.bVerifyCRC or (kOptions.nGroupSize > 0)) else None
+    kExtractStatus["Catalog"] = None
+    kExtractStatus["Sink"]    = None
+    kExtractStatus["Mask"]    = VMSBackupMask.CompileMask(kIncludeMasks=kOptions.kExtractMask, kExcludeMasks=kOptions.kExcludeMask)
+    kExtractStatus["GroupSize"] = (kOptions.nGroupSize, False)
 
     # Flag indicating a 2nd pass is needed
     bSecondPass = not bTwoPassesRequired
@@ -1377,116 +1858,178 @@ def VMSBackupProcess(kFile : VMSBackupRAMCache.VMSBackupRAMCache, kOptions : VMS
         DumpHeader(kHeader=kBlockHeader, kOptions=kOptions)
     #end
 
+    # Where the extracted files are written to, which is only finished here if it was created here
+    bOwnSink = None == kSink
+    kExtractStatus["Sink"] = VMSBackupSink.CreateSink(kOptions=kOptions) if bOwnSink else kSink
+
+    # Catalog every File Record
+    if None != kCatalog :
+        kCatalog.BeginSaveSet(kBlockHeader=kBlockHeader)
+        kExtractStatus["Catalog"] = kCatalog
+    #end
+
     # Point the file buffer to the end
-    kFile.seek(0, os.SEEK_END)
-    nAbsEnd = kFile.tell()
+    # Note: Streams can only be read forwards, so the end is instead detected as each block is read
+    if kFile.bSeekable :
+        kFile.seek(0, os.SEEK_END)
+        nAbsEnd = kFile.tell()
+    else :
+        nAbsEnd = None
+    #end
 
-    # Point the file buffer back to the start
-    kFile.seek(nAbsStart, os.SEEK_SET)
+    # Point the file buffer back to the start, having found out whether the Save Set has redundancy groups
+    kExtractStatus["GroupSize"] = ReadGroupSize(kFile=kFile, kBlockHeader=kBlockHeader, kOptions=kOptions, nAbsStart=nAbsStart)
 
-    ##########################################################
-    # DEBUG
+    # Use the Index if it's still valid, otherwise build it whilst processing the Save Set
+    bIndexed = False
+    if None != kIndex :
 
-    if VMSBackupTypes.ExtractDebug.NONE != kOptions.eExtractDebug :
+        bIndexed = kIndex.Load(kBlockHeader=kBlockHeader)
+        if not bIndexed :
+            kIndex.Reset(kBlockHeader=kBlockHeader)
+            kExtractStatus["Index"] = kIndex
+        #end
 
-        print("*** DEBUG *** ", end="")
+        ##########################################################
+        # DEBUG
+
+        if VMSBackupTypes.ExtractDebug.NONE != kOptions.eExtractDebug :
 
-        # Output the Block Address for debugging purposes
-        print("STARTING FIRST FILE PARSE")
+            print("*** DEBUG *** ", end="")
+            print(f"{["BUILDING", "USING"][bIndexed]} SAVE SET INDEX {kIndex.kIndexFile}")
+
+        #end
+
+        # END DEBUG
+        ##########################################################
 
     #end
 
-    # END DEBUG
-    ##########################################################
+    # Parallel Extraction needs to know where every file lives up front, so if the Index isn't already
+    # available, perform a quick scan of the Save Set to build it
+    if (not bIndexed) and (None != kIndex) and kOptions.bExtract and (kOptions.nWorkers > 1) :
 
-    while True :
+        ##########################################################
+        # DEBUG
 
-        # Force the Algorithm to valid (needed if this is a 2nd pass)
-        bValid  = True
+        if VMSBackupTypes.ExtractDebug.NONE != kOptions.eExtractDebug :
 
-        # Process the entire file
-        while (False == kFile.feof()) and bValid :
+            print("*** DEBUG *** ", end="")
+            print("STARTING INDEX SCAN")
 
-            # Read the Current Block
-            nBlock = kFile.tell()
-            kBlock = kFile.read(kBlockHeader.L_BLOCKSIZE())
+        #end
 
-            ##########################################################
-            # DEBUG (ENHANCED)
+        # END DEBUG
+        ##########################################################
 
-            if VMSBackupTypes.ExtractDebug.ENHANCED == kOptions.eExtractDebug :
+        kProfiler.Begin(kPhase="Index Scan")
+        VMSBackupProcessBlocks(kFile=kFile, kBlockHeader=kBlockHeader, kOptions=kOptions, nAbsStart=nAbsStart, nAbsEnd=nAbsEnd, nLastBlock=None, bFirstPass=True, kFileList=kFileList, kExtractStatus=kExtractStatus)
+        CloseOpenFiles(kExtractStatus=kExtractStatus)
 
-                print("*** DEBUG *** ", end="")
-                print(f"Processing Block Address  : 0x{nBlock:08x}")
+        kIndex.Save()
+        kExtractStatus["Index"] = None
+        kFileList               = {}
+        bIndexed                = True
 
-            #end
+    #end
 
-            # END DEBUG (ENHANCED)
-            ##########################################################
+    if bIndexed :
+
+        kProfiler.Begin(kPhase="Indexed Pass")
+        VMSBackupProcessIndex(kFile=kFile, kIndex=kIndex, kBlockHeader=kBlockHeader, kOptions=kOptions, nAbsStart=nAbsStart, nAbsEnd=nAbsEnd, kFileList=kFileList, kExtractStatus=kExtractStatus)
+
+    else :
+
+        ##########################################################
+        # DEBUG
 
-            # There's actually a curious difference in behaviour between Python and C here from what I can tell.
-            # Python seems to flag the file as having reached the EOF even if the final read successfully completed.
-            # Whereas C does not in the same scenario.  This ensures the behaviour matches C.
-            if (False == kFile.feof()) or (len(kBlock) == kBlockHeader.L_BLOCKSIZE()) :
+        if VMSBackupTypes.ExtractDebug.NONE != kOptions.eExtractDebug :
 
-                bValid = VMSBackupProcessBlock(kBlock=kBlock, kBlockHeader=kBlockHeader, kOptions=kOptions, nBaseAddress=nBlock, nMaxAddress=nAbsEnd, bFirstPass=not bSecondPass, kFileList=kFileList, kExtractStatus=kExtractStatus)
+            print("*** DEBUG *** ", end="")
+
+            # Output the Block Address for debugging purposes
+            print("STARTING FIRST FILE PARSE")
+
+        #end
+
+        # END DEBUG
+        ##########################################################
+
+        while True :
 
+            kProfiler.Begin(kPhase=["First Pass", "Second Pass"][bTwoPassesRequired and bSecondPass])
+            VMSBackupProcessBlocks(kFile=kFile, kBlockHeader=kBlockHeader, kOptions=kOptions, nAbsStart=nAbsStart, nAbsEnd=nAbsEnd, nLastBlock=None, bFirstPass=not bSecondPass, kFileList=kFileList, kExtractStatus=kExtractStatus)
+
+            # The Index only needs building once
+            if None != kExtractStatus["Index"] :
+                kExtractStatus["Index"].Save()
+                kExtractStatus["Index"] = None
             #end
 
-            if (False == bValid) and (False == bSecondPass):
+            # If Two Passes are Required
+            if bTwoPassesRequired and (False == bSecondPass) :
+
+                # Indicate this is no longer the first pass
+                bSecondPass = True
+
+                # Point the file buffer back to the start
+                kFile.seek(nOffset=nAbsStart, nWhence=os.SEEK_SET)
 
                 ##########################################################
-                # DEBUG (ENHANCED)
+                # DEBUG
 
                 if VMSBackupTypes.ExtractDebug.NONE != kOptions.eExtractDebug :
 
                     print("*** DEBUG *** ", end="")
-                    print(f"Block Address             : 0x{nBlock - nAbsStart:08x}")
+                    print("STARTING SECOND FILE PARSE")
 
                 #end
 
-                # END DEBUG (ENHANCED)
+                # END DEBUG
                 ##########################################################
 
+            else :
+
+                break
+
             #end
 
         #end
 
-        # If Two Passes are Required
-        if bTwoPassesRequired and (False == bSecondPass) :
-
-            # Indicate this is no longer the first pass
-            bSecondPass = True
+    #end
 
-            # Point the file buffer back to the start
-            kFile.seek(nOffset=nAbsStart, nWhence=os.SEEK_SET)
+    kProfiler.Begin(kPhase="Close")
 
-            ##########################################################
-            # DEBUG
+    # Close any open files
+    CloseOpenFiles(kExtractStatus=kExtractStatus)
 
-            if VMSBackupTypes.ExtractDebug.NONE != kOptions.eExtractDebug :
+    if bOwnSink :
+        kExtractStatus["Sink"].finish()
+    #end
 
-                print("*** DEBUG *** ", end="")
-                print("STARTING SECOND FILE PARSE")
+    ##########################################################
+    # DEBUG
 
-            #end
+    # Streams have no RAM Cache
+    if (VMSBackupTypes.ExtractDebug.NONE != kOptions.eExtractDebug) and (None != getattr(kFile, "kRAMCache", None)) :
 
-            # END DEBUG
-            ##########################################################
+        print("*** DEBUG *** ", end="")
+        kFile.kRAMCache.Dump()
 
-        else :
+    #end
 
-            break
+    # END DEBUG
+    ##########################################################
 
-        #end
+    kFile.close()
 
+    # Report on the Integrity of the Blocks
+    if kOptions.bIntegrityReport and (None != kExtractStatus["Integrity"]) :
+        kExtractStatus["Integrity"].Dump(kReportFile=kOptions.kIntegrityReportFile)
     #end
 
-    # Close any open files
-    CloseOpenFiles(kExtractStatus=kExtractStatus)
-
-    kFile.close()
+    kProfiler.End()
 
     return True
 
-#end
+#end
\ No newline at end of file
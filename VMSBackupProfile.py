@@ -0,0 +1,157 @@
+import sys
+import io
+import cProfile
+import pstats
+import tracemalloc
+
+# Profiling
+#
+# Processing a save set is split into phases (loading the header, the first and second passes over the blocks,
+# and closing everything down), each of which is profiled separately, so that a change in the cost of any one
+# phase isn't lost amongst the others.  Where a phase occurs more than once (i.e. a tape image holding several
+# save sets), each occurrence is accumulated into the same phase.
+#
+# - Profiling (cProfile) reports the top functions of each phase by cumulative time, and writes the statistics
+#   of every phase combined into a pstats file, for use with pstats/snakeviz etc.
+# - Allocation Tracing (tracemalloc) reports the peak memory use of each phase, and the sites whose allocations
+#   grew the most over it.
+#
+# Note: Only the calling thread is profiled, meaning work on the read ahead and write behind threads, or in
+#       parallel workers, isn't captured.
+
+# Allocations made by the tracing itself aren't of interest
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>")
+)
+
+class VMSBackupProfiler :
+
+    def __init__(self, kProfileFile : str = None, bTraceAllocations : bool = False, nTop : int = 20) -> None :
+
+        self.kProfileFile       = kProfileFile
+        self.bTraceAllocations  = bTraceAllocations
+        self.nTop               = nTop
+        self.kProfiles          = {}
+        self.kPeaks             = {}
+        self.kAllocations       = {}
+        self.kPhase             = None
+        self.kSnapshot          = None
+
+        if self.bTraceAllocations and not tracemalloc.is_tracing() :
+            tracemalloc.start()
+        #end
+
+    #end
+
+    def IsEnabled(self) -> bool :
+        return (None != self.kProfileFile) or self.bTraceAllocations
+    #end
+
+    def Begin(self, kPhase : str) -> None :
+
+        if not self.IsEnabled() :
+            return
+        #end
+
+        # Phases never nest, so starting one ends the last
+        self.End()
+        self.kPhase = kPhase
+
+        if self.bTraceAllocations :
+            tracemalloc.reset_peak()
+            self.kSnapshot = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        #end
+
+        # Profile last, so as not to profile the snapshot
+        if None != self.kProfileFile :
+            self.kProfiles.setdefault(kPhase, cProfile.Profile()).enable()
+        #end
+
+    #end
+
+    def End(self) -> None :
+
+        if None == self.kPhase :
+            return
+        #end
+
+        if None != self.kProfileFile :
+            self.kProfiles[self.kPhase].disable()
+        #end
+
+        if self.bTraceAllocations :
+
+            nPeak                    = tracemalloc.get_traced_memory()[1]
+            self.kPeaks[self.kPhase] = max(nPeak, self.kPeaks.get(self.kPhase, 0))
+            kAllocations             = self.kAllocations.setdefault(self.kPhase, {})
+
+            # Growth is accumulated by allocation site (file and line)
+            for kStatistic in tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS).compare_to(self.kSnapshot, "lineno") :
+                nSize, nCount                       = kAllocations.get(kStatistic.traceback, (0, 0))
+                kAllocations[kStatistic.traceback]  = (nSize + kStatistic.size_diff, nCount + kStatistic.count_diff)
+            #end
+
+            self.kSnapshot = None
+
+        #end
+
+        self.kPhase = None
+
+    #end
+
+    def Dump(self, kOutput : io.TextIOBase = None) -> None :
+
+        if not self.IsEnabled() :
+            return
+        #end
+
+        if None == kOutput :
+            kOutput = sys.stdout
+        #end
+
+        self.End()
+
+        for kPhase, kProfile in self.kProfiles.items() :
+            print(f"", file=kOutput)
+            print(f"Profile : {kPhase}", file=kOutput)
+            pstats.Stats(kProfile, stream=kOutput).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.nTop)
+        #end
+
+        if len(self.kProfiles) > 0 :
+            pstats.Stats(*self.kProfiles.values()).dump_stats(self.kProfileFile)
+            print(f"Profile written to {self.kProfileFile}", file=kOutput)
+        #end
+
+        for kPhase, nPeak in self.kPeaks.items() :
+
+            print(f"", file=kOutput)
+            print(f"Memory : {kPhase} : Peak {nPeak / (1024 * 1024):.1f}MB", file=kOutput)
+
+            kAllocations = sorted(self.kAllocations[kPhase].items(), key=lambda kEntry : kEntry[1][0], reverse=True)
+
+            for kTraceback, (nSize, nCount) in kAllocations[:self.nTop] :
+                if nSize > 0 :
+                    print(f"    {nSize / 1024:+10.1f}KB {nCount:+8} blocks  {kTraceback}", file=kOutput)
+                #end
+            #end
+
+        #end
+
+        if self.bTraceAllocations :
+            tracemalloc.stop()
+        #end
+
+    #end
+
+    kProfileFile        : str
+    bTraceAllocations   = False
+    nTop                = 20
+    kProfiles           : dict
+    kPeaks              : dict
+    kAllocations        : dict
+    kPhase              = None
+    kSnapshot           : tracemalloc.Snapshot = None
+
+#end
\ No newline at end of file
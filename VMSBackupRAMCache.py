@@ -1,15 +1,205 @@
 import os
+import mmap
+import collections
+import concurrent.futures
+
+READ_AHEAD_CHUNK_SIZE = 1024 * 1024
+RAM_CACHE_PAGE_SIZE   = 64 * 1024
+
+class VMSBackupPrefetch :
+
+    # Keeps up to nDepth chunks of the save set read ahead of the current position on a background thread, so
+    # the disk (or network file system) is busy fetching the next blocks whilst the current ones are processed.
+    #
+    # Chunks are read with os.pread(), at fixed chunk aligned offsets, so they're independent of any file
+    # pointer.  Seeking within the chunks already requested costs nothing, whereas seeking anywhere else simply
+    # starts requesting chunks from the new position, with anything requested that's no longer needed being
+    # discarded once it arrives.
+
+    def __init__(self, kFileHandle, nFileLength : int, nDepth : int, nChunkSize : int = READ_AHEAD_CHUNK_SIZE) -> None :
+
+        self.nFileDescriptor    = kFileHandle.fileno()
+        self.nFileLength        = nFileLength
+        self.nDepth             = nDepth
+        self.nChunkSize         = nChunkSize
+        self.nFilePointer       = kFileHandle.tell()
+        self.kChunk             = b""
+        self.nChunkStart        = 0
+        self.kPending           = collections.OrderedDict()
+        self.kExecutor          = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="VMSBackupPrefetch")
+
+    #end
+
+    def Request(self, nOffset : int) -> None :
+
+        if (nOffset < self.nFileLength) and (nOffset not in self.kPending) :
+            self.kPending[nOffset] = self.kExecutor.submit(os.pread, self.nFileDescriptor, self.nChunkSize, nOffset)
+        #end
+
+    #end
+
+    def Fetch(self, nPosition : int) -> None :
+
+        nOffset = nPosition - (nPosition % self.nChunkSize)
+
+        # Forget anything requested outside of the window that's now of interest
+        nWindowEnd = nOffset + (self.nChunkSize * (self.nDepth + 1))
+        for nPendingOffset in [k for k in self.kPending.keys() if (k < nOffset) or (k >= nWindowEnd)] :
+            self.kPending.pop(nPendingOffset).cancel()
+        #end
+
+        self.Request(nOffset=nOffset)
+        self.kChunk      = memoryview(self.kPending.pop(nOffset).result())
+        self.nChunkStart = nOffset
+
+        # Keep the queue topped up
+        for nAhead in range(1, self.nDepth + 1) :
+            self.Request(nOffset=nOffset + (nAhead * self.nChunkSize))
+        #end
+
+    #end
+
+    def read(self, nLength : int) -> bytes | memoryview :
+
+        kData = []
+
+        while (nLength > 0) and (self.nFilePointer < self.nFileLength) :
+
+            if not (self.nChunkStart <= self.nFilePointer < (self.nChunkStart + len(self.kChunk))) :
+                self.Fetch(nPosition=self.nFilePointer)
+                if 0 == len(self.kChunk) :
+                    break
+                #end
+            #end
+
+            nStart              = self.nFilePointer - self.nChunkStart
+            kSlice              = self.kChunk[nStart:nStart + nLength]
+            self.nFilePointer  += len(kSlice)
+            nLength            -= len(kSlice)
+            kData.append(kSlice)
+
+        #end
+
+        # Blocks will nearly always lie within a single chunk, in which case they're handed out as a view of it
+        # rather than a copy, just as with Memory Mapping
+        if 1 == len(kData) :
+            return kData[0]
+        #end
+
+        return b"".join(kData)
+
+    #end
+
+    def seek(self, nOffset : int, nWhence : int) -> None :
+
+        if os.SEEK_SET == nWhence :
+            self.nFilePointer = nOffset
+        elif os.SEEK_CUR == nWhence :
+            self.nFilePointer += nOffset
+        elif os.SEEK_END == nWhence :
+            self.nFilePointer = self.nFileLength + nOffset
+        #end
+        self.nFilePointer = max(0, self.nFilePointer)
+
+    #end
+
+    def tell(self) -> int :
+        return self.nFilePointer
+    #end
+
+    def close(self) -> None :
+
+        # Nothing may still be reading once the file is closed
+        self.kExecutor.shutdown(wait=True, cancel_futures=True)
+        self.kPending.clear()
+
+    #end
+
+    nFileDescriptor : int
+    nFileLength     : int
+    nDepth          : int
+    nChunkSize      = READ_AHEAD_CHUNK_SIZE
+    nFilePointer    = 0
+    kChunk          : bytes | memoryview
+    nChunkStart     = 0
+    kPending        : collections.OrderedDict
+    kExecutor       : concurrent.futures.ThreadPoolExecutor
+
+#end
+
+class VMSBackupBlockCache :
+
+    # Holds the most recently used pages of the save set, up to a budget in bytes, such that a second pass (or
+    # jumping about via the Index) is served from RAM without the whole save set having to fit in it.  Pages are
+    # a fixed size, aligned to the start of the file, since the save set's block size isn't known until its
+    # first block has been read.
+
+    def __init__(self, nBudget : int, nPageSize : int = RAM_CACHE_PAGE_SIZE) -> None :
+
+        self.nPageSize  = nPageSize
+        self.nMaxPages  = max(1, nBudget // nPageSize)
+        self.kPages     = collections.OrderedDict()
+        self.nHits      = 0
+        self.nMisses    = 0
+        self.nEvictions = 0
+
+    #end
+
+    def Get(self, nOffset : int) -> bytes | None :
+
+        kPage = self.kPages.get(nOffset)
+
+        if None == kPage :
+            self.nMisses += 1
+        else :
+            self.nHits   += 1
+            self.kPages.move_to_end(nOffset)
+        #end
+
+        return kPage
+
+    #end
+
+    def Put(self, nOffset : int, kPage : bytes) -> None :
+
+        self.kPages[nOffset] = kPage
+
+        while len(self.kPages) > self.nMaxPages :
+            self.kPages.popitem(last=False)
+            self.nEvictions += 1
+        #end
+
+    #end
+
+    def Dump(self) -> None :
+
+        nRequests = self.nHits + self.nMisses
+        print(f"RAM Cache : {self.nHits} hits, {self.nMisses} misses ({(100 * self.nHits / nRequests) if nRequests > 0 else 0:.1f}% hit rate), {self.nEvictions} evictions, {len(self.kPages) * self.nPageSize // (1024 * 1024)}MB held")
+
+    #end
+
+    nPageSize   : int
+    nMaxPages   : int
+    kPages      : collections.OrderedDict
+    nHits       = 0
+    nMisses     = 0
+    nEvictions  = 0
+
+#end
 
 class VMSBackupRAMCache :
 
-    def __init__(self, bRAMCaching : bool, kFile : str) -> None :
+    def __init__(self, bRAMCaching : bool, kFile : str, bMemoryMapping : bool = False, nReadAheadDepth : int = 0, nRAMCacheSize : int = 256 * 1024 * 1024) -> None :
 
         # Reset the State
         if bRAMCaching :
-            self.kRAMCache = bytearray()
+            self.kRAMCache = VMSBackupBlockCache(nBudget=nRAMCacheSize)
         else :
             self.kRAMCache = None
         #end
+        self.kMemoryMap      = None
+        self.kMemoryView     = None
+        self.kPrefetch       = None
         self.nFilePointer    = 0
 
         # Just return the Exception to the caller for now..
@@ -19,30 +209,79 @@ class VMSBackupRAMCache :
         self.nFileLength = self.kFileHandle.tell() - nStart
         self.kFileHandle.seek(nStart, os.SEEK_SET)
 
+        # Memory Map the File if requested.  This supersedes the RAM Cache since the OS page cache is
+        # already doing the same job, and blocks are handed out as views of the mapping rather than
+        # copies.
+        # Note: Zero length files can't be mapped, but then there's also nothing to read.
+        if bMemoryMapping and (self.nFileLength > 0) :
+
+            self.kMemoryMap   = mmap.mmap(self.kFileHandle.fileno(), 0, access=mmap.ACCESS_READ)
+            self.kMemoryView  = memoryview(self.kMemoryMap)
+            self.kRAMCache    = None
+            self.nFilePointer = nStart
+
+            # Save Sets are read front to back, so let the OS know to read ahead aggressively
+            if hasattr(self.kMemoryMap, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL") :
+                self.kMemoryMap.madvise(mmap.MADV_SEQUENTIAL)
+            #end
+
+        # Otherwise read ahead on a background thread if requested (and possible, os.pread() being POSIX only)
+        elif (None == self.kRAMCache) and (nReadAheadDepth > 0) and hasattr(os, "pread") :
+
+            self.kPrefetch = VMSBackupPrefetch(kFileHandle=self.kFileHandle, nFileLength=self.nFileLength, nDepth=nReadAheadDepth)
+
+        #end
+
+        # Likewise for the OS's own read ahead
+        if (None == self.kMemoryMap) and hasattr(os, "posix_fadvise") :
+            os.posix_fadvise(self.kFileHandle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        #end
+
     #end
 
-    # TBD: This really needs to handle "filling in the blanks"
-    def read(self, nLength : int) -> bytes :
+    def read(self, nLength : int) -> bytes | memoryview :
 
-        if None != self.kRAMCache :
+        if None != self.kMemoryView :
 
+            # Note: This returns a view of the mapped file, not a copy, so consumers must treat the data
+            #       as read-only.
             nCachedFilePointer = self.nFilePointer
-            self.nFilePointer += nLength
+            self.nFilePointer  = min(self.nFilePointer + nLength, self.nFileLength)
 
-            if self.nFilePointer >= len(self.kRAMCache) :
-                self.kFileHandle.seek(len(self.kRAMCache), os.SEEK_SET)
-                self.kRAMCache += self.kFileHandle.read(self.nFilePointer - len(self.kRAMCache))
-                if self.nFilePointer > len(self.kRAMCache) :
-                    self.nFilePointer  = len(self.kRAMCache)
+            return self.kMemoryView[nCachedFilePointer:self.nFilePointer]
+
+        elif None != self.kPrefetch :
+
+            return self.kPrefetch.read(nLength)
+
+        elif None != self.kRAMCache :
+
+            kData   = []
+            nEnd    = min(self.nFilePointer + nLength, self.nFileLength)
+
+            while self.nFilePointer < nEnd :
+
+                # Only whatever isn't already cached is read from the file, a page at a time
+                nPage = self.nFilePointer - (self.nFilePointer % self.kRAMCache.nPageSize)
+                kPage = self.kRAMCache.Get(nOffset=nPage)
+
+                if None == kPage :
+                    self.kFileHandle.seek(nPage, os.SEEK_SET)
+                    kPage = self.kFileHandle.read(self.kRAMCache.nPageSize)
+                    if 0 == len(kPage) :
+                        break
+                    #end
+                    self.kRAMCache.Put(nOffset=nPage, kPage=kPage)
                 #end
-            else :
-                self.kFileHandle.seek(nLength, os.SEEK_CUR)
-            #end
-                
-            assert(self.nFilePointer == self.kFileHandle.tell())
 
-            return bytes(self.kRAMCache[nCachedFilePointer:nCachedFilePointer + nLength])
+                nStart              = self.nFilePointer - nPage
+                kSlice              = kPage[nStart:nStart + (nEnd - self.nFilePointer)]
+                self.nFilePointer  += len(kSlice)
+                kData.append(kSlice)
+
+            #end
 
+            return kData[0] if 1 == len(kData) else b"".join(kData)
 
         else :
 
@@ -54,31 +293,76 @@ class VMSBackupRAMCache :
 
     def seek(self, nOffset : int, nWhence : int) :
 
-        # I may revisit this, but for now just have the OS do all the hard work when seeking
-        self.kFileHandle.seek(nOffset, nWhence)
-        if None != self.kRAMCache :
-            self.nFilePointer = self.kFileHandle.tell()
+        if (None != self.kMemoryView) or (None != self.kRAMCache) :
+
+            # Neither the mapping nor the cache use the file's own pointer, so track it by hand
+            if os.SEEK_SET == nWhence :
+                self.nFilePointer = nOffset
+            elif os.SEEK_CUR == nWhence :
+                self.nFilePointer += nOffset
+            elif os.SEEK_END == nWhence :
+                self.nFilePointer = self.nFileLength + nOffset
+            #end
+            self.nFilePointer = max(0, self.nFilePointer)
+
+        elif None != self.kPrefetch :
+
+            self.kPrefetch.seek(nOffset, nWhence)
+
+        else :
+
+            # I may revisit this, but for now just have the OS do all the hard work when seeking
+            self.kFileHandle.seek(nOffset, nWhence)
+
         #end
 
     #end
-            
+
     def feof(self) :
         return self.tell() >= self.nFileLength
     #end
 
     def tell(self) -> int :
-        if None != self.kRAMCache :
+        if (None != self.kRAMCache) or (None != self.kMemoryView) :
             return self.nFilePointer
+        elif None != self.kPrefetch :
+            return self.kPrefetch.tell()
         else :
             return self.kFileHandle.tell()
         #end
     #end
 
     def close(self) :
+
+        if None != self.kMemoryMap :
+
+            # Blocks handed out by read() may still be referenced by the caller, in which case the mapping
+            # can't be closed yet, and will instead be released once the last view is garbage collected.
+            self.kMemoryView.release()
+            try :
+                self.kMemoryMap.close()
+            except BufferError :
+                pass
+            #end
+            self.kMemoryView = None
+            self.kMemoryMap  = None
+
+        #end
+
+        if None != self.kPrefetch :
+            self.kPrefetch.close()
+            self.kPrefetch = None
+        #end
+
         self.kFileHandle.close()
+
     #end
 
+    bSeekable       = True
     kRAMCache       = None
+    kMemoryMap      = None
+    kMemoryView     = None
+    kPrefetch       = None
     nFilePointer    = 0
     nFileLength     = 0
     kFileHandle     = None
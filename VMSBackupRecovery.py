@@ -0,0 +1,316 @@
+import BBHeader
+import BRHeader
+import BSFileHeader
+import VMSBackupHelper
+import VMSBackupIntegrity
+
+# XOR Redundancy Group Recovery
+#
+# BACKUP can write an XOR block after every group of blocks (/GROUP_SIZE, typically 10), allowing any single
+# lost block in the group to be rebuilt.  Groups are positional, starting from the first block of the save set,
+# such that with a group size of n, every (n+1)th block is an XOR block, with the final group of the save set
+# possibly being short, in which case its XOR block is the last block of the save set.
+#
+# The XOR block carries a header of its own, with the remainder of the block being the XOR of everything
+# following the block header of each block in the group.
+#
+# Blocks are handed over as they're read, and handed back once they're ready to be processed.  Whilst a group
+# is intact, every block is handed straight back, but once a damaged block (one that's short, has an invalid
+# size or fails its CRC) is encountered, it and the remainder of the group are held back until the group's XOR
+# block arrives, at which point the damaged block is rebuilt.  This means recovery never needs a second pass,
+# only enough memory to hold a single group.  The XOR blocks themselves are never handed back.
+#
+# The group size is taken from the save set's summary record (BACKUP records it as XORSIZE), falling back on the
+# one given by -G for save sets whose summary record doesn't hold it.  Since a group size given by hand may be
+# wrong, the XOR block of every intact group is checked against the group before it's discarded, and should it
+# not match, it's handed back as data after all, with recovery being abandoned for the rest of the save set.
+
+# Summary Record Attribute holding the group size
+BSA_XORSIZE = 14
+
+def GetSummaryGroupSize(kBlock : bytes | memoryview, kBlockHeader : BBHeader.BBHeader) -> int | None :
+
+    # The summary record is always the first record of the first block
+    nOffset = kBlockHeader.GetLength()
+
+    if (len(kBlock) - nOffset) < BRHeader.BRHeader.kAddressData.length() :
+        return None
+    #end
+
+    kRecordHeader = BRHeader.BRHeader()
+    kRecordHeader.LoadHeaderFromBuffer(kBlock=kBlock, nOffset=nOffset)
+
+    if BRHeader.BRHeader.RecordType.RECORD_SUMMARY != kRecordHeader.W_RTYPE() :
+        return None
+    #end
+
+    # Summary records hold their attributes in exactly the same form as File Records
+    kSummary = BSFileHeader.BSFileHeader()
+    kSummary.LoadHeaderFromBuffer(kBlock=kBlock, nRSize=kRecordHeader.W_RSIZE(), nOffset=nOffset + kRecordHeader.GetLength())
+
+    if BSA_XORSIZE not in kSummary.kAttributes :
+        return None
+    #end
+
+    return kSummary.GetAttribute(BSA_XORSIZE, VMSBackupHelper.sizeof.uint16_t, False, 0)
+
+#end
+
+def GetGroupSize(kBlock : bytes | memoryview, kBlockHeader : BBHeader.BBHeader, nGroupSize : int) -> tuple[int, bool] :
+
+    # Returns the group size, and whether it came from the save set itself
+    nSummaryGroupSize = GetSummaryGroupSize(kBlock=kBlock, kBlockHeader=kBlockHeader)
+
+    if None == nSummaryGroupSize :
+        return nGroupSize, False
+    #end
+
+    if (nGroupSize > 0) and (nGroupSize != nSummaryGroupSize) :
+        print(f"WARNING : Group size {nGroupSize} given, but the save set was written with a group size of {nSummaryGroupSize}, which is used instead")
+    #end
+
+    return nSummaryGroupSize, True
+
+#end
+
+class VMSBackupRecovery :
+
+    def __init__(self, kBlockHeader : BBHeader.BBHeader, nAbsStart : int, nGroupSize : int, bFromSummary : bool = False, kIntegrity : VMSBackupIntegrity.VMSBackupIntegrityReport = None) -> None :
+
+        self.kBlockHeader   = kBlockHeader
+        self.nBlockSize     = kBlockHeader.L_BLOCKSIZE()
+        self.nHeaderSize    = kBlockHeader.GetLength()
+        self.nAbsStart      = nAbsStart
+        self.nGroupSize     = nGroupSize
+        self.bFromSummary   = bFromSummary
+        self.kIntegrity     = kIntegrity
+
+        # Damaged blocks are still tracked when CRC verification is otherwise turned off, so each is only
+        # reported once
+        if None == self.kIntegrity :
+            self.kIntegrity = VMSBackupIntegrity.VMSBackupIntegrityReport()
+        #end
+        self.nRecovered     = 0
+        self.nUnrecoverable = 0
+        self.bMismatched    = False
+
+        self.Reset(nGroup=None, bComplete=False)
+
+    #end
+
+    def Reset(self, nGroup : int | None, bComplete : bool) -> None :
+
+        self.nGroup         = nGroup
+        self.bComplete      = bComplete
+        self.nParity        = 0
+        self.kHeld          = []
+        self.nDamaged       = 0
+
+    #end
+
+    def GetData(self, kBlock : bytes | memoryview) -> int :
+
+        # The XOR is performed on the block data as one big integer, rather than byte by byte
+        return int.from_bytes(kBlock[self.nHeaderSize:self.nBlockSize], "little")
+
+    #end
+
+    def IsDamaged(self, nBlock : int, kBlock : bytes | memoryview) -> bool :
+
+        if len(kBlock) < self.nBlockSize :
+            return True
+        #end
+
+        kCurrentHeader = BBHeader.BBHeader()
+        kCurrentHeader.LoadHeaderFromBuffer(kBlock=kBlock)
+
+        if not kCurrentHeader.Validate(kBaseHeader=self.kBlockHeader) :
+            return True
+        #end
+
+        # Every block's CRC is verified here anyway, so record it to save verifying it again later
+        kStatus, nCRC = VMSBackupIntegrity.VerifyBlockCRC(kBlock=kBlock, kBlockHeader=kCurrentHeader)
+
+        if VMSBackupIntegrity.CRC_BAD == kStatus :
+            return True
+        #end
+
+        if not self.kIntegrity.IsVerified(nBlock=nBlock) :
+            self.kIntegrity.Add(nBlock=nBlock, nBlockNumber=kCurrentHeader.L_NUMBER(), kStatus=kStatus, nExpectedCRC=kCurrentHeader.L_CRC(), nComputedCRC=nCRC)
+        #end
+
+        return False
+
+    #end
+
+    def Rebuild(self, nBlock : int, kBlock : bytes | memoryview, kXORBlock : bytes | memoryview, nXORBlock : int) -> bytes :
+
+        # Use the damaged block's own header if it's still intact, otherwise base it on the XOR block's header
+        kCurrentHeader = BBHeader.BBHeader()
+        if len(kBlock) >= self.nHeaderSize :
+            kCurrentHeader.LoadHeaderFromBuffer(kBlock=kBlock)
+        #end
+
+        # Note: Validate() lets through a zero block size, which a wiped header would have
+        if (len(kBlock) >= self.nHeaderSize) and (kCurrentHeader.L_BLOCKSIZE() == self.nBlockSize) and (kCurrentHeader.GetLength() == self.nHeaderSize) :
+            kRebuilt = bytearray(kBlock[:self.nHeaderSize])
+        else :
+            kXORHeader = BBHeader.BBHeader()
+            kXORHeader.LoadHeaderFromBuffer(kBlock=kXORBlock)
+            kRebuilt   = bytearray(kXORBlock[:self.nHeaderSize])
+            BBHeader.BBHeader.kAddressData.put("L_NUMBER", kRebuilt, kXORHeader.L_NUMBER() - ((nXORBlock - nBlock) // self.nBlockSize))
+        #end
+
+        kRebuilt += (self.nParity ^ self.GetData(kXORBlock)).to_bytes(self.nBlockSize - self.nHeaderSize, "little")
+
+        return bytes(kRebuilt)
+
+    #end
+
+    def Release(self, nXORBlock : int = None, kXORBlock : bytes | memoryview = None) -> list[tuple[int, bytes | memoryview]] :
+
+        # Rebuild the damaged block if possible, i.e. only one block is damaged, the whole group was seen, and
+        # the XOR block is itself intact
+        bRecoverable = (1 == self.nDamaged) and self.bComplete and (None != kXORBlock) and not self.IsDamaged(nBlock=nXORBlock, kBlock=kXORBlock)
+        kReady       = []
+
+        for nBlock, kBlock, bDamaged in self.kHeld :
+
+            if bDamaged and bRecoverable :
+
+                kBlock          = self.Rebuild(nBlock=nBlock, kBlock=kBlock, kXORBlock=kXORBlock, nXORBlock=nXORBlock)
+                kCurrentHeader  = BBHeader.BBHeader()
+                kCurrentHeader.LoadHeaderFromBuffer(kBlock=kBlock)
+                kStatus, nCRC   = VMSBackupIntegrity.VerifyBlockCRC(kBlock=kBlock, kBlockHeader=kCurrentHeader)
+                self.nRecovered += 1
+
+                # Only report each block once, even if it's visited by more than one pass
+                if not self.kIntegrity.IsVerified(nBlock=nBlock) :
+                    print(f"WARNING : Damaged block {kCurrentHeader.L_NUMBER()} at address 0x{nBlock:08X} rebuilt from its redundancy group{"" if VMSBackupIntegrity.CRC_OK == kStatus else " (unverified)"}")
+                    self.kIntegrity.Add(nBlock=nBlock, nBlockNumber=kCurrentHeader.L_NUMBER(), kStatus=VMSBackupIntegrity.CRC_RECOVERED, nExpectedCRC=kCurrentHeader.L_CRC(), nComputedCRC=nCRC)
+                #end
+
+            elif bDamaged :
+
+                self.nUnrecoverable += 1
+
+                # The block is still recorded as having failed, so it isn't reported again when it's processed
+                if not self.kIntegrity.IsVerified(nBlock=nBlock) :
+                    print(f"WARNING : Damaged block at address 0x{nBlock:08X} can't be rebuilt from its redundancy group")
+                    if len(kBlock) >= self.nHeaderSize :
+                        kCurrentHeader = BBHeader.BBHeader()
+                        kCurrentHeader.LoadHeaderFromBuffer(kBlock=kBlock)
+                        self.kIntegrity.Add(nBlock=nBlock, nBlockNumber=kCurrentHeader.L_NUMBER(), kStatus=VMSBackupIntegrity.CRC_BAD, nExpectedCRC=kCurrentHeader.L_CRC(), nComputedCRC=VMSBackupIntegrity.ComputeBlockCRC(kBlock=kBlock))
+                    #end
+                #end
+
+            #end
+
+            kReady.append((nBlock, kBlock))
+
+        #end
+
+        return kReady
+
+    #end
+
+    def IsParity(self, nBlock : int, kBlock : bytes | memoryview) -> bool :
+
+        # Whether the block has been seen before (i.e. by the first pass), which checking it would then record
+        bReported = self.kIntegrity.IsVerified(nBlock=nBlock)
+
+        # Only an intact group seen in full can be checked, and a damaged XOR block is simply of no use
+        if (0 != self.nDamaged) or (not self.bComplete) or self.IsDamaged(nBlock=nBlock, kBlock=kBlock) or (self.nParity == self.GetData(kBlock)) :
+            return True
+        #end
+
+        # The save set's own group size can be trusted, in which case it's the XOR block that's bad, but a group
+        # size given by hand is more likely just wrong
+        if self.bFromSummary :
+            if not bReported :
+                print(f"WARNING : XOR block at address 0x{nBlock:08X} doesn't match its redundancy group")
+            #end
+            return True
+        #end
+
+        print(f"WARNING : Block at address 0x{nBlock:08X} isn't the XOR block of a group of {self.nGroupSize}, so the group size is wrong.  Recovery abandoned")
+        self.bMismatched = True
+
+        return False
+
+    #end
+
+    def Add(self, nBlock : int, kBlock : bytes | memoryview, bLastBlock : bool) -> list[tuple[int, bytes | memoryview]] :
+
+        # Everything is handed straight back once the group size is known to be wrong
+        if self.bMismatched :
+            return [(nBlock, kBlock)]
+        #end
+
+        nIndex      = (nBlock - self.nAbsStart) // self.nBlockSize
+        nGroup      = nIndex // (self.nGroupSize + 1)
+        nPosition   = nIndex %  (self.nGroupSize + 1)
+        kReady      = []
+
+        # Moving onto a new group without seeing the XOR block (i.e. only part of the save set is being processed)
+        # means any held blocks are lost causes
+        if nGroup != self.nGroup :
+            kReady += self.Release()
+            self.Reset(nGroup=nGroup, bComplete=(0 == nPosition))
+        #end
+
+        # The XOR block is either at the end of a full group, or the last block of a short group
+        if ((self.nGroupSize == nPosition) or (bLastBlock and (nPosition > 0))) and self.IsParity(nBlock=nBlock, kBlock=kBlock) :
+            kReady += self.Release(nXORBlock=nBlock, kXORBlock=kBlock)
+            self.Reset(nGroup=None, bComplete=False)
+            return kReady
+        elif self.bMismatched :
+            kReady.append((nBlock, kBlock))
+            return kReady
+        #end
+
+        bDamaged = self.IsDamaged(nBlock=nBlock, kBlock=kBlock)
+
+        if bDamaged :
+            self.nDamaged += 1
+        else :
+            self.nParity  ^= self.GetData(kBlock)
+        #end
+
+        # Once anything in the group is damaged, everything else has to wait for the XOR block
+        if (self.nDamaged > 0) :
+            self.kHeld.append((nBlock, kBlock, bDamaged))
+        else :
+            kReady.append((nBlock, kBlock))
+        #end
+
+        return kReady
+
+    #end
+
+    def Flush(self) -> list[tuple[int, bytes | memoryview]] :
+
+        kReady = self.Release()
+        self.Reset(nGroup=None, bComplete=False)
+
+        return kReady
+
+    #end
+
+    kBlockHeader    : BBHeader.BBHeader
+    nBlockSize      : int
+    nHeaderSize     : int
+    nAbsStart       : int
+    nGroupSize      : int
+    bFromSummary    = False
+    kIntegrity      : VMSBackupIntegrity.VMSBackupIntegrityReport
+    nRecovered      = 0
+    nUnrecoverable  = 0
+    bMismatched     = False
+    nGroup          = None
+    bComplete       = False
+    nParity         = 0
+    kHeld           : list
+    nDamaged        = 0
+
+#end
\ No newline at end of file
@@ -0,0 +1,400 @@
+import io
+import os
+import hashlib
+import threading
+import concurrent.futures
+import VMSBackupTypes
+import VMSBackupArchive
+
+# Output Sinks
+#
+# Everything extracted is written through a sink, which decides where the converted file data ends up:
+#
+# - File System : A host file per extracted file (the default), within the output folder.
+# - Memory      : Held in a dictionary, keyed by path, for use by other tools.
+# - Null        : Discarded, such that the decode path can be benchmarked on its own.
+# - Hash        : Only a digest of each file is kept, and written out as a manifest once processing is complete.
+# - Archive     : A tar/zip archive (see VMSBackupArchive).
+#
+# Each file is opened with its path (the sanitised folders, if any, followed by the file name), and whatever is
+# returned only needs to support write().  No sink ever changes the working directory, meaning extraction is
+# safe to run alongside anything else in the same process.
+#
+# Any object providing the same methods as VMSBackupSink may be used as a sink in place of an OutputSink.
+#
+# The file system sink is normally wrapped by a write behind sink, which moves all of its I/O onto a pool of
+# writer threads (see VMSBackupWriteBehindSink).
+
+class VMSBackupSink :
+
+    def open(self, kPath : list[str], nCreationDate : int, nModificationDate : int) -> io.IOBase :
+        raise NotImplementedError
+    #end
+
+    def close(self, kFileHandle : io.IOBase, kPath : list[str], nCreationDate : int, nModificationDate : int) -> None :
+        kFileHandle.close()
+    #end
+
+    def finish(self) -> None :
+        pass
+    #end
+
+    # Set when the sink writes to stdout, meaning any listing needs to go elsewhere
+    bStdout     = False
+
+    # Set when files can be written independently of one another, i.e. by parallel workers
+    bParallel   = False
+
+#end
+
+class VMSBackupFileSystemSink(VMSBackupSink) :
+
+    def __init__(self, kOutputPath : str = None, bExtractWithDates : bool = False) -> None :
+
+        self.kOutputPath        = os.path.abspath(os.curdir if None == kOutputPath else kOutputPath)
+        self.bExtractWithDates  = bExtractWithDates
+        self.kFolders           = {}
+
+    #end
+
+    def GetFolder(self, kFolder : tuple[str, ...]) -> str :
+
+        # Each folder is resolved to an absolute host path, and created, only the first time a file is extracted
+        # into it, with every file then being opened by its absolute path, rather than checking for (and
+        # creating) its folder every time
+        kHostFolder = self.kFolders.get(kFolder)
+
+        if None == kHostFolder :
+
+            kHostFolder = os.path.join(self.kOutputPath, *kFolder)
+
+            # Note: Parallel workers may race to create the same folder
+            os.makedirs(kHostFolder, exist_ok=True)
+            self.kFolders[kFolder] = kHostFolder
+
+        #end
+
+        return kHostFolder
+
+    #end
+
+    def open(self, kPath : list[str], nCreationDate : int, nModificationDate : int) -> io.IOBase :
+        return open(os.path.join(self.GetFolder(kFolder=tuple(kPath[:-1])), kPath[-1]), "wb")
+    #end
+
+    def close(self, kFileHandle : io.IOBase, kPath : list[str], nCreationDate : int, nModificationDate : int) -> None :
+
+        kFileHandle.close()
+
+        if self.bExtractWithDates :
+            os.utime(os.path.join(self.GetFolder(kFolder=tuple(kPath[:-1])), kPath[-1]), (nModificationDate, nCreationDate))
+        #end
+
+    #end
+
+    bParallel           = True
+    kOutputPath         : str
+    bExtractWithDates   : bool
+    kFolders            : dict[tuple[str, ...], str]
+
+#end
+
+class VMSBackupMemorySink(VMSBackupSink) :
+
+    def __init__(self) -> None :
+
+        self.kFiles = {}
+
+    #end
+
+    def open(self, kPath : list[str], nCreationDate : int, nModificationDate : int) -> io.IOBase :
+        return io.BytesIO()
+    #end
+
+    def close(self, kFileHandle : io.IOBase, kPath : list[str], nCreationDate : int, nModificationDate : int) -> None :
+        self.kFiles["/".join(kPath)] = kFileHandle.getvalue()
+    #end
+
+    kFiles : dict[str, bytes]
+
+#end
+
+class VMSBackupNullWriter :
+
+    def __init__(self) -> None :
+        self.nLength = 0
+    #end
+
+    def write(self, kData : bytes | memoryview) -> int :
+        self.nLength += len(kData)
+        return len(kData)
+    #end
+
+    def close(self) -> None :
+        pass
+    #end
+
+    nLength = 0
+
+#end
+
+class VMSBackupNullSink(VMSBackupSink) :
+
+    def open(self, kPath : list[str], nCreationDate : int, nModificationDate : int) -> io.IOBase :
+        return VMSBackupNullWriter()
+    #end
+
+#end
+
+class VMSBackupHashWriter :
+
+    def __init__(self, kAlgorithm : str) -> None :
+        self.kHash = hashlib.new(kAlgorithm)
+    #end
+
+    def write(self, kData : bytes | memoryview) -> int :
+        self.kHash.update(kData)
+        return len(kData)
+    #end
+
+    def close(self) -> None :
+        pass
+    #end
+
+    kHash = None
+
+#end
+
+class VMSBackupHashSink(VMSBackupSink) :
+
+    def __init__(self, kManifestFile : str = None, kAlgorithm : str = "sha256") -> None :
+
+        self.kManifestFile  = kManifestFile
+        self.kAlgorithm     = kAlgorithm
+        self.kDigests       = {}
+
+    #end
+
+    def open(self, kPath : list[str], nCreationDate : int, nModificationDate : int) -> io.IOBase :
+        return VMSBackupHashWriter(kAlgorithm=self.kAlgorithm)
+    #end
+
+    def close(self, kFileHandle : io.IOBase, kPath : list[str], nCreationDate : int, nModificationDate : int) -> None :
+        self.kDigests["/".join(kPath)] = kFileHandle.kHash.hexdigest()
+    #end
+
+    def finish(self) -> None :
+
+        # The same layout as sha256sum and friends, so the manifest can be checked against extracted files
+        kLines = [f"{kDigest}  {kPath}" for kPath, kDigest in self.kDigests.items()]
+
+        if None == self.kManifestFile :
+            if len(kLines) > 0 :
+                print("\n".join(kLines))
+            #end
+        else :
+            with open(self.kManifestFile, "w") as kManifest :
+                kManifest.write("".join(kLine + "\n" for kLine in kLines))
+            #end
+        #end
+
+    #end
+
+    kManifestFile   : str
+    kAlgorithm      : str
+    kDigests        : dict[str, str]
+
+#end
+
+class VMSBackupWriteBehindFile :
+
+    def __init__(self, kPath : list[str], nCreationDate : int, nModificationDate : int, kExecutor : concurrent.futures.ThreadPoolExecutor) -> None :
+
+        self.kPath              = kPath
+        self.nCreationDate      = nCreationDate
+        self.nModificationDate  = nModificationDate
+        self.kExecutor          = kExecutor
+        self.kBuffer            = bytearray()
+        self.kFileHandle        = None
+
+    #end
+
+    kPath               : list[str]
+    nCreationDate       : int
+    nModificationDate   : int
+    kExecutor           : concurrent.futures.ThreadPoolExecutor
+    kBuffer             : bytearray
+    kFileHandle         = None
+
+#end
+
+class VMSBackupWriteBehindWriter :
+
+    def __init__(self, kSink, kFile : VMSBackupWriteBehindFile) -> None :
+
+        self.kSink = kSink
+        self.kFile = kFile
+
+    #end
+
+    def write(self, kData : bytes | memoryview) -> int :
+
+        # Note: This copies the data, so the caller is free to re-use whatever it was a view of
+        self.kFile.kBuffer += kData
+
+        if len(self.kFile.kBuffer) >= self.kSink.nBufferSize :
+            self.kSink.Submit(kFile=self.kFile, kJob=self.kSink.WriteJob, kData=self.kFile.kBuffer)
+            self.kFile.kBuffer = bytearray()
+        #end
+
+        return len(kData)
+
+    #end
+
+    def close(self) -> None :
+        pass
+    #end
+
+    kSink = None
+    kFile : VMSBackupWriteBehindFile
+
+#end
+
+class VMSBackupWriteBehindSink(VMSBackupSink) :
+
+    # Write Behind
+    #
+    # Writes are gathered into large buffers per file, which are handed over to a pool of writer threads along
+    # with the opening and closing (including setting the dates) of the file itself, such that extraction never
+    # waits on a slow output file system.  Every host path is tied to a single writer thread, so the operations
+    # on a file always happen in order, whilst different files are written concurrently.  This includes the same
+    # path being written more than once (i.e. several versions of a file extracted without their version numbers),
+    # where the last file written must still be the one left behind.
+    #
+    # The number of buffers queued is bounded, so should the writers fall behind, extraction waits for them
+    # rather than holding the whole save set in memory.  Any error is raised by the next write, or by finish().
+
+    def __init__(self, kSink : VMSBackupSink, nThreads : int, nBufferSize : int = 1024 * 1024, nQueueDepth : int = 64) -> None :
+
+        self.kSink          = kSink
+        self.nBufferSize    = nBufferSize
+        self.kExecutors     = [concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="VMSBackupWriteBehind") for _ in range(nThreads)]
+        self.kQueueSlots    = threading.BoundedSemaphore(nQueueDepth)
+        self.kException     = None
+        self.bStdout        = kSink.bStdout
+        self.bParallel      = kSink.bParallel
+
+    #end
+
+    def Submit(self, kFile : VMSBackupWriteBehindFile, kJob, kData : bytearray | None) -> None :
+
+        if None != self.kException :
+            raise self.kException
+        #end
+
+        self.kQueueSlots.acquire()
+        kFile.kExecutor.submit(kJob, kFile, kData).add_done_callback(self.Done)
+
+    #end
+
+    def Done(self, kFuture : concurrent.futures.Future) -> None :
+
+        if (None == self.kException) and (None != kFuture.exception()) :
+            self.kException = kFuture.exception()
+        #end
+
+        self.kQueueSlots.release()
+
+    #end
+
+    def OpenJob(self, kFile : VMSBackupWriteBehindFile, kData : None) -> None :
+        kFile.kFileHandle = self.kSink.open(kPath=kFile.kPath, nCreationDate=kFile.nCreationDate, nModificationDate=kFile.nModificationDate)
+    #end
+
+    def WriteJob(self, kFile : VMSBackupWriteBehindFile, kData : bytearray) -> None :
+
+        # Nothing more can be done for a file that failed to open, which has already been reported
+        if None != kFile.kFileHandle :
+            kFile.kFileHandle.write(kData)
+        #end
+
+    #end
+
+    def CloseJob(self, kFile : VMSBackupWriteBehindFile, kData : bytearray) -> None :
+
+        if None != kFile.kFileHandle :
+            kFile.kFileHandle.write(kData)
+            self.kSink.close(kFileHandle=kFile.kFileHandle, kPath=kFile.kPath, nCreationDate=kFile.nCreationDate, nModificationDate=kFile.nModificationDate)
+        #end
+
+    #end
+
+    def open(self, kPath : list[str], nCreationDate : int, nModificationDate : int) -> io.IOBase :
+
+        # Share the files out between the writers by path, ignoring case since the host file system may well do
+        # so too
+        kExecutor = self.kExecutors[hash(tuple(kPart.casefold() for kPart in kPath)) % len(self.kExecutors)]
+        kFile     = VMSBackupWriteBehindFile(kPath=kPath, nCreationDate=nCreationDate, nModificationDate=nModificationDate, kExecutor=kExecutor)
+
+        self.Submit(kFile=kFile, kJob=self.OpenJob, kData=None)
+
+        return VMSBackupWriteBehindWriter(kSink=self, kFile=kFile)
+
+    #end
+
+    def close(self, kFileHandle : io.IOBase, kPath : list[str], nCreationDate : int, nModificationDate : int) -> None :
+
+        # The dates may only have become known after the file was opened
+        kFileHandle.kFile.nCreationDate     = nCreationDate
+        kFileHandle.kFile.nModificationDate = nModificationDate
+
+        self.Submit(kFile=kFileHandle.kFile, kJob=self.CloseJob, kData=kFileHandle.kFile.kBuffer)
+        kFileHandle.kFile.kBuffer = None
+
+    #end
+
+    def finish(self) -> None :
+
+        for kExecutor in self.kExecutors :
+            kExecutor.shutdown(wait=True)
+        #end
+
+        if None != self.kException :
+            raise self.kException
+        #end
+
+        self.kSink.finish()
+
+    #end
+
+    kSink           : VMSBackupSink
+    nBufferSize     : int
+    kExecutors      : list[concurrent.futures.ThreadPoolExecutor]
+    kQueueSlots     : threading.BoundedSemaphore
+    kException      = None
+
+#end
+
+def CreateSink(kOptions : VMSBackupTypes.VMSBackupParameters) -> VMSBackupSink :
+
+    if None != kOptions.kArchiveFile :
+        return VMSBackupArchive.VMSBackupArchive(kArchiveFile=kOptions.kArchiveFile, nSpoolRAMLimit=kOptions.nSmartSpoolRAMLimit)
+    elif not isinstance(kOptions.eOutputSink, VMSBackupTypes.OutputSink) :
+        return kOptions.eOutputSink
+    elif VMSBackupTypes.OutputSink.MEMORY == kOptions.eOutputSink :
+        return VMSBackupMemorySink()
+    elif VMSBackupTypes.OutputSink.NULL == kOptions.eOutputSink :
+        return VMSBackupNullSink()
+    elif VMSBackupTypes.OutputSink.HASH == kOptions.eOutputSink :
+        return VMSBackupHashSink(kManifestFile=kOptions.kHashManifestFile)
+    #end
+
+    kSink = VMSBackupFileSystemSink(kOutputPath=kOptions.kOutputPath, bExtractWithDates=kOptions.bExtractWithDate)
+
+    if kOptions.nWriteBehindThreads > 0 :
+        kSink = VMSBackupWriteBehindSink(kSink=kSink, nThreads=kOptions.nWriteBehindThreads)
+    #end
+
+    return kSink
+
+#end
\ No newline at end of file
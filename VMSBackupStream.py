@@ -0,0 +1,464 @@
+import io
+import os
+import stat
+import sys
+import tempfile
+import threading
+import queue
+import gzip
+import bz2
+import lzma
+
+# zstd isn't part of the standard library, so it's only supported if the zstandard package is available
+try :
+    import zstandard
+except ImportError :
+    zstandard = None
+#end
+
+# Streamed Save Set Access
+#
+# This is a drop in replacement for VMSBackupRAMCache for sources which can only be read strictly forwards,
+# i.e. stdin, pipes, tape devices and compressed save sets.  As such:
+#
+# - The length of the save set is never known, so the end is only detected by a short read, which feof()
+#   performs lazily by peeking ahead.
+# - Seeking forwards is performed by reading and discarding data.
+# - Seeking backwards is only possible over the data returned by the most recent read (enough to re-read a
+#   header), or anywhere at all if the stream is rewindable, in which case everything read is also copied
+#   into a temporary file that can be replayed.  Compressed files on disk are instead simply re-opened.
+
+# Compression is detected by the magic bytes at the start of the save set.  None of these can be confused
+# with an uncompressed save set, which always starts with the 256 byte Block Header Size (0x0100).
+kCompressionMagic = {
+    "gzip"  : b"\x1f\x8b",
+    "bzip2" : b"BZh",
+    "xz"    : b"\xfd7zXZ\x00",
+    "zstd"  : b"\x28\xb5\x2f\xfd"
+}
+
+READ_AHEAD_CHUNK_SIZE = 1024 * 1024
+
+def IsStream(kFile : str) -> bool :
+
+    if "-" == kFile :
+        return True
+    #end
+
+    # Anything other than a regular file (FIFO's, character devices etc.) can't be relied upon to seek
+    try :
+        return not stat.S_ISREG(os.stat(kFile).st_mode)
+    except OSError :
+        return False
+    #end
+
+#end
+
+def GetCompression(kMagic : bytes) -> str | None :
+
+    for kCompression, kCompressionMagicBytes in kCompressionMagic.items() :
+        if kMagic.startswith(kCompressionMagicBytes) :
+            return kCompression
+        #end
+    #end
+
+    return None
+
+#end
+
+def IsCompressed(kFile : str) -> bool :
+
+    # Streams are checked once opened, since their magic bytes can't be read without consuming them
+    try :
+        with open(kFile, "rb") as kFileHandle :
+            return None != GetCompression(kFileHandle.read(8))
+        #end
+    except OSError :
+        return False
+    #end
+
+#end
+
+def OpenDecompressor(kCompression : str, kFileHandle) :
+
+    if "gzip" == kCompression :
+        return gzip.GzipFile(fileobj=kFileHandle, mode="rb")
+    elif "bzip2" == kCompression :
+        return bz2.BZ2File(kFileHandle, mode="rb")
+    elif "xz" == kCompression :
+        return lzma.LZMAFile(kFileHandle, mode="rb")
+    elif None == zstandard :
+        raise ImportError("zstd compressed save sets require the zstandard package")
+    #end
+
+    return zstandard.ZstdDecompressor().stream_reader(kFileHandle, read_across_frames=True)
+
+#end
+
+class VMSBackupReadAhead :
+
+    # Reads a file on a background thread, keeping up to nDepth chunks queued ahead of the reader.  This is
+    # mainly of use for decompression, since the decompressors release the GIL whilst they work, allowing the
+    # decompression to overlap the processing of the blocks already read.
+
+    def __init__(self, kFileHandle, nDepth : int, nChunkSize : int = READ_AHEAD_CHUNK_SIZE) -> None :
+
+        self.kFileHandle    = kFileHandle
+        self.nChunkSize     = nChunkSize
+        self.kQueue         = queue.Queue(maxsize=nDepth)
+        self.kBuffer        = b""
+        self.nBufferPos     = 0
+        self.bEOF           = False
+        self.kStop          = threading.Event()
+        self.kThread        = threading.Thread(target=self.ReadThread, daemon=True)
+        self.kThread.start()
+
+    #end
+
+    def ReadThread(self) :
+
+        bRunning = True
+
+        while bRunning and not self.kStop.is_set() :
+
+            # Exceptions are handed over to the reader, to be raised from read()
+            try :
+                kChunk   = self.kFileHandle.read(self.nChunkSize)
+                bRunning = len(kChunk) > 0
+            except Exception as kException :
+                kChunk   = kException
+                bRunning = False
+            #end
+
+            # Don't block forever if the reader has given up
+            while not self.kStop.is_set() :
+                try :
+                    self.kQueue.put(kChunk, timeout=0.1)
+                    break
+                except queue.Full :
+                    pass
+                #end
+            #end
+
+        #end
+
+    #end
+
+    def read(self, nLength : int) -> bytes :
+
+        kData       = []
+        nRemaining  = nLength
+
+        while nRemaining > 0 :
+
+            # Fetch the next chunk once the current one is used up
+            if self.nBufferPos >= len(self.kBuffer) :
+
+                if self.bEOF :
+                    break
+                #end
+
+                kChunk = self.kQueue.get()
+
+                if isinstance(kChunk, Exception) :
+                    self.bEOF = True
+                    raise kChunk
+                elif 0 == len(kChunk) :
+                    self.bEOF = True
+                    break
+                #end
+
+                self.kBuffer    = kChunk
+                self.nBufferPos = 0
+
+            #end
+
+            kSlice           = self.kBuffer[self.nBufferPos:self.nBufferPos + nRemaining]
+            self.nBufferPos += len(kSlice)
+            nRemaining      -= len(kSlice)
+            kData.append(kSlice)
+
+        #end
+
+        return b"".join(kData)
+
+    #end
+
+    def close(self) :
+
+        self.kStop.set()
+        self.kThread.join()
+        self.kFileHandle.close()
+
+    #end
+
+    kFileHandle     = None
+    nChunkSize      = READ_AHEAD_CHUNK_SIZE
+    kQueue          : queue.Queue
+    kBuffer         : bytes
+    nBufferPos      = 0
+    bEOF            = False
+    kStop           : threading.Event
+    kThread         : threading.Thread
+
+#end
+
+class VMSBackupPushBack :
+
+    # Hands back data already read from the start of a file (i.e. its magic bytes) ahead of the rest of it
+
+    def __init__(self, kData : bytes, kFileHandle) -> None :
+
+        self.kData       = kData
+        self.kFileHandle = kFileHandle
+
+    #end
+
+    def read(self, nLength : int = -1) -> bytes :
+
+        if 0 == len(self.kData) :
+            return self.kFileHandle.read(nLength)
+        #end
+
+        if nLength < 0 :
+            kData      = self.kData + self.kFileHandle.read()
+            self.kData = b""
+        else :
+            kData      = self.kData[:nLength]
+            self.kData = self.kData[nLength:]
+        #end
+
+        return kData
+
+    #end
+
+    def close(self) -> None :
+        pass
+    #end
+
+    kData       : bytes
+    kFileHandle = None
+
+#end
+
+class VMSBackupStream :
+
+    def __init__(self, kFile : str, bRewindable : bool = False, nReadAheadDepth : int = 0) -> None :
+
+        self.kFile              = kFile
+        self.nReadAheadDepth    = nReadAheadDepth
+        self.bReopenable        = not IsStream(kFile)
+
+        # Files on disk can simply be re-opened rather than copied
+        if bRewindable and not self.bReopenable :
+            self.kRewindFile = tempfile.TemporaryFile()
+        else :
+            self.kRewindFile = None
+        #end
+
+        self.Open()
+
+    #end
+
+    def Open(self) :
+
+        if "-" == self.kFile :
+            self.kSourceHandle  = sys.stdin.buffer
+            self.bOwnsHandle    = False
+        else :
+            self.kSourceHandle  = open(self.kFile, "rb")
+            self.bOwnsHandle    = True
+        #end
+
+        # Read the magic bytes, bearing in mind a pipe may hand them over a few at a time, since peeking at them
+        # would only return whatever happens to be buffered
+        kMagic = b""
+        while len(kMagic) < 8 :
+            kData = self.kSourceHandle.read(8 - len(kMagic))
+            if 0 == len(kData) :
+                break
+            #end
+            kMagic += kData
+        #end
+
+        self.kPending       = b""
+        self.kLastRead      = b""
+        self.nFilePointer   = 0
+        self.bReplaying     = False
+
+        # Decompress on the fly if needed, with the magic bytes being handed back to the decompressor, otherwise
+        # they're simply the start of the save set
+        self.kCompression = GetCompression(kMagic)
+
+        if None != self.kCompression :
+            self.kFileHandle = OpenDecompressor(kCompression=self.kCompression, kFileHandle=VMSBackupPushBack(kData=kMagic, kFileHandle=self.kSourceHandle))
+            if self.nReadAheadDepth > 0 :
+                self.kFileHandle = VMSBackupReadAhead(kFileHandle=self.kFileHandle, nDepth=self.nReadAheadDepth)
+            #end
+        else :
+            self.kFileHandle = self.kSourceHandle
+            self.kPending    = kMagic
+            if None != self.kRewindFile :
+                self.kRewindFile.write(kMagic)
+            #end
+        #end
+
+    #end
+
+    def Close(self) :
+
+        if self.kFileHandle is not self.kSourceHandle :
+            self.kFileHandle.close()
+        #end
+
+        if self.bOwnsHandle :
+            self.kSourceHandle.close()
+        #end
+
+    #end
+
+    def readSource(self, nLength : int) -> bytes :
+
+        # Replay whatever's already been read first
+        if self.bReplaying :
+
+            kData = self.kRewindFile.read(nLength)
+
+            if len(kData) < nLength :
+                self.bReplaying = False
+                self.kRewindFile.seek(0, os.SEEK_END)
+                kData += self.readSource(nLength - len(kData))
+            #end
+
+            return kData
+
+        #end
+
+        # Only a short read at the end of the stream is acceptable, but not all decompressors guarantee this
+        kData = self.kFileHandle.read(nLength)
+
+        while 0 < len(kData) < nLength :
+            kMoreData = self.kFileHandle.read(nLength - len(kData))
+            if 0 == len(kMoreData) :
+                break
+            #end
+            kData += kMoreData
+        #end
+
+        if None != self.kRewindFile :
+            self.kRewindFile.write(kData)
+        #end
+
+        return kData
+
+    #end
+
+    def read(self, nLength : int) -> bytes :
+
+        if len(self.kPending) > 0 :
+            kData         = self.kPending[:nLength]
+            self.kPending = self.kPending[nLength:]
+            if len(kData) < nLength :
+                kData += self.readSource(nLength - len(kData))
+            #end
+        else :
+            kData = self.readSource(nLength)
+        #end
+
+        self.nFilePointer += len(kData)
+        self.kLastRead     = kData
+
+        return kData
+
+    #end
+
+    def seek(self, nOffset : int, nWhence : int) :
+
+        if os.SEEK_SET == nWhence :
+            nTarget = nOffset
+        elif os.SEEK_CUR == nWhence :
+            nTarget = self.nFilePointer + nOffset
+        else :
+            raise io.UnsupportedOperation("Streams can't seek relative to the end")
+        #end
+
+        if nTarget > self.nFilePointer :
+
+            # Skip forwards
+            self.read(nTarget - self.nFilePointer)
+
+        elif nTarget >= (self.nFilePointer - len(self.kLastRead)) :
+
+            # Push back the data that was just read
+            nPushBack          = self.nFilePointer - nTarget
+            if nPushBack > 0 :
+                self.kPending      = self.kLastRead[len(self.kLastRead) - nPushBack:] + self.kPending
+                self.kLastRead     = self.kLastRead[:len(self.kLastRead) - nPushBack]
+                self.nFilePointer  = nTarget
+            #end
+
+        elif None != self.kRewindFile :
+
+            # Replay from the copy
+            self.kRewindFile.seek(nTarget, os.SEEK_SET)
+            self.kPending       = b""
+            self.kLastRead      = b""
+            self.nFilePointer   = nTarget
+            self.bReplaying     = True
+
+        elif self.bReopenable :
+
+            # Start again from the top
+            self.Close()
+            self.Open()
+            self.read(nTarget)
+
+        else :
+
+            raise io.UnsupportedOperation("Streams can't seek backwards")
+
+        #end
+
+    #end
+
+    def feof(self) :
+
+        # Peek ahead to find out if there's anything left
+        if 0 == len(self.kPending) :
+            self.kPending = self.readSource(1)
+        #end
+
+        return 0 == len(self.kPending)
+
+    #end
+
+    def tell(self) -> int :
+        return self.nFilePointer
+    #end
+
+    def close(self) :
+
+        self.Close()
+
+        if None != self.kRewindFile :
+            self.kRewindFile.close()
+            self.kRewindFile = None
+        #end
+
+    #end
+
+    bSeekable       = False
+    kFile           : str
+    kCompression    = None
+    nReadAheadDepth = 0
+    bReopenable     = False
+    kSourceHandle   = None
+    kFileHandle     = None
+    bOwnsHandle     = False
+    kPending        : bytes
+    kLastRead       : bytes
+    nFilePointer    = 0
+    bReplaying      = False
+    kRewindFile     = None
+
+#end
\ No newline at end of file
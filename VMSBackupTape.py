@@ -0,0 +1,266 @@
+import bisect
+import os
+
+# SIMH Tape Image Access
+#
+# Save Sets are frequently archived as SIMH tape images (.tap), where every tape block is wrapped in a 4 byte
+# little endian length, both before and after the block data, with tape marks (a zero length) separating the
+# files on the tape.  A BACKUP tape is written as a series of ANSI labelled files, one per Save Set:
+#
+#   VOL1 | HDR1 HDR2 * <Save Set Blocks> * EOF1 EOF2 * | HDR1 HDR2 * <Save Set Blocks> * EOF1 EOF2 * | ... *
+#
+# Where * is a tape mark.  The tape image is scanned once up front to find the blocks of each Save Set, which
+# are then presented to VMSBackupProcess as though each Save Set were a file of its own.
+
+TAPE_MARK           = 0x00000000
+TAPE_END_OF_MEDIUM  = 0xFFFFFFFF
+TAPE_LENGTH_MASK    = 0x0FFFFFFF
+
+# Record Classes held in the top 4 bits of the length, of which only good/bad data records hold tape data,
+# with class 0xF being reserved for gaps and the end of the medium.
+TAPE_CLASS_GOOD     = 0x0
+TAPE_CLASS_BAD      = 0x8
+TAPE_CLASS_MARKER   = 0xE
+TAPE_CLASS_RESERVED = 0xF
+
+# ANSI Labels are always 80 byte records
+ANSI_LABEL_SIZE     = 80
+ANSI_LABELS         = (b"VOL", b"HDR", b"EOF", b"EOV", b"UHL", b"UTL", b"UVL")
+
+def ReadTapeRecord(kFileHandle, nOffset : int) -> tuple[int, int, int, int] :
+
+    # Returns the Record Class, Record Data Offset, Record Data Length and the Offset of the next Record
+    kMarker = kFileHandle.read(4)
+
+    if len(kMarker) < 4 :
+        return TAPE_CLASS_RESERVED, nOffset, 0, None
+    #end
+
+    nMarker = int.from_bytes(kMarker, "little")
+    nClass  = nMarker >> 28
+
+    # Tape Marks, Gaps and Private Markers have no data (and therefore no trailing length)
+    if (TAPE_MARK == nMarker) or (nClass >= TAPE_CLASS_MARKER) :
+        if TAPE_END_OF_MEDIUM == nMarker :
+            return nClass, nOffset, 0, None
+        #end
+        return nClass, nOffset, 0, nOffset + 4
+    #end
+
+    # Records are padded to an even length, however some tools omit the padding, which is detected by the
+    # trailing length not matching up
+    nLength = nMarker & TAPE_LENGTH_MASK
+
+    for nPadding in sorted({nLength & 1, 0}, reverse=True) :
+        kFileHandle.seek(nOffset + 4 + nLength + nPadding, os.SEEK_SET)
+        if kFileHandle.read(4) == kMarker :
+            return nClass, nOffset + 4, nLength, nOffset + 4 + nLength + nPadding + 4
+        #end
+    #end
+
+    # The framing is corrupt, so there's no safe way to continue
+    return TAPE_CLASS_RESERVED, nOffset, 0, None
+
+#end
+
+def IsTapeImage(kFile : str) -> bool :
+
+    try :
+
+        with open(kFile, "rb") as kFileHandle :
+
+            # A tape image may start with tape marks, but the first real record must have matching lengths
+            nOffset = 0
+
+            while None != nOffset :
+
+                kFileHandle.seek(nOffset, os.SEEK_SET)
+                nClass, _, nLength, nNextOffset = ReadTapeRecord(kFileHandle=kFileHandle, nOffset=nOffset)
+
+                if nLength > 0 :
+                    return nClass in [TAPE_CLASS_GOOD, TAPE_CLASS_BAD]
+                elif nNextOffset != (nOffset + 4) :
+                    return False
+                #end
+
+                nOffset = nNextOffset
+
+            #end
+
+        #end
+
+    except OSError :
+        pass
+    #end
+
+    return False
+
+#end
+
+class VMSBackupTapeImage :
+
+    def __init__(self, kFile : str) -> None :
+
+        self.kFile      = kFile
+        self.kSaveSets  = []
+
+        with open(kFile, "rb") as kFileHandle :
+
+            kFileName   = None
+            kRecords    = []
+            nOffset     = 0
+
+            while None != nOffset :
+
+                kFileHandle.seek(nOffset, os.SEEK_SET)
+                nClass, nDataOffset, nLength, nNextOffset = ReadTapeRecord(kFileHandle=kFileHandle, nOffset=nOffset)
+
+                if (0 == nLength) and ((TAPE_CLASS_GOOD == nClass) or (None == nNextOffset)) :
+
+                    # A Tape Mark (or the end of the tape) finishes off the Save Set
+                    if len(kRecords) > 0 :
+                        self.kSaveSets.append((kFileName, kRecords))
+                        kRecords = []
+                    #end
+
+                elif nClass in [TAPE_CLASS_GOOD, TAPE_CLASS_BAD] :
+
+                    kFileHandle.seek(nDataOffset, os.SEEK_SET)
+                    kLabel = kFileHandle.read(min(nLength, 21))
+
+                    if (ANSI_LABEL_SIZE == nLength) and kLabel.startswith(ANSI_LABELS) :
+
+                        # The HDR1 Label holds the name the Save Set was written with
+                        if kLabel.startswith(b"HDR1") :
+                            kFileName = kLabel[4:21].decode("ascii", errors="replace").strip()
+                        #end
+
+                    else :
+
+                        kRecords.append((nDataOffset, nLength))
+
+                    #end
+
+                #end
+
+                nOffset = nNextOffset
+
+            #end
+
+            if len(kRecords) > 0 :
+                self.kSaveSets.append((kFileName, kRecords))
+            #end
+
+        #end
+
+    #end
+
+    def GetSaveSetNames(self) -> list[str] :
+
+        return [kFileName for kFileName, _ in self.kSaveSets]
+
+    #end
+
+    def IsSelected(self, nSaveSet : int, kSelection : int | str | None) -> bool :
+
+        # Save Sets can be selected either by their position on the tape (starting from 1), or by name
+        if None == kSelection :
+            return True
+        elif isinstance(kSelection, int) :
+            return (nSaveSet + 1) == kSelection
+        #end
+
+        kFileName = self.kSaveSets[nSaveSet][0]
+
+        return (None != kFileName) and (kFileName.upper() == kSelection.upper())
+
+    #end
+
+    def Open(self, nSaveSet : int) :
+
+        return VMSBackupTapeSaveSet(kFile=self.kFile, kRecords=self.kSaveSets[nSaveSet][1])
+
+    #end
+
+    kFile       : str
+    kSaveSets   : list[tuple[str, list[tuple[int, int]]]]
+
+#end
+
+class VMSBackupTapeSaveSet :
+
+    # Drop in replacement for VMSBackupRAMCache, presenting the blocks of a single Save Set back to back
+
+    def __init__(self, kFile : str, kRecords : list[tuple[int, int]]) -> None :
+
+        self.kFileHandle    = open(kFile, "rb")
+        self.kRecords       = kRecords
+        self.kRecordStarts  = []
+        self.nFilePointer   = 0
+        self.nFileLength    = 0
+
+        for _, nLength in kRecords :
+            self.kRecordStarts.append(self.nFileLength)
+            self.nFileLength += nLength
+        #end
+
+    #end
+
+    def read(self, nLength : int) -> bytes :
+
+        kData = []
+
+        while (nLength > 0) and (self.nFilePointer < self.nFileLength) :
+
+            # Find the Tape Record holding the current position, and read as much of it as is needed
+            nRecord             = bisect.bisect_right(self.kRecordStarts, self.nFilePointer) - 1
+            nRecordOffset, nRecordLength = self.kRecords[nRecord]
+            nStart              = self.nFilePointer - self.kRecordStarts[nRecord]
+            nChunk              = min(nLength, nRecordLength - nStart)
+
+            self.kFileHandle.seek(nRecordOffset + nStart, os.SEEK_SET)
+            kData.append(self.kFileHandle.read(nChunk))
+
+            self.nFilePointer  += nChunk
+            nLength            -= nChunk
+
+        #end
+
+        return b"".join(kData)
+
+    #end
+
+    def seek(self, nOffset : int, nWhence : int) :
+
+        if os.SEEK_SET == nWhence :
+            self.nFilePointer = nOffset
+        elif os.SEEK_CUR == nWhence :
+            self.nFilePointer = self.nFilePointer + nOffset
+        elif os.SEEK_END == nWhence :
+            self.nFilePointer = self.nFileLength + nOffset
+        #end
+
+        self.nFilePointer = max(0, min(self.nFilePointer, self.nFileLength))
+
+    #end
+
+    def feof(self) :
+        return self.tell() >= self.nFileLength
+    #end
+
+    def tell(self) -> int :
+        return self.nFilePointer
+    #end
+
+    def close(self) :
+        self.kFileHandle.close()
+    #end
+
+    bSeekable       = True
+    kFileHandle     = None
+    kRecords        : list[tuple[int, int]]
+    kRecordStarts   : list[int]
+    nFilePointer    = 0
+    nFileLength     = 0
+
+#end
\ No newline at end of file
@@ -1,6 +1,7 @@
 import enum
 import io
-import os
+import tempfile
+import functools
 
 class OutputType(enum.IntEnum):
     SUPPRESS    = 0
@@ -16,6 +17,18 @@ class ExtractMode(enum.IntEnum):
     RAW         = 3
 #end
 
+class Classifier(enum.IntEnum):
+    HIGHBIT     = 0
+    TEXT        = 1
+#end
+
+class OutputSink(enum.IntEnum):
+    FILESYSTEM  = 0
+    MEMORY      = 1
+    NULL        = 2
+    HASH        = 3
+#end
+
 class ExtractDebug(enum.IntEnum):
     NONE        = 0
     BASIC       = 1
@@ -44,8 +57,32 @@ class VMSBackupParameters :
     # with their length fields intact.
     eExtractMode            = ExtractMode.SMART
 
+    # Smart Spooling
+
+    # When enabled, Smart Mode classifies each file in the same pass as it's
+    # extracted, holding the file data back (in RAM up to the limit, beyond
+    # which a temporary file is used) until the file is known to be ASCII or
+    # Binary.  When disabled, a dedicated first pass over the save set is used
+    # to classify every file.
+    bSmartSpooling          = True
+    nSmartSpoolRAMLimit     = 16 * 1024 * 1024
+
+    # Smart Classifier
+
+    # Determines the rule Smart Mode uses to decide whether a file is Binary.
+    # High Bit deems any file containing a byte > 0x7F as Binary, whereas Text
+    # additionally treats NUL's, or a significant proportion of control
+    # characters, as Binary.  A callable taking the file data and returning
+    # True for Binary may also be used.
+    eClassifier             = Classifier.HIGHBIT
+
     # Extract Mask
+
+    # Comma separated masks (see VMSBackupMask) of the files to select, less
+    # any matching the comma separated exclusion masks (None to exclude
+    # nothing).
     kExtractMask            = "*.*"
+    kExcludeMask            = None
     nExtractVersion         = 0 # Set to None to extract all versions
 
     # Folder Extract
@@ -58,18 +95,183 @@ class VMSBackupParameters :
     bExtractWithVersion     = False
 
     # RAM Caching
+
+    # Recently read parts of the save set are kept in RAM, up to this many
+    # bytes, with the least recently used being discarded first, such that a
+    # second pass, or jumping about via the Index, avoids going back to the
+    # file without the whole save set needing to fit in RAM.
     bRAMCaching             = False
+    nRAMCacheSize           = 256 * 1024 * 1024
+
+    # Memory Mapped File Access (supersedes RAM Caching)
+    bMemoryMapping          = False
+
+    # Save Set Index (built on first use, then used to skip straight to the files of interest)
+    bIndex                  = False
+    kIndexFile              = None  # Set to None to place the index alongside the save set
+
+    # Parallel Extraction (number of worker processes, 1 being no parallelism)
+    nWorkers                = 1
+
+    # Stream Rewinding
+
+    # Save Sets read from stdin, pipes or tape devices can only be read once,
+    # so relative versions (i.e. ;0 or ;-1) are resolved in a single pass,
+    # relying upon BACKUP storing the versions of a file newest first.  When
+    # enabled, the stream is instead copied to a temporary file as it's read,
+    # allowing a true second pass.  This is always the case if Smart Mode needs
+    # a dedicated classification pass.
+    bStreamRewind           = False
+
+    # Read Ahead
+
+    # Save sets are read on a background thread, which keeps up to this many
+    # 1MB chunks read (and for compressed save sets, decompressed) ahead of
+    # the processing, such that I/O overlaps the processing of the blocks
+    # already read.  This doesn't apply to RAM Caching or Memory Mapping.
+    # Set to 0 to read on demand instead.
+    nReadAheadDepth         = 4
+
+    # Tape Image Save Set (by number starting from 1, or by name, None for all)
+    kTapeSaveSet            = None
+
+    # Block CRC Verification
+
+    # Each block's CRC is checked as it's read (unless the save set was
+    # written without CRC's), with a warning for any block that fails.  A
+    # report of every block verified may also be output once processing is
+    # complete, either to stdout or a CSV file.
+    bVerifyCRC              = True
+    bIntegrityReport        = False
+    kIntegrityReportFile    = None
+
+    # XOR Redundancy Group Size
+
+    # The group size the save set was written with (BACKUP /GROUP_SIZE,
+    # commonly 10), such that a single damaged block within any group can be
+    # rebuilt from the group's XOR block.  0 means the save set has no XOR
+    # blocks.
+    nGroupSize              = 0
+
+    # Save Set Catalog
+
+    # SQLite database to record every file into (None for no catalog), which
+    # accumulates across save sets so they can be searched later without
+    # re-scanning them.  Every version of every file is recorded, whatever the
+    # mask, so re-cataloguing a save set never loses anything.
+    kCatalogFile            = None
+
+    # Output Sink
+
+    # Where extracted files are written.  File System creates host files
+    # within the output folder (None for the current folder), Memory holds
+    # them in a dictionary, Null discards them, and Hash only keeps a digest
+    # of each, written as a manifest (None for stdout) once processing is
+    # complete.  Any object providing the same methods as VMSBackupSink may
+    # also be used.
+    eOutputSink             = OutputSink.FILESYSTEM
+    kOutputPath             = None
+    kHashManifestFile       = None
+
+    # Write Behind
+
+    # Number of threads writing extracted files to the file system in the
+    # background, with each file's writes gathered into 1MB buffers, and its
+    # opening, closing and dating also being performed by the writer.  Set to
+    # 0 to write synchronously instead.
+    nWriteBehindThreads     = 4
+
+    # Archive Output
+
+    # Tar or Zip archive (decided by its extension) to write every extracted
+    # file into rather than creating host files/folders, or - to write a tar
+    # stream to stdout (None to extract to host files).  This takes priority
+    # over the Output Sink.
+    kArchiveFile            = None
+
+    # Profiling
+
+    # Each phase of processing (header load, first pass, second pass, close)
+    # is profiled separately, with the top functions of each being output
+    # once processing is complete, and the statistics of every phase written
+    # to a pstats file (None for no profiling).  Allocation Tracing likewise
+    # reports the peak memory and top allocation sites of each phase.
+    kProfileFile            = None
+    bTraceAllocations       = False
+    nProfileTop             = 20
 
     # Debug Mode
     eExtractDebug           = ExtractDebug.NONE
 
 #end
 
+class SanitizeTable(dict) :
+
+    # This uses the subset defined here for the portable POSIX file name character set
+    # https://www.ibm.com/docs/en/zos/2.1.0?topic=locales-posix-portable-file-name-character-set
+    #
+    # Note: In addition is we'll allow the following: ;$
+    LEGAL = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._-" + ";$"
+
+    # A str.translate() table, which fills itself in for each character as it's first seen, since file names can
+    # hold any character
+    def __missing__(self, nCharacter : int) -> str :
+        self[nCharacter] = chr(nCharacter) if chr(nCharacter) in self.LEGAL else "_"
+        return self[nCharacter]
+    #end
+
+#end
+
+_SANITIZE_TABLE = SanitizeTable()
+
+def Sanitize(kPath : str) -> str :
+    return kPath.translate(_SANITIZE_TABLE)
+#end
+
+@functools.lru_cache(maxsize=65536)
+def SanitizeFolder(kFolderName : str) -> tuple[str, ...] :
+
+    # Save Sets tend to hold many files per folder, so each folder spec (e.g. DIR.SUBDIR) is only ever split and
+    # sanitised once
+    return tuple(Sanitize(k) for k in kFolderName.split("."))
+
+#end
+
+def GetOutputPath(kFileName : str, kOptions : VMSBackupParameters) -> list[str] :
+
+    # Split the Folder Name
+    if "]" in kFileName :
+        kFolderName     = kFileName[:kFileName.find("]")]
+        assert("[" in kFolderName)
+        kFolderName     = kFolderName[kFolderName.find("[") + 1:]
+        kFileName       = kFileName[(kFileName.find("]") + 1):]
+    else :
+        kFolderName     = None
+    #end
+
+    # Strip the File Version if needed
+    if not kOptions.bExtractWithVersion :
+        if ";" in kFileName :
+            kFileName = kFileName[:kFileName.find(";")]
+        #end
+    #end
+
+    # Any folders followed by the file name
+    kPath = [Sanitize(kFileName)]
+    if kOptions.bExtractFolder and (None != kFolderName) :
+        kPath = [*SanitizeFolder(kFolderName), *kPath]
+    #end
+
+    return kPath
+
+#end
+
 class VMSFileParameters :
 
-    def __init__(self, bIsTargetFile : bool, kMode : ExtractMode) :
+    def __init__(self, bIsTargetFile : bool, kMode : ExtractMode, kSink) :
 
         self.kMode                  = kMode
+        self.kSink                  = kSink
         self.bIgnoreVBN             = not bIsTargetFile
         self.bLFDetected            = False
         self.bLastElementWasLFCR    = False
@@ -81,22 +283,18 @@ class VMSFileParameters :
         self.nRemainingRecordLength = 0
         self.kFileHandle            = None
         self.kFileName              = ""
-        self.kFilePath              = ""
+        self.kFilePath              = []
         self.nCreationDate          = 0
         self.nModificationDate      = 0
-        self.bExtractWithDates      = False
+        self.kSpool                 = None
+        self.kSpoolFileName         = ""
+        self.kSpoolOptions          = None
 
     #end
 
     def sanitize(self, kPath : str) :
 
-        # This uses the subset defined here for the portable POSIX file name character set
-        # https://www.ibm.com/docs/en/zos/2.1.0?topic=locales-posix-portable-file-name-character-set
-        #
-        # Note: In addition is we'll allow the following: ;$
-        LEGAL = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._-" + ";$"
-
-        return "".join([k if k in LEGAL else "_" for k in kPath])
+        return Sanitize(kPath)
 
     #end
 
@@ -121,37 +319,8 @@ class VMSFileParameters :
 
     def openFile(self, kFileName : str, kOptions : VMSBackupParameters, nCreationDate : int, nModificationDate : int) :
 
-        # Split the Folder Name
-        if "]" in kFileName :
-            kFolderName     = kFileName[:kFileName.find("]")]
-            assert("[" in kFolderName)
-            kFolderName     = kFolderName[kFolderName.find("[") + 1:]
-            kFolderStack    = kFolderName.split(".")
-            kFileName       = kFileName[(kFileName.find("]") + 1):]
-        else :
-            kFolderStack    = []
-        #end
-
-        # Strip the File Version if needed
-        if not kOptions.bExtractWithVersion :
-            if ";" in kFileName :
-                kFileName = kFileName[:kFileName.find(";")]
-            #end
-        #end
-
-        # Create the Extraction Folder if Needed
-        if kOptions.bExtractFolder :
-
-            kCurrentPath = os.path.abspath(os.curdir)
-            kTargetPath  = os.path.join(kCurrentPath, os.path.join(*[self.sanitize(k) for k in kFolderStack]))
-
-            if not os.path.isdir(kTargetPath) :
-                os.makedirs(kTargetPath)
-            #end
-            os.chdir(kTargetPath)
-            self.kFilePath = kTargetPath
-
-        #end
+        # The path within the Output Sink, i.e. any folders followed by the file name
+        kPath = GetOutputPath(kFileName=kFileName, kOptions=kOptions)
 
         # All Modes are Binary except ASCII which is either explicitly selected, or determined by Smart Parsing
         if ExtractMode.SMART == self.kMode :
@@ -163,13 +332,9 @@ class VMSFileParameters :
         # whereas in Python, all string data passed needs to be convertable into the character encoding mechanism,
         # i.e. UTF-8.  As such, it's easier to just open the file in binary mode, and handle EOL's by hand, with the
         # normalisation into the OS preferred EOL convention being handled with os.linesep.
-        self.kFileName   = self.sanitize(kFileName)
-        self.kFileHandle = open(self.kFileName, "wb")
-
-        # Jump back to the Root Folder
-        if kOptions.bExtractFolder :
-            os.chdir(kCurrentPath)
-        #end
+        self.kFileName   = kPath[-1]
+        self.kFilePath   = kPath
+        self.kFileHandle = self.kSink.open(kPath=kPath, nCreationDate=nCreationDate, nModificationDate=nModificationDate)
 
         # Indicate we need to Process the VBN Data Again
         # Note: This is really just an optimisation to skip processing during the parse/scanning phase for any files
@@ -184,28 +349,43 @@ class VMSFileParameters :
         # Time Stamps
         self.nCreationDate          = nCreationDate
         self.nModificationDate      = nModificationDate
-        self.bExtractWithDates      = kOptions.bExtractWithDate
 
     #end
 
-    def closeFile(self) :
+    def openSpool(self, kFileName : str, kOptions : VMSBackupParameters, nCreationDate : int, nModificationDate : int) :
 
-        if None != self.kFileHandle :
+        # Hold onto everything needed to open the file for real once the file type has been determined
+        self.kSpool                 = tempfile.SpooledTemporaryFile(max_size=kOptions.nSmartSpoolRAMLimit)
+        self.kSpoolFileName         = kFileName
+        self.kSpoolOptions          = kOptions
 
-            self.kFileHandle.close()
-            self.kFileHandle = None
+        # Indicate we need to Process the VBN Data
+        self.bIgnoreVBN             = False
+
+        # Reset the File Pointers
+        self.nFilePointer           = 0
+        self.nRemainingStartPos     = 0
+        self.nRemainingRecordLength = 0
+
+        # Time Stamps
+        self.nCreationDate          = nCreationDate
+        self.nModificationDate      = nModificationDate
+
+    #end
 
-            if self.bExtractWithDates :
+    def closeFile(self) :
 
-                os.utime(os.path.join(self.kFilePath, self.kFileName), (self.nModificationDate, self.nCreationDate))
+        if None != self.kFileHandle :
 
-            #end
+            self.kSink.close(kFileHandle=self.kFileHandle, kPath=self.kFilePath, nCreationDate=self.nCreationDate, nModificationDate=self.nModificationDate)
+            self.kFileHandle = None
 
         #end
 
     #end
 
     kMode                   : ExtractMode
+    kSink                   = None
     bIgnoreVBN              : bool
 
     # Current File Data
@@ -219,8 +399,13 @@ class VMSFileParameters :
     nRemainingRecordLength  : int
     kFileHandle             : io.TextIOWrapper
     kFileName               : str
-    kFilePath               : str
+    kFilePath               : list[str]
     nCreationDate           : int
     nModificationDate       : int
 
+    # Smart Spooling
+    kSpool                  : tempfile.SpooledTemporaryFile
+    kSpoolFileName          : str
+    kSpoolOptions           : VMSBackupParameters
+
 #end
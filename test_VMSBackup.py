@@ -0,0 +1,205 @@
+import os
+import io
+import contextlib
+import tempfile
+import unittest
+import VMSBackup
+import VMSBackupProcess
+import VMSBackupTypes
+import VMSBackupGenerate
+import VMSBackupCatalog
+import BSFileHeader
+
+# Regression Tests
+#
+# Save sets are generated on the fly (see VMSBackupGenerate), extracted, and the host files compared against
+# what went in.  Run with "python -m unittest" (or pytest) from this folder.
+
+def GenerateVersions(kSaveSetFile : str, nFiles : int, kVersions : dict[int, bytes], **kParameters) -> None :
+
+    # Every file is given every version, newest first as BACKUP would
+    kGenerator = VMSBackupGenerate.VMSBackupGenerator(kOutputFile=kSaveSetFile, **kParameters)
+
+    for nFile in range(nFiles) :
+        for nVersion in sorted(kVersions.keys(), reverse=True) :
+            kGenerator.AddFile(kFileName=f"[000000]FILE{nFile:03}.DAT", kData=kVersions[nVersion], eFormat=BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_FIX, nVersion=nVersion)
+        #end
+    #end
+
+    kGenerator.close()
+
+#end
+
+class VMSBackupTestExtraction(unittest.TestCase) :
+
+    def setUp(self) -> None :
+
+        self.kTempFolder = tempfile.TemporaryDirectory()
+        self.kSaveSet    = os.path.join(self.kTempFolder.name, "VERSIONS.BCK")
+
+    #end
+
+    def tearDown(self) -> None :
+        self.kTempFolder.cleanup()
+    #end
+
+    def Extract(self, kFolder : str, **kParameters) -> str :
+
+        # Anything printed (i.e. warnings) is kept in kOutput
+
+        kOptions                  = VMSBackupTypes.VMSBackupParameters()
+        kOptions.eOutputType      = VMSBackupTypes.OutputType.SUPPRESS
+        kOptions.eExtractMode     = VMSBackupTypes.ExtractMode.BINARY
+        kOptions.nExtractVersion  = None
+        kOptions.kOutputPath      = os.path.join(self.kTempFolder.name, kFolder)
+
+        for kName, kValue in kParameters.items() :
+            setattr(kOptions, kName, kValue)
+        #end
+
+        self.kOutput = io.StringIO()
+        with contextlib.redirect_stdout(self.kOutput) :
+            self.assertTrue(VMSBackup.VMSBackup(kFile=self.kSaveSet, kOptions=kOptions))
+        #end
+
+        return kOptions.kOutputPath
+
+    #end
+
+    def testVersionsIntoOnePath(self) -> None :
+
+        # Without -V every version of a file lands on the same host path, so whichever is written last (the
+        # oldest) must be left intact, however the writing (or extraction) is shared out
+        kVersions = {1 : bytes([1]) * 20000, 2 : bytes([2]) * 20000, 3 : bytes([3]) * (3 * 1024 * 1024)}
+        GenerateVersions(kSaveSetFile=self.kSaveSet, nFiles=12, kVersions=kVersions)
+
+        for nWorkers, nWriteBehindThreads in [(1, 0), (1, 4), (4, 0), (4, 4)] :
+
+            kOutputPath = self.Extract(kFolder=f"J{nWorkers}B{nWriteBehindThreads}", nWorkers=nWorkers, nWriteBehindThreads=nWriteBehindThreads)
+
+            for nFile in range(12) :
+                with open(os.path.join(kOutputPath, f"FILE{nFile:03}.DAT"), "rb") as kHandle :
+                    self.assertEqual(kHandle.read(), kVersions[1], f"FILE{nFile:03}.DAT with {nWorkers} workers and {nWriteBehindThreads} writers")
+                #end
+            #end
+
+        #end
+
+    #end
+
+    def testParallelPathGrouping(self) -> None :
+
+        # Block ranges holding files that share a host path must only ever be handed to one worker
+        kEntries     = [{"Block" : 0,     "Name" : "[A]X.DAT;2"},
+                        {"Block" : 8192,  "Name" : "[B]X.DAT;1"},
+                        {"Block" : 16384, "Name" : "[A]Y.DAT;1"},
+                        {"Block" : 24576, "Name" : "[A]X.DAT;1"}]
+        kBlockRanges = [(0, 0), (8192, 8192), (16384, 16384), (24576, 24576)]
+        kOptions     = VMSBackupTypes.VMSBackupParameters()
+
+        self.assertEqual(sorted(VMSBackupProcess.GroupBlockRanges(kEntries=kEntries, kOptions=kOptions, kBlockRanges=kBlockRanges)),
+                         [[(0, 0), (8192, 8192), (24576, 24576)], [(16384, 16384)]])
+
+        kOptions.bExtractFolder = True
+        self.assertEqual(sorted(VMSBackupProcess.GroupBlockRanges(kEntries=kEntries, kOptions=kOptions, kBlockRanges=kBlockRanges)),
+                         [[(0, 0), (24576, 24576)], [(8192, 8192)], [(16384, 16384)]])
+
+        kOptions.bExtractWithVersion = True
+        self.assertEqual(len(VMSBackupProcess.GroupBlockRanges(kEntries=kEntries, kOptions=kOptions, kBlockRanges=kBlockRanges)), 4)
+
+    #end
+
+    def AssertFiles(self, kOutputPath : str, nFiles : int, kData : bytes) -> None :
+
+        for nFile in range(nFiles) :
+            with open(os.path.join(kOutputPath, f"FILE{nFile:03}.DAT"), "rb") as kHandle :
+                self.assertEqual(kHandle.read(), kData, f"FILE{nFile:03}.DAT in {kOutputPath}")
+            #end
+        #end
+
+    #end
+
+    def testRecoverDamagedBlock(self) -> None :
+
+        # The group size comes from the save set's summary record, so no -G is needed to rebuild the block
+        kData = bytes(range(256)) * 100
+        GenerateVersions(kSaveSetFile=self.kSaveSet, nFiles=12, kVersions={1 : kData}, bCRC=True, nGroupSize=5)
+
+        with open(self.kSaveSet, "r+b") as kHandle :
+            kHandle.seek((3 * 8192) + 1000)
+            kHandle.write(bytes(500))
+        #end
+
+        for nGroupSize in [0, 5] :
+            self.AssertFiles(kOutputPath=self.Extract(kFolder=f"G{nGroupSize}", nGroupSize=nGroupSize), nFiles=12, kData=kData)
+            self.assertIn("rebuilt from its redundancy group", self.kOutput.getvalue())
+        #end
+
+    #end
+
+    def testGroupSizeMismatch(self) -> None :
+
+        # A group size given for a save set without XOR blocks mustn't cost any data
+        kData = bytes(range(256)) * 100
+        GenerateVersions(kSaveSetFile=self.kSaveSet, nFiles=12, kVersions={1 : kData})
+
+        self.AssertFiles(kOutputPath=self.Extract(kFolder="NONE", nGroupSize=10), nFiles=12, kData=kData)
+        self.assertIn("group size is wrong", self.kOutput.getvalue())
+
+        # Nor may the XOR blocks be taken for data when the group size given is wrong (or missing)
+        GenerateVersions(kSaveSetFile=self.kSaveSet, nFiles=12, kVersions={1 : kData}, nGroupSize=5)
+
+        for nGroupSize in [0, 3, 5] :
+            self.AssertFiles(kOutputPath=self.Extract(kFolder=f"G{nGroupSize}", nGroupSize=nGroupSize), nFiles=12, kData=kData)
+            self.assertNotIn("Invalid Record", self.kOutput.getvalue())
+        #end
+
+    #end
+
+    def testTruncatedHeader(self) -> None :
+
+        # A save set cut short within its first block header still has its name and block size listed
+        GenerateVersions(kSaveSetFile=self.kSaveSet, nFiles=1, kVersions={1 : b"DATA"})
+
+        with open(self.kSaveSet, "r+b") as kHandle :
+            kHandle.truncate(100)
+        #end
+
+        self.Extract(kFolder="TRUNCATED", eOutputType=VMSBackupTypes.OutputType.BRIEF)
+        self.assertIn("Block size:        8192", self.kOutput.getvalue())
+
+    #end
+
+    def testCatalogDirectoryMask(self) -> None :
+
+        # Catalog searches take the same masks as -M, so a directory spec is literal rather than a character class
+        kGenerator = VMSBackupGenerate.VMSBackupGenerator(kOutputFile=self.kSaveSet)
+        for kFileName in ["[SUB]ONE.TXT", "[SUB]TWO.DAT", "[SUB.DEEP]THREE.TXT", "[OTHER]ONE.TXT", "[000000]S.TXT"] :
+            kGenerator.AddFile(kFileName=kFileName, kData=b"DATA\n", eFormat=BSFileHeader.BSFileHeader.RecordFormatType.RECORD_FORMAT_STMLF)
+        #end
+        kGenerator.close()
+
+        kCatalogFile = os.path.join(self.kTempFolder.name, "CATALOG.DB")
+        self.Extract(kFolder="CATALOG", bExtract=False, kCatalogFile=kCatalogFile)
+
+        def FindFiles(kMask : str) -> list[str] :
+            return sorted(kRow[3] for kRow in VMSBackupCatalog.FindFiles(kCatalogFile=kCatalogFile, kMask=kMask))
+        #end
+
+        self.assertEqual(FindFiles(kMask="[SUB]*.TXT"),      ["[SUB]ONE.TXT;1"])
+        self.assertEqual(FindFiles(kMask="[sub]*.*"),        ["[SUB]ONE.TXT;1", "[SUB]TWO.DAT;1"])
+        self.assertEqual(FindFiles(kMask="[SUB...]*.TXT"),   ["[SUB.DEEP]THREE.TXT;1", "[SUB]ONE.TXT;1"])
+        self.assertEqual(FindFiles(kMask="*ONE.TXT;*"),      ["[OTHER]ONE.TXT;1", "[SUB]ONE.TXT;1"])
+        self.assertEqual(FindFiles(kMask="[S]*.*"),          [])
+
+    #end
+
+    kTempFolder : tempfile.TemporaryDirectory
+    kSaveSet    : str
+    kOutput     : io.StringIO
+
+#end
+
+if __name__ == "__main__" :
+    unittest.main()
+#end
\ No newline at end of file